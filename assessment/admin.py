@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Assessment, Question, Answer, PerformanceData, KMeansData
+from .models import Assessment, Question, Answer, PerformanceData, KMeansData, AssessmentJob, QuestionBank
 
 # Register your models here.
 
@@ -8,7 +8,19 @@ class AssessmentAdmin(admin.ModelAdmin):
     list_display = ("pk", "user", "variant")
 
 
+class AssessmentJobAdmin(admin.ModelAdmin):
+    list_display = ("pk", "user", "kind", "status", "attempts", "created_at", "finished_at")
+    list_filter = ("kind", "status")
+
+
+class QuestionBankAdmin(admin.ModelAdmin):
+    list_display = ("pk", "variant", "difficulty", "question_text")
+    list_filter = ("variant", "difficulty")
+
+
 admin.site.register(Assessment, AssessmentAdmin)
+admin.site.register(AssessmentJob, AssessmentJobAdmin)
+admin.site.register(QuestionBank, QuestionBankAdmin)
 admin.site.register(Question)
 admin.site.register(Answer)
 admin.site.register(PerformanceData)
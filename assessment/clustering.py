@@ -0,0 +1,110 @@
+import numpy as np
+
+# Clustering of initial assessment scores, used to find students who performed similarly when generating assessments.
+
+
+"""
+Builds the score matrix of a set of initial assessments.
+
+@param performance_data An iterable of PerformanceData.per_question_variant_score dictionaries, ie: {"FCFS": [2, 3], ...}.
+@param variants Names of the variants, one per column.
+@return An array of shape (assessments, variants) holding the number of questions of each variant answered correctly.
+"""
+
+
+def score_matrix(performance_data, variants):
+    return np.array([[scores[variant][0] for variant in variants] for scores in performance_data], dtype=np.float64).reshape(-1, len(variants))
+
+
+"""
+Finds the closest centroid to each score.
+
+@param centroids An array of shape (k, columns).
+@param scores An array of shape (columns,) for a single point, or (points, columns).
+@return The index of the closest centroid in each column, with the same leading shape as scores.
+"""
+
+
+def closest_centroids(centroids, scores):
+    scores = np.asarray(scores, dtype=np.float64)
+    return np.abs(scores[..., None, :] - centroids).argmin(axis=-2)
+
+
+"""
+Exact k-means of one dimensional values (Ckmeans). The distinct values are sorted, and dynamic programming finds the split of them into
+k runs with the least total squared distance to their means. As the best start of the last run moves right with the end of the range,
+each row of the table is filled by divide and conquer, for O(k m log m) time over m distinct values. There is no iteration, so the result
+is optimal and the same on every run.
+
+@param values An array of values.
+@param k Number of clusters. Fewer are returned if there are fewer distinct values.
+@return A tuple of (centroids in ascending order, the cluster of each value).
+"""
+
+
+def kmeans_1d(values, k):
+    values = np.asarray(values, dtype=np.float64).ravel()
+    points, inverse, weights = np.unique(values, return_inverse=True, return_counts=True)
+    num_points = len(points)
+    if num_points == 0 or k < 1:
+        return np.empty(0), np.zeros(len(values), dtype=np.int64)
+    clusters = min(k, num_points)
+
+    # Prefix sums of the weights, weighted values and weighted squares, so the cost of any run of points is O(1).
+    counts = np.concatenate(([0.0], np.cumsum(weights)))
+    sums = np.concatenate(([0.0], np.cumsum(weights * points)))
+    squares = np.concatenate(([0.0], np.cumsum(weights * points * points)))
+
+    # costs[c][j] is the least cost of splitting the first j points into c clusters, and starts[c][j] the first point of the last cluster.
+    costs = np.full((clusters + 1, num_points + 1), np.inf)
+    costs[0][0] = 0.0
+    starts = np.zeros((clusters + 1, num_points + 1), dtype=np.int64)
+
+    for cluster in range(1, clusters + 1):
+        # Ranges of (first end, last end, first start, last start) still to fill.
+        pending = [(cluster, num_points, cluster - 1, num_points - 1)]
+        while pending:
+            low, high, start_low, start_high = pending.pop()
+            if low > high:
+                continue
+            end = (low + high) // 2
+            candidates = np.arange(start_low, min(end - 1, start_high) + 1)
+            run_counts = counts[end] - counts[candidates]
+            run_sums = sums[end] - sums[candidates]
+            options = costs[cluster - 1][candidates] + squares[end] - squares[candidates] - run_sums * run_sums / run_counts
+            best = options.argmin()
+            costs[cluster][end] = options[best]
+            starts[cluster][end] = candidates[best]
+            pending.append((low, end - 1, start_low, candidates[best]))
+            pending.append((end + 1, high, candidates[best], start_high))
+
+    centroids = np.empty(clusters)
+    point_labels = np.empty(num_points, dtype=np.int64)
+    end = num_points
+    for cluster in range(clusters, 0, -1):
+        start = starts[cluster][end]
+        centroids[cluster - 1] = (sums[end] - sums[start]) / (counts[end] - counts[start])
+        point_labels[start:end] = cluster - 1
+        end = start
+    return centroids, point_labels[inverse]
+
+
+"""
+Exact k-means of every column of a score matrix, see kmeans_1d.
+Columns with fewer than k distinct values repeat their highest centroid, so every column has k centroids in ascending order.
+
+@param scores An array of shape (points, columns).
+@param k Number of clusters per column.
+@return A tuple of (centroids of shape (k, columns), labels of shape (points, columns)).
+"""
+
+
+def kmeans_1d_columns(scores, k):
+    scores = np.asarray(scores, dtype=np.float64)
+    centroids = np.zeros((k, scores.shape[1]))
+    labels = np.zeros(scores.shape, dtype=np.int64)
+    for column in range(scores.shape[1]):
+        column_centroids, labels[:, column] = kmeans_1d(scores[:, column], k)
+        if len(column_centroids):
+            centroids[:, column] = np.pad(column_centroids, (0, k - len(column_centroids)), mode="edge")
+    return centroids, labels
@@ -0,0 +1,232 @@
+from .simulator.cache import simulation_cache
+from .simulator.parallel import run_parallel, CPU_SCHEDULERS
+from .simulator.cpu.indexed_schedule import IndexedSchedule
+from .simulator.batch import schedule_batch, allocate_batch, CPU_ALGORITHMS, MEMORY_ALGORITHMS
+import numpy as np
+import random
+
+# Question generation for the general assessments, kept free of the database so it can run in worker processes.
+
+GENERAL_QUIZZES = ["FCFS", "SJF", "Priority", "RR", "SRTF", "First Fit", "Best Fit", "Worst Fit"]
+CPU_QUIZZES = ["FCFS", "SJF", "Priority", "RR", "SRTF"]
+DIFFICULTIES = ["I", "II", "III"]
+
+# Parameters of the random scenarios for each difficulty. Ranges are inclusive, and the number of processes applies to memory questions too.
+DIFFICULTY_PROFILES = {
+    "I": {"num_processes": (3, 5), "max_burst_time": 5, "max_arrival_time": 10, "max_priority": 6, "max_time_quantum": 4, "size": (50, 200), "num_blocks": (2, 5)},
+    "II": {"num_processes": (5, 7), "max_burst_time": 9, "max_arrival_time": 15, "max_priority": 8, "max_time_quantum": 7, "size": (50, 500), "num_blocks": (4, 7)},
+    "III": {"num_processes": (7, 9), "max_burst_time": 13, "max_arrival_time": 20, "max_priority": 10, "max_time_quantum": 9, "size": (50, 800), "num_blocks": (5, 9)}
+}
+GENERAL_VARIANTS = [quiz + " " + difficulty for quiz in GENERAL_QUIZZES for difficulty in DIFFICULTIES]
+
+
+"""
+Splits a general assessment variant into its algorithm and difficulty.
+
+@param variant Name of the variant, ie: "First Fit II".
+@return A tuple of (variant_name, difficulty), ie: ("First Fit", "II").
+"""
+
+
+def split_variant(variant):
+    split_variant = variant.split(" ")
+    return " ".join(split_variant[0:len(split_variant) - 1]), split_variant[len(split_variant) - 1]
+
+
+def profile_column(profiles, key, index=None):
+    return np.array([profile[key] if index is None else profile[key][index] for profile in profiles], dtype=np.int64)[:, None]
+
+
+"""
+Generates many random questions at once. The inputs of every question (processes, blocks, time quanta, the time delta or process asked about
+and the order of the choices) are drawn in a handful of NumPy calls, FCFS, SJF, Priority and the memory algorithms are simulated with the
+batch simulators, and only RR and SRTF are simulated one question at a time.
+This is the only place questions are generated, so it defines their format.
+
+@param specs An array of (variant_name, difficulty) tuples, one per question.
+@param seed Seed (or NumPy Generator) for the questions. The same seed gives the same questions.
+@return An array of questions, in the same order as specs. Each is a dictionary holding the question_text, processes, blocks (None for CPU questions),
+        correct_answer and the multiple choice answers.
+"""
+
+
+def sample_questions(specs, seed=None):
+    generator = np.random.default_rng(seed)
+    count = len(specs)
+    if not count:
+        return []
+
+    profiles = [DIFFICULTY_PROFILES[difficulty] for _, difficulty in specs]
+    width = max(max(profile["num_processes"][1], profile["num_blocks"][1]) for profile in DIFFICULTY_PROFILES.values())
+    size_lo, size_hi = profile_column(profiles, "size", 0), profile_column(profiles, "size", 1)
+
+    # One row per question, padded to the most processes (or blocks) a question can have.
+    num_processes = generator.integers(profile_column(profiles, "num_processes", 0), profile_column(profiles, "num_processes", 1), endpoint=True)[:, 0]
+    num_blocks = generator.integers(profile_column(profiles, "num_blocks", 0), profile_column(profiles, "num_blocks", 1), endpoint=True)[:, 0]
+    arrival_times = generator.integers(0, profile_column(profiles, "max_arrival_time"), size=(count, width), endpoint=True)
+    burst_times = generator.integers(1, profile_column(profiles, "max_burst_time"), size=(count, width), endpoint=True)
+    priorities = generator.integers(0, profile_column(profiles, "max_priority"), size=(count, width), endpoint=True)
+    time_quanta = generator.integers(1, profile_column(profiles, "max_time_quantum"), endpoint=True)[:, 0]
+    process_sizes = generator.integers(size_lo, size_hi, size=(count, width), endpoint=True)
+    block_sizes = generator.integers(size_lo, size_hi, size=(count, width), endpoint=True)
+    # Where the question points, as a fraction of the schedule (CPU) or the job queue (memory).
+    picks = generator.random(count)
+    # Sorting random keys samples the distractors without replacement, and shuffles the choices (at most 5 distractors plus the answer).
+    num_candidates = np.array([num_processes[row] if variant_name in CPU_QUIZZES else num_blocks[row] for row, (variant_name, _) in enumerate(specs)])
+    candidate_orders = np.argsort(np.where(np.arange(width)[None, :] < num_candidates[:, None], generator.random((count, width)), np.inf), axis=1).tolist()
+    choice_orders = np.argsort(generator.random((count, 6)), axis=1).tolist()
+
+    outcomes = simulate_questions(specs, num_processes, num_blocks, arrival_times, burst_times, priorities, time_quanta, process_sizes, block_sizes)
+    # Building the questions is per question Python, so read the inputs as lists rather than element by element.
+    num_processes, num_blocks, picks = num_processes.tolist(), num_blocks.tolist(), picks.tolist()
+    arrival_times, burst_times, priorities = arrival_times.tolist(), burst_times.tolist(), priorities.tolist()
+    process_sizes, block_sizes = process_sizes.tolist(), block_sizes.tolist()
+
+    questions = []
+    for row, (variant_name, _) in enumerate(specs):
+        if variant_name in CPU_QUIZZES:
+            processes = [{"name": "p" + str(i),
+                          "arrival_time": arrival_times[row][i],
+                          "burst_time": burst_times[row][i],
+                          "priority": (priorities[row][i] if variant_name == "Priority" else None)}
+                         for i in range(num_processes[row])]
+            # Processes are listed in the order they were created, as listing them in the scheduler's job queue order would give away the answer.
+            blocks = None
+            candidates = processes
+
+            schedule = outcomes[row]
+            answer_time_delta = int(picks[row] * (schedule[len(schedule) - 1]["time_delta"] + 1))
+            answer_segment = IndexedSchedule(schedule).segment_at(answer_time_delta)
+            answer = {"name": answer_segment["process_name"],
+                      "arrival_time": answer_segment["arrival_time"],
+                      "burst_time": answer_segment["burst_time"],
+                      "priority": (answer_segment["priority"] if variant_name == "Priority" else None)}
+
+            question_text = "Using the " + str(variant_name) + \
+                " scheduling algorithm, and based on the processes below, which one is executing at time delta " + str(answer_time_delta) + "?"
+
+        else:
+            processes = [{"name": "p" + str(i), "size": process_sizes[row][i]} for i in range(num_processes[row])]
+            blocks = [{"name": "b" + str(i), "size": block_sizes[row][i]} for i in range(num_blocks[row])]
+            candidates = blocks
+
+            q_process = int(picks[row] * len(processes))
+            block = outcomes[row][q_process]
+            answer = {"name": "None", "size": "N/A"} if block < 0 else dict(blocks[block])
+
+            question_text = "Using the " + str(variant_name) + " memory allocation technique, and based on the blocks below, which one does process " + \
+                processes[q_process]["name"] + " get placed in?"
+
+        # Every candidate is a choice for small questions, otherwise 4 random ones.
+        generated_answers = [dict(candidates[i]) for i in (range(len(candidates)) if len(candidates) <= 5 else candidate_orders[row][:4])]
+        if answer not in generated_answers:
+            generated_answers.append(answer)
+        generated_answers = [generated_answers[i] for i in choice_orders[row] if i < len(generated_answers)]
+
+        questions.append({"question_text": question_text, "processes": processes, "blocks": blocks, "correct_answer": answer, "answers": generated_answers})
+    return questions
+
+
+"""
+Simulates the questions drawn by sample_questions, batching every question of an algorithm together where a batch simulator exists.
+
+@return An array holding, for each question, its schedule (CPU) or the index of the block each process is placed in, or -1 (memory).
+"""
+
+
+def simulate_questions(specs, num_processes, num_blocks, arrival_times, burst_times, priorities, time_quanta, process_sizes, block_sizes):
+    rows_by_algorithm = {}
+    for row, (variant_name, _) in enumerate(specs):
+        rows_by_algorithm.setdefault(variant_name, []).append(row)
+
+    outcomes = [None] * len(specs)
+    for variant_name, rows in rows_by_algorithm.items():
+        if variant_name in CPU_ALGORITHMS:
+            results = schedule_batch(variant_name, arrival_times[rows], burst_times[rows], priorities[rows] if variant_name == "Priority" else None, num_processes[rows])
+        elif variant_name in MEMORY_ALGORITHMS:
+            results = allocate_batch(variant_name, process_sizes[rows], block_sizes[rows], num_processes[rows], num_blocks[rows]).tolist()
+        else:
+            results = []
+            for row in rows:
+                scheduler = CPU_SCHEDULERS[variant_name](track_queues=False, cache=simulation_cache)
+                if variant_name == "RR":
+                    scheduler.set_time_quantum(time_quanta[row].item())
+                for i, arrival_time, burst_time in zip(range(num_processes[row]), arrival_times[row].tolist(), burst_times[row].tolist()):
+                    scheduler.create_process("p" + str(i), arrival_time, burst_time)
+                scheduler.dispatch_processes()
+                results.append(scheduler.get_schedule())
+
+        for row, result in zip(rows, results):
+            outcomes[row] = result
+    return outcomes
+
+
+"""
+Generates the questions of every general assessment, plus the initial assessment (one question per general assessment).
+
+@param seed Seed for the questions, or None for fresh ones.
+@return A dictionary mapping each general assessment variant, ie: "RR II", to its 10 questions, and "Initial Assessment" to its questions.
+"""
+
+
+def generate_questions(seed=None):
+    sampled = sample_questions([split_variant(variant) for variant in GENERAL_VARIANTS for _ in range(11)], seed)
+
+    questions = {"Initial Assessment": []}
+    for i, variant in enumerate(GENERAL_VARIANTS):
+        questions[variant] = sampled[i * 11:i * 11 + 10]
+        questions["Initial Assessment"].append(sampled[i * 11 + 10])
+    return questions
+
+
+"""
+Generates the questions for many users at once, spread across a pool of worker processes.
+Each set is seeded from the current random state, so forked workers don't repeat each other's questions.
+
+@param count Number of question sets to generate.
+@param workers Number of worker processes, defaults to OSSAT_SIMULATION_WORKERS or the number of cores.
+@param chunk_size Number of question sets sent to a worker at a time.
+@return An array of question sets (see generate_questions), in a deterministic order for a given random state.
+"""
+
+
+def generate_many(count, workers=None, chunk_size=None):
+    seeds = [random.getrandbits(64) for _ in range(count)]
+    return run_parallel(generate_questions, seeds, workers, chunk_size)
+
+
+"""
+Generates the questions of one algorithm and difficulty from their own seed, so the result doesn't depend on which worker process ran them.
+
+@param item A tuple of (variant_name, difficulty, count, seed).
+@return An array of questions, see sample_questions.
+"""
+
+
+def sample_seeded_questions(item):
+    variant_name, difficulty, count, seed = item
+    return sample_questions([(variant_name, difficulty)] * count, seed)
+
+
+"""
+Generates questions for the question bank, for every general assessment algorithm and difficulty, spread across a pool of worker processes.
+
+@param count Number of questions for each algorithm and difficulty.
+@param seed Seed for the whole bank. The same seed gives the same questions and keys, whatever the number of workers.
+@param workers Number of worker processes, defaults to OSSAT_SIMULATION_WORKERS or the number of cores.
+@param chunk_size Number of questions sent to a worker at a time.
+@return An array of (variant_name, difficulty, random_key, question) tuples, grouped by algorithm and difficulty.
+        random_key is uniform in [0, 1), for sampling from the bank.
+"""
+
+
+def generate_bank(count, seed=None, workers=None, chunk_size=None):
+    generator = np.random.default_rng(seed)
+    # Each algorithm and difficulty is split into chunks of questions, each with its own seed, so they can be spread across the workers.
+    chunk_size = chunk_size or max(1, min(count, 1000))
+    items = [(variant_name, difficulty, min(chunk_size, count - start), generator.integers(2 ** 63))
+             for variant_name in GENERAL_QUIZZES for difficulty in DIFFICULTIES for start in range(0, count, chunk_size)]
+    random_keys = generator.random(len(GENERAL_QUIZZES) * len(DIFFICULTIES) * count).tolist()
+    questions = [(variant_name, difficulty, question) for (variant_name, difficulty, _, _), chunk in zip(items, run_parallel(sample_seeded_questions, items, workers, 1))
+                 for question in chunk]
+    return [(variant_name, difficulty, random_key, question) for (variant_name, difficulty, question), random_key in zip(questions, random_keys)]
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from assessment.models import QuestionBank
+from assessment.generation import generate_bank
+
+# Fills the question bank with pre-simulated questions for every general assessment algorithm and difficulty.
+# Usage: python manage.py fill_question_bank [--count 500] [--seed 0] [--workers 4] [--replace]
+
+
+class Command(BaseCommand):
+    help = "Generates pre-simulated questions for the question bank, in parallel."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=500, help="Number of questions to add for each algorithm and difficulty.")
+        parser.add_argument("--seed", type=int, default=None, help="Seed for the questions (and their sampling keys), for a reproducible bank.")
+        parser.add_argument("--workers", type=int, default=None, help="Worker processes, defaults to OSSAT_SIMULATION_WORKERS or the number of cores.")
+        parser.add_argument("--chunk-size", type=int, default=None, help="Number of questions sent to a worker at a time.")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Number of rows per insert.")
+        parser.add_argument("--replace", action="store_true", help="Delete the existing bank first.")
+
+    def handle(self, *args, **options):
+        generated = generate_bank(options["count"], options["seed"], options["workers"], options["chunk_size"])
+        questions = [QuestionBank(variant=variant_name, difficulty=difficulty, random_key=random_key, question_text=question["question_text"],
+                                  processes=question["processes"], blocks=question["blocks"], correct_answer=question["correct_answer"],
+                                  answers=question["answers"])
+                     for variant_name, difficulty, random_key, question in generated]
+
+        with transaction.atomic():
+            if options["replace"]:
+                QuestionBank.objects.all().delete()
+            QuestionBank.objects.bulk_create(questions, batch_size=options["batch_size"])
+
+        self.stdout.write("Added " + str(len(questions)) + " questions to the question bank (" + str(QuestionBank.objects.count()) + " in total).")
@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand
+from assessment.models import AssessmentJob, QuestionBank
+from assessment.generation import generate_many
+import time
+import traceback
+
+# Runs queued assessment generation jobs.
+# Usage: python manage.py run_assessment_jobs [--batch-size 8] [--workers 4] [--once]
+
+
+class Command(BaseCommand):
+    help = "Runs queued assessment generation jobs, polling the queue for new ones."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=8, help="Most jobs to claim at a time.")
+        parser.add_argument("--workers", type=int, default=None, help="Worker processes used to generate questions while the question bank is empty, defaults to OSSAT_SIMULATION_WORKERS.")
+        parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds to wait when the queue is empty.")
+        parser.add_argument("--stall-timeout", type=int, default=600, help="Seconds before a running job is assumed dead and requeued.")
+        parser.add_argument("--once", action="store_true", help="Exit once the queue is empty rather than polling.")
+
+    def handle(self, *args, **options):
+        while True:
+            requeued = AssessmentJob.requeue_stalled(options["stall_timeout"])
+            if requeued:
+                self.stdout.write("Requeued " + str(requeued) + " stalled job(s).")
+
+            jobs = AssessmentJob.claim(options["batch_size"])
+            if not jobs:
+                if options["once"]:
+                    return
+                time.sleep(options["poll_interval"])
+                continue
+
+            self.run_jobs(jobs, options["workers"])
+
+    """
+    Runs a batch of claimed jobs. Questions are drawn from the question bank (see fill_question_bank) when it has been filled.
+    Otherwise the questions for the whole batch are generated across the worker pool, then saved from this process (workers don't share the database connection).
+
+    @param jobs An array of claimed AssessmentJobs.
+    @param workers Number of worker processes.
+    """
+
+    def run_jobs(self, jobs, workers):
+        try:
+            # Draw from the question bank when it has been filled, otherwise generate the whole batch across the worker pool.
+            questions = [None] * len(jobs) if QuestionBank.objects.exists() else generate_many(len(jobs), workers)
+        except Exception:
+            error = traceback.format_exc()
+            for job in jobs:
+                job.fail(error)
+            self.stderr.write("Failed to generate questions for " + str(len(jobs)) + " job(s):\n" + error)
+            return
+
+        for job, job_questions in zip(jobs, questions):
+            if not job.heartbeat():
+                self.stderr.write(job.kind + " job " + str(job.id) + " was requeued while waiting for its batch, skipping it.")
+                continue
+            if job.run(job_questions):
+                self.stdout.write(job.kind + " job " + str(job.id) + " for " + job.user.get_username() + " succeeded.")
+            else:
+                self.stderr.write(job.kind + " job " + str(job.id) + " for " + job.user.get_username() + " failed (attempt " + str(job.attempts) + " of " +
+                                  str(job.max_attempts) + "), now " + job.status + ".")
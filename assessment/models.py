@@ -1,16 +1,91 @@
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 from users.models import CustomUser
 from graphql_auth.signals import user_verified
 from django.dispatch import receiver
-from .simulator.cpu.non_preemptive.fcfs import FCFS
-from .simulator.cpu.non_preemptive.sjf import SJF
-from .simulator.cpu.non_preemptive.priority import Priority
-from .simulator.cpu.preemptive.rr import RR
-from .simulator.cpu.preemptive.srtf import SRTF
-from .simulator.memory.contiguous.first_fit import FirstFit
-from .simulator.memory.contiguous.best_fit import BestFit
-from .simulator.memory.contiguous.worst_fit import WorstFit
+from .generation import GENERAL_QUIZZES, GENERAL_VARIANTS, DIFFICULTIES, split_variant, sample_questions
+from datetime import timedelta
+import os
 import random
+import traceback
+
+
+"""
+Inserts many rows of a model in one query, and returns them with their primary keys.
+Backends which can't return the keys of a bulk insert (ie: MySQL) have the rows read back instead, in insertion order.
+
+@param model The model class.
+@param objects An array of unsaved model instances.
+@param queryset A queryset matching exactly the inserted rows.
+@return An array of the saved model instances, in the same order as objects.
+"""
+
+
+def bulk_create_with_ids(model, objects, queryset):
+    created = model.objects.bulk_create(objects)
+    if any(instance.pk is None for instance in created):
+        created = list(queryset.order_by("id"))
+    return created
+
+
+class QuestionBank(models.Model):
+    VARIANT_CHOICES = tuple((quiz, quiz) for quiz in GENERAL_QUIZZES)
+    DIFFICULTY_CHOICES = tuple((difficulty, difficulty) for difficulty in DIFFICULTIES)
+
+    id = models.AutoField(primary_key=True)
+    variant = models.CharField(max_length=100, choices=VARIANT_CHOICES)
+    difficulty = models.CharField(max_length=3, choices=DIFFICULTY_CHOICES)
+    # Uniform random number in [0, 1), used to sample questions through the index rather than by sorting the table.
+    random_key = models.FloatField()
+    question_text = models.CharField(max_length=1000)
+    processes = models.JSONField()
+    blocks = models.JSONField(blank=True, null=True)
+    correct_answer = models.JSONField(blank=True, null=True)
+    answers = models.JSONField()
+
+    class Meta:
+        indexes = [models.Index(fields=["variant", "difficulty", "random_key"])]
+
+    """
+    Draws random questions for an algorithm and difficulty from the bank.
+    A random key is picked and the questions after it (in key order, wrapping around) are read through the index,
+    so a draw costs one or two indexed range scans however large the bank is.
+    If the bank doesn't hold enough questions, the rest are generated here.
+
+    @param variant_name Name of the algorithm, ie: "RR".
+    @param difficulty "I", "II" or "III".
+    @param count Number of questions.
+    @return An array of questions, in the same format as sample_questions.
+    """
+    @staticmethod
+    def sample(variant_name, difficulty, count):
+        questions = QuestionBank.objects.filter(variant=variant_name, difficulty=difficulty).order_by("random_key")
+        key = random.random()
+
+        drawn = list(questions.filter(random_key__gte=key)[:count])
+        if len(drawn) < count:
+            drawn += list(questions.filter(random_key__lt=key)[:count - len(drawn)])
+
+        return [question.to_question() for question in drawn] + sample_questions([(variant_name, difficulty)] * (count - len(drawn)))
+
+    """
+    Draws the questions of every general assessment, plus the initial assessment, from the bank.
+
+    @return A dictionary in the same format as generate_questions.
+    """
+    @staticmethod
+    def draw_questions():
+        questions = {"Initial Assessment": []}
+        for variant in GENERAL_VARIANTS:
+            variant_name, difficulty = split_variant(variant)
+            drawn = QuestionBank.sample(variant_name, difficulty, 11)
+
+            questions[variant] = drawn[:10]
+            questions["Initial Assessment"].append(drawn[10])
+        return questions
+
+    def to_question(self):
+        return {"question_text": self.question_text, "processes": self.processes, "blocks": self.blocks, "correct_answer": self.correct_answer, "answers": self.answers}
 
 
 class KMeansData(models.Model):
@@ -26,7 +101,7 @@ class PerformanceData(models.Model):
 
 
 class Assessment(models.Model):
-    GENERAL_QUIZZES = ["FCFS", "SJF", "Priority", "RR", "SRTF", "First Fit", "Best Fit", "Worst Fit"]
+    GENERAL_QUIZZES = GENERAL_QUIZZES
 
     VARIANT_CHOICES = (("Generated Assessment", "Generated Assessment"),
                        ("Initial Assessment", "Initial Assessment"))
@@ -44,193 +119,49 @@ class Assessment(models.Model):
     performance_data = models.OneToOneField(PerformanceData, on_delete=models.CASCADE, default=None, blank=True, null=True)
 
     """
-    Generates the general assessments for the user when their account is verified successfully.
+    Queues generation of the general assessments for the user when their account is verified successfully.
+    The job is run by a worker (python manage.py run_assessment_jobs), so verification doesn't wait on the simulations.
     """
     @receiver(user_verified)
     def generate_assessments(sender, user, **kwargs):
-        VARIANT_MAPPINGS = {
-            "CPU": {
-                "FCFS": FCFS(),
-                "SJF": SJF(),
-                "Priority": Priority(),
-                "RR": RR(),
-                "SRTF": SRTF()
-            },
-            "Memory": {
-                "First Fit": FirstFit(),
-                "Best Fit": BestFit(),
-                "Worst Fit": WorstFit()
-            }
-        }
-
-        # Remove all existing assessment objects for this user (regenerate if existing).
-        Assessment.objects.filter(user=user).delete()
-
-        print(user.get_username(), "verified account! Generating assessments...")
-
-        initial_assessment = Assessment(user=user, variant="Initial Assessment", submitted=False, score=None)
-        initial_assessment.save()
-
-        # Generate general assessments
-        for variant_tuple in Assessment.VARIANT_CHOICES[2:]:
-            print(variant_tuple[0])
-
-            split_tuple = variant_tuple[0].split(" ")
-            variant_name = " ".join(split_tuple[0:len(split_tuple) - 1])
-            difficulty = split_tuple[len(split_tuple) - 1]
-
-            cpu_num_processes_lo_hi = [3, 5] if difficulty == "I" else [5, 7] if difficulty == "II" else [7, 9]
-            cpu_max_burst_time = 5 if difficulty == "I" else 9 if difficulty == "II" else 13
-            cpu_max_arrival_time = 10 if difficulty == "I" else 15 if difficulty == "II" else 20
-            cpu_max_priority = 6 if difficulty == "I" else 8 if difficulty == "II" else 10
-            cpu_max_time_quantum = 4 if difficulty == "I" else 7 if difficulty == "II" else 9
-
-            mem_process_block_size_lo_hi = [50, 200] if difficulty == "I" else [50, 500] if difficulty == "II" else [50, 800]
-            mem_num_blocks_lo_hi = [2, 5] if difficulty == "I" else [4, 7] if difficulty == "II" else [5, 9]
-
-            assessment = Assessment(user=user, variant=variant_tuple[0], submitted=False, score=None)
-            assessment.save()
-
-            for question_num in range(11):
-                for process_num in range(random.randint(cpu_num_processes_lo_hi[0], cpu_num_processes_lo_hi[1])):
-                    if variant_name in VARIANT_MAPPINGS["CPU"]:
-                        variant = VARIANT_MAPPINGS["CPU"][variant_name]
-                        if variant_name == "RR":
-                            variant.set_time_quantum(random.randint(1, cpu_max_time_quantum))
-                        variant.create_process("p" + str(process_num), random.randint(0, cpu_max_arrival_time), random.randint(1, cpu_max_burst_time),
-                                               random.randint(0, cpu_max_priority) if variant_name == "Priority" else None)
-                    else:
-                        variant = VARIANT_MAPPINGS["Memory"][variant_name]
-                        variant.create_process("p" + str(process_num), random.randint(mem_process_block_size_lo_hi[0], mem_process_block_size_lo_hi[1]))
-
-                if variant_name in VARIANT_MAPPINGS["Memory"]:
-                    for block_num in range(random.randint(mem_num_blocks_lo_hi[0], mem_num_blocks_lo_hi[1])):
-                        variant.create_block("b" + str(block_num), random.randint(mem_process_block_size_lo_hi[0], mem_process_block_size_lo_hi[1]))
-
-                job_queue = variant.get_job_queue(0) if variant_name in VARIANT_MAPPINGS["CPU"] else variant.get_job_queue()
-                blocks = None
-                allocated = None
-                generated_answers = []
-
-                if variant_name in VARIANT_MAPPINGS["CPU"]:
-                    variant.dispatch_processes()
-                    schedule = variant.get_schedule()
-
-                    generated_schedule = []
-
-                    for process in schedule:
-                        for _ in range(process["burst_time"]):
-                            generated_schedule.append(process)
-
-                    schedule_length = generated_schedule[len(generated_schedule) - 1]["time_delta"]
-
-                    answer_time_delta = random.randint(0, schedule_length)
-                    answer = {"name": generated_schedule[answer_time_delta]["process_name"],
-                              "arrival_time": generated_schedule[answer_time_delta]["arrival_time"],
-                              "burst_time": generated_schedule[answer_time_delta]["burst_time"],
-                              "priority": (generated_schedule[answer_time_delta]["priority"] if variant_name == "Priority" else None)}
-
-                    for _ in range(4):
-                        if len(job_queue) <= 5:
-                            generated_answers = [{"name": process.get_name(),
-                                                  "arrival_time": process.get_arrival_time(),
-                                                  "burst_time": process.get_burst_time(),
-                                                  "priority": (process.get_priority() if variant_name == "Priority" else None)}
-                                                 for process in job_queue]
-                        else:
-                            generated_answers = random.sample(job_queue, 4)
-                            generated_answers = [{"name": answer.get_name(),
-                                                  "arrival_time": answer.get_arrival_time(),
-                                                  "burst_time": answer.get_burst_time(),
-                                                  "priority": (answer.get_priority() if variant_name == "Priority" else None)}
-                                                 for answer in generated_answers]
-
-                    if answer not in generated_answers:
-                        generated_answers.append(answer)
-
-                    random.shuffle(generated_answers)
-
-                    question_text = "Using the " + str(variant_name) + \
-                        " scheduling algorithm, and based on the processes below, which one is executing at time delta " + str(answer_time_delta) + "?"
-
-                else:
-                    variant.allocate_processes()
-
-                    q_process = random.choice([process for process in job_queue if process != None])
-                    blocks = variant.get_blocks()
-                    allocated = variant.get_allocated()
-                    answer = {"name": "None", "size": "N/A"} if not allocated[q_process.get_name()] else {"name": allocated[q_process.get_name()].get_name(),
-                                                                                                          "size": allocated[q_process.get_name()].get_size()}
-
-                    for _ in range(4):
-                        if len(blocks) <= 5:
-                            generated_answers = [{"name": block.get_name(),
-                                                  "size": block.get_size()}
-                                                 for block in blocks]
-                        else:
-                            generated_answers = random.sample(blocks, 4)
-                            generated_answers = [{"name": answer.get_name(),
-                                                  "size": answer.get_size()}
-                                                 for answer in generated_answers]
-
-                    if answer not in generated_answers:
-                        generated_answers.append(answer)
-
-                    random.shuffle(generated_answers)
-
-                    question_text = "Using the " + str(variant_name) + " memory allocation technique, and based on the blocks below, which one does process " + \
-                        str(q_process.get_name()) + " get placed in?"
-
-                processArray = [{"name": process.get_name(),
-                                "arrival_time": process.get_arrival_time(),
-                                 "burst_time": process.get_burst_time(),
-                                 "priority": (process.get_priority() if variant_name == "Priority" else None)}
-                                for process in job_queue] if variant_name in VARIANT_MAPPINGS["CPU"] else [{"name": process.get_name(),
-                                                                                                            "size": process.get_size()} for process in job_queue]
-
-                blocksArray = [{"name": block.get_name(),
-                                "size": block.get_size()}
-                               for block in blocks] if variant_name in VARIANT_MAPPINGS["Memory"] else None
-
-                if question_num == 10:
-                    # Initial Assessment
-                    question_initial = Question(assessment=initial_assessment, question_text=question_text, correct_answer=answer, selected_answer=None, processes=processArray, blocks=blocksArray)
-                    question_initial.save()
-
-                    answer_initial = Answer(question=question_initial, answers=generated_answers)
-                    answer_initial.save()
-                else:
-                    # General Assessment
-                    question = Question(assessment=assessment, question_text=question_text, correct_answer=answer, selected_answer=None, processes=processArray, blocks=blocksArray)
-                    question.save()
-
-                    answer = Answer(question=question, answers=generated_answers)
-                    answer.save()
-
-                VARIANT_MAPPINGS = {
-                    "CPU": {
-                        "FCFS": FCFS(),
-                        "SJF": SJF(),
-                        "Priority": Priority(),
-                        "RR": RR(),
-                        "SRTF": SRTF()
-                    },
-                    "Memory": {
-                        "First Fit": FirstFit(),
-                        "Best Fit": BestFit(),
-                        "Worst Fit": WorstFit()
-                    }
-                }
-
-        # Change order of questions to be random for initial assessment
-        for question_initial in Question.objects.filter(assessment=initial_assessment).order_by("?"):
-            answers_initial = Answer.objects.get(question=question_initial)
-
-            question_initial.delete()
-            answers_initial.delete()
-
-            question_initial.save()
-            Answer(question=question_initial, answers=answers_initial.answers).save()
+        print(user.get_username(), "verified account! Queueing assessment generation...")
+        return AssessmentJob.enqueue(user, AssessmentJob.GENERATE)
+
+    """
+    Saves the general assessments and initial assessment of a user, replacing any existing ones.
+    Every row is built in memory first, then written with a bulk insert per table inside one transaction.
+
+    @param user The user to save the assessments for.
+    @param questions Questions of each assessment, as returned by generate_questions (or generate_many for many users) or QuestionBank.draw_questions.
+    """
+    @staticmethod
+    def save_assessments(user, questions):
+        variants = [variant_tuple[0] for variant_tuple in Assessment.VARIANT_CHOICES[2:]]
+
+        with transaction.atomic():
+            # Remove all existing assessment objects for this user (regenerate if existing).
+            Assessment.objects.filter(user=user).delete()
+
+            assessments = bulk_create_with_ids(Assessment, [Assessment(user=user, variant=variant, submitted=False, score=None)
+                                                            for variant in ["Initial Assessment"] + variants],
+                                               Assessment.objects.filter(user=user))
+            initial_assessment = assessments[0]
+
+            # General assessment questions keep their generated order, the initial assessment's (one per general assessment) are shown in a random order.
+            initial_positions = list(range(len(questions["Initial Assessment"])))
+            random.shuffle(initial_positions)
+            generated_questions = [(assessment, position, generated) for assessment, variant in zip(assessments[1:], variants)
+                                   for position, generated in enumerate(questions[variant])]
+            generated_questions += [(initial_assessment, position, generated) for position, generated in zip(initial_positions, questions["Initial Assessment"])]
+
+            saved_questions = bulk_create_with_ids(Question, [Question(assessment=assessment, position=position, question_text=generated["question_text"],
+                                                                       correct_answer=generated["correct_answer"], selected_answer=None,
+                                                                       processes=generated["processes"], blocks=generated["blocks"])
+                                                              for assessment, position, generated in generated_questions],
+                                                   Question.objects.filter(assessment__user=user))
+
+            Answer.objects.bulk_create([Answer(question=question, answers=generated["answers"])
+                                        for question, (_, _, generated) in zip(saved_questions, generated_questions)])
 
         print("Successfully generated assessments for", user.get_username() + "!")
         return True
@@ -239,14 +170,148 @@ class Assessment(models.Model):
 class Question(models.Model):
     id = models.AutoField(primary_key=True)
     assessment = models.ForeignKey(Assessment, on_delete=models.CASCADE)
+    # Order the question is shown in within its assessment.
+    position = models.IntegerField(default=0)
     question_text = models.CharField(max_length=1000)
     processes = models.JSONField()
     blocks = models.JSONField(blank=True, null=True)
     selected_answer = models.JSONField(blank=True, null=True)
     correct_answer = models.JSONField(blank=True, null=True)
 
+    class Meta:
+        indexes = [models.Index(fields=["assessment", "position"])]
+
 
 class Answer(models.Model):
     id = models.AutoField(primary_key=True)
     question = models.OneToOneField(Question, on_delete=models.CASCADE)
     answers = models.JSONField()
+
+
+class AssessmentJob(models.Model):
+    GENERATE = "Generate"
+    REGENERATE = "Regenerate"
+    KIND_CHOICES = ((GENERATE, GENERATE),
+                    (REGENERATE, REGENERATE))
+
+    PENDING = "Pending"
+    RUNNING = "Running"
+    SUCCEEDED = "Succeeded"
+    FAILED = "Failed"
+    STATUS_CHOICES = ((PENDING, PENDING),
+                      (RUNNING, RUNNING),
+                      (SUCCEEDED, SUCCEEDED),
+                      (FAILED, FAILED))
+
+    # Attempts before a job is marked as failed, and the delay before the first retry (doubled on each retry after).
+    MAX_ATTEMPTS = int(os.getenv("OSSAT_JOB_MAX_ATTEMPTS", 3))
+    RETRY_DELAY = int(os.getenv("OSSAT_JOB_RETRY_DELAY", 30))
+
+    id = models.AutoField(primary_key=True)
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, default=GENERATE)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.IntegerField(default=0)
+    max_attempts = models.IntegerField(default=MAX_ATTEMPTS)
+    error = models.TextField(blank=True, default="")
+    run_after = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "run_after"])]
+
+    """
+    Queues a job for a user. A job of the same kind already waiting for the user is reused rather than queued twice.
+
+    @param user The user to generate assessments for.
+    @param kind GENERATE (skipped if the user already has assessments) or REGENERATE (replaces them).
+    @return The AssessmentJob.
+    """
+    @staticmethod
+    def enqueue(user, kind=GENERATE):
+        pending = AssessmentJob.objects.filter(user=user, kind=kind, status=AssessmentJob.PENDING).first()
+        if pending:
+            return pending
+        return AssessmentJob.objects.create(user=user, kind=kind)
+
+    """
+    Claims the next jobs which are due, marking them as running. Rows are locked while claiming (and locked rows skipped),
+    so several workers can share the queue without running a job twice.
+
+    @param limit Most jobs to claim.
+    @return An array of the claimed jobs, oldest first.
+    """
+    @staticmethod
+    def claim(limit=1):
+        with transaction.atomic():
+            jobs = list(AssessmentJob.objects.select_for_update(skip_locked=True)
+                        .filter(status=AssessmentJob.PENDING, run_after__lte=timezone.now()).order_by("id")[:limit])
+            now = timezone.now()
+            AssessmentJob.objects.filter(id__in=[job.id for job in jobs]).update(status=AssessmentJob.RUNNING, attempts=models.F("attempts") + 1, updated_at=now)
+            for job in jobs:
+                job.status = AssessmentJob.RUNNING
+                job.attempts += 1
+                job.updated_at = now
+        return jobs
+
+    """
+    Puts running jobs which haven't finished in time back in the queue, ie: after their worker was killed.
+
+    @param timeout Seconds a job can run for.
+    @return Number of jobs requeued.
+    """
+    @staticmethod
+    def requeue_stalled(timeout):
+        return AssessmentJob.objects.filter(status=AssessmentJob.RUNNING, updated_at__lt=timezone.now() - timedelta(seconds=timeout)) \
+            .update(status=AssessmentJob.PENDING, run_after=timezone.now(), updated_at=timezone.now())
+
+    """
+    Marks a claimed job as still alive, so requeue_stalled leaves it be. claim stamps a whole batch at once, so this is called as each job starts.
+
+    @return False if the job is no longer ours, ie: it was requeued (and maybe claimed by another worker) while waiting for the rest of its batch.
+    """
+
+    def heartbeat(self):
+        self.updated_at = timezone.now()
+        return AssessmentJob.objects.filter(id=self.id, status=AssessmentJob.RUNNING, attempts=self.attempts).update(updated_at=self.updated_at) == 1
+
+    """
+    Runs a claimed job, saving the user's assessments.
+
+    @param questions Pre-generated questions (see generate_questions), or None to draw them from the question bank.
+    @return True if the job succeeded.
+    """
+
+    def run(self, questions=None):
+        try:
+            if self.kind == AssessmentJob.GENERATE and Assessment.objects.filter(user=self.user).exists():
+                print("Assessments already exist for", self.user.get_username() + ". Skipping generation.")
+            else:
+                Assessment.save_assessments(self.user, questions if questions is not None else QuestionBank.draw_questions())
+        except Exception:
+            self.fail(traceback.format_exc())
+            return False
+
+        self.status = AssessmentJob.SUCCEEDED
+        self.error = ""
+        self.finished_at = timezone.now()
+        self.save(update_fields=["status", "error", "finished_at", "updated_at"])
+        return True
+
+    """
+    Records a failed attempt, queueing a retry (with exponential backoff) if the job has attempts left.
+
+    @param error Description of the error, ie: a traceback.
+    """
+
+    def fail(self, error):
+        self.error = error
+        if self.attempts < self.max_attempts:
+            self.status = AssessmentJob.PENDING
+            self.run_after = timezone.now() + timedelta(seconds=AssessmentJob.RETRY_DELAY * 2 ** (self.attempts - 1))
+        else:
+            self.status = AssessmentJob.FAILED
+            self.finished_at = timezone.now()
+        self.save(update_fields=["status", "error", "run_after", "finished_at", "updated_at"])
@@ -1,22 +1,16 @@
 import graphene
-import random
 from graphene_django.types import DjangoObjectType
 from numpy.core.fromnumeric import var
-from .models import Assessment, Question, Answer, PerformanceData, KMeansData, Answer
+from .models import Assessment, Question, Answer, PerformanceData, KMeansData, Answer, AssessmentJob, QuestionBank, bulk_create_with_ids
 from users.models import CustomUser
 from organisations.models import Organisation
 from graphql_jwt.utils import get_payload as verify_token
-from statistics import mean
+from graphql import GraphQLError
 from pprint import pprint
-import numpy as np
-from .simulator.cpu.non_preemptive.fcfs import FCFS
-from .simulator.cpu.non_preemptive.sjf import SJF
-from .simulator.cpu.non_preemptive.priority import Priority
-from .simulator.cpu.preemptive.rr import RR
-from .simulator.cpu.preemptive.srtf import SRTF
-from .simulator.memory.contiguous.first_fit import FirstFit
-from .simulator.memory.contiguous.best_fit import BestFit
-from .simulator.memory.contiguous.worst_fit import WorstFit
+from .simulator.cache import simulation_cache
+from .simulator.parallel import CPU_SCHEDULERS
+from .generation import DIFFICULTY_PROFILES
+from .clustering import score_matrix, kmeans_1d_columns, closest_centroids
 
 
 class AssessmentType(DjangoObjectType):
@@ -36,6 +30,42 @@ class AnswerType(DjangoObjectType):
         model = Answer
 
 
+class AssessmentJobType(DjangoObjectType):
+    class Meta:
+        model = AssessmentJob
+        fields = ("id", "kind", "status", "attempts", "max_attempts", "error", "run_after", "created_at", "updated_at", "finished_at")
+        convert_choices_to_enum = False
+
+
+class ProcessMetricsType(graphene.ObjectType):
+    name = graphene.String()
+    arrival_time = graphene.Int()
+    burst_time = graphene.Int()
+    completion_time = graphene.Int()
+    turnaround_time = graphene.Int()
+    waiting_time = graphene.Int()
+    response_time = graphene.Int()
+
+
+class ScheduleMetricsType(graphene.ObjectType):
+    processes = graphene.List(ProcessMetricsType)
+    makespan = graphene.Int()
+    average_turnaround_time = graphene.Float()
+    average_waiting_time = graphene.Float()
+    average_response_time = graphene.Float()
+    cpu_utilization = graphene.Float()
+    throughput = graphene.Float()
+
+
+class SimulationCacheStatsType(graphene.ObjectType):
+    hits = graphene.Int()
+    misses = graphene.Int()
+    evictions = graphene.Int()
+    size = graphene.Int()
+    max_size = graphene.Int()
+    hit_rate = graphene.Float()
+
+
 class Utils:
     @staticmethod
     def authenticated_and_permitted(token, username):
@@ -59,6 +89,10 @@ class Utils:
 class Query():
     get_assessments = graphene.List(AssessmentType, username=graphene.String(), token=graphene.String(), variant=graphene.String(required=False))
     get_questions = graphene.List(QuestionType, username=graphene.String(), token=graphene.String(), assessment_id=graphene.ID())
+    get_schedule_metrics = graphene.Field(ScheduleMetricsType, username=graphene.String(), token=graphene.String(), algorithm=graphene.String(),
+                                          processes=graphene.JSONString(), time_quantum=graphene.Int(required=False))
+    get_simulation_cache_stats = graphene.Field(SimulationCacheStatsType, token=graphene.String())
+    get_assessment_jobs = graphene.List(AssessmentJobType, username=graphene.String(), token=graphene.String(), id=graphene.ID(required=False))
 
     def resolve_get_assessments(self, info, username, token, variant=None):
         if Utils.authenticated_and_permitted(token, username):
@@ -69,7 +103,7 @@ class Query():
         if Utils.authenticated_and_permitted(token, username):
             assessment = Assessment.objects.get(pk=assessment_id)
 
-            assessment_object = Question.objects.filter(assessment=assessment)
+            assessment_object = Question.objects.filter(assessment=assessment).order_by("position", "id")
 
             if not assessment.submitted:
                 for instance in assessment_object:
@@ -77,6 +111,53 @@ class Query():
 
             return assessment_object
 
+    def resolve_get_schedule_metrics(self, info, username, token, algorithm, processes, time_quantum=None):
+        if Utils.authenticated_and_permitted(token, username):
+            # Processes are given in the same format as Question.processes. They come straight from the client, so are checked before scheduling.
+            # Sizes are capped at the hardest generated questions, so a request can't ask for an arbitrarily long simulation.
+            limits = DIFFICULTY_PROFILES["III"]
+            if algorithm not in CPU_SCHEDULERS:
+                raise GraphQLError("Unknown scheduling algorithm " + str(algorithm) + ", expected one of " + ", ".join(CPU_SCHEDULERS) + ".")
+            if algorithm == "RR" and time_quantum is not None and not 1 <= time_quantum <= limits["max_time_quantum"]:
+                raise GraphQLError("The time quantum must be between 1 and " + str(limits["max_time_quantum"]) + ".")
+            if not isinstance(processes, list):
+                raise GraphQLError("Processes must be a list.")
+            if len(processes) > limits["num_processes"][1]:
+                raise GraphQLError("At most " + str(limits["num_processes"][1]) + " processes can be scheduled.")
+            for process in processes:
+                if not isinstance(process, dict) or not all(key in process for key in ("name", "arrival_time", "burst_time")):
+                    raise GraphQLError("Every process needs a name, arrival_time and burst_time.")
+                if not all(isinstance(process[key], int) and not isinstance(process[key], bool) for key in ("arrival_time", "burst_time")) \
+                        or not 0 <= process["arrival_time"] <= limits["max_arrival_time"] or not 1 <= process["burst_time"] <= limits["max_burst_time"]:
+                    raise GraphQLError("Process " + str(process["name"]) + " needs an arrival_time between 0 and " + str(limits["max_arrival_time"]) +
+                                       " and a burst_time between 1 and " + str(limits["max_burst_time"]) + ".")
+                if algorithm == "Priority" and (not isinstance(process.get("priority"), int) or isinstance(process.get("priority"), bool)):
+                    raise GraphQLError("Process " + str(process["name"]) + " needs a priority.")
+
+            # Arbitrary client input would only churn the shared cache, so these requests aren't cached.
+            scheduler = CPU_SCHEDULERS[algorithm](track_queues=False, cache=None)
+            if algorithm == "RR" and time_quantum is not None:
+                scheduler.set_time_quantum(time_quantum)
+
+            for process in processes:
+                scheduler.create_process(process["name"], process["arrival_time"], process["burst_time"], process.get("priority") if algorithm == "Priority" else None)
+            scheduler.dispatch_processes()
+
+            metrics = scheduler.get_metrics()
+            metrics["processes"] = [ProcessMetricsType(**process) for process in metrics["processes"]]
+            return ScheduleMetricsType(**metrics)
+
+    def resolve_get_simulation_cache_stats(self, info, token):
+        # Staff only, used to size the cache (OSSAT_SIMULATION_CACHE_SIZE) from production hit rates.
+        if CustomUser.objects.get(username=verify_token(token)["username"]).is_staff:
+            return SimulationCacheStatsType(**simulation_cache.get_stats())
+
+    def resolve_get_assessment_jobs(self, info, username, token, id=None):
+        if Utils.authenticated_and_permitted(token, username):
+            # Newest first, so the frontend can poll the status of the latest generation after verifying.
+            jobs = AssessmentJob.objects.filter(user=CustomUser.objects.get(username=username)).order_by("-id")
+            return jobs.filter(id=id) if id else jobs
+
 
 class SetQuestionAnswerMutation(graphene.Mutation):
     class Arguments:
@@ -151,33 +232,18 @@ class SubmitAssessmentMutation(graphene.Mutation):
         assessment.performance_data = performance_data
         assessment.save()
 
-        # Get performance data for all initial assessments.
-        initial_assessments = Assessment.objects.filter(variant="Initial Assessment").only("performance_data", "id")
-
-        output_centroids = {}
-        closest_centroids = {}
-
-        for variant in variant_performance.keys():
-            centroids = KMeansData.objects.last().output_centroids[variant] if len(KMeansData.objects.all()) > 0 else [random.uniform(0.0, 3.0) for _ in range(k)]
-            closest_centroid = {i: [] for i in range(k)}
-
-            for initial in initial_assessments:
-                converged = [False for _ in range(k)]
-
-                if initial.performance_data:
+        # Scores of every submitted initial assessment, one row per assessment and one column per variant.
+        variants = list(variant_performance.keys())
+        scores = score_matrix(PerformanceData.objects.filter(assessment__variant="Initial Assessment").values_list("per_question_variant_score", flat=True), variants)
 
-                    variant_score = initial.performance_data.per_question_variant_score[variant][0]
-                    while not all(converged):
-                        old_centroids = []
-                        closest_centroid[min(range(k), key=lambda i: abs(centroids[i]-variant_score))].append(variant_score)
-                        old_centroids.extend(centroids)
-                        centroids = [mean(closest_centroid[i]) if len(closest_centroid[i]) > 0 else centroids[i] for i in range(k)]
-                        converged = [True if abs(centroids[i] - old_centroids[i]) < 0.001 else False for i in range(k)]
+        # Each variant is clustered on a single score, so the clustering is exact. Centroids are in ascending order, so cluster numbers are comparable between users.
+        centroids, _ = kmeans_1d_columns(scores, k)
+        closest = closest_centroids(centroids, [variant_performance[variant][0] for variant in variants])
 
-            output_centroids[variant] = centroids
-            closest_centroids[variant] = min(range(k), key=lambda i: abs(centroids[i]-variant_score))
+        output_centroids = {variant: centroids[:, column].tolist() for column, variant in enumerate(variants)}
+        closest_centroids_data = {variant: int(closest[column]) for column, variant in enumerate(variants)}
 
-        kmeans_data = KMeansData(user=CustomUser.objects.get(username=username), output_centroids=output_centroids, closest_centroids=closest_centroids)
+        kmeans_data = KMeansData(user=CustomUser.objects.get(username=username), output_centroids=output_centroids, closest_centroids=closest_centroids_data)
         kmeans_data.save()
 
         all_kmeans_data = KMeansData.objects.all()
@@ -223,170 +289,31 @@ class SubmitAssessmentMutation(graphene.Mutation):
         generated_assessment = Assessment(user=CustomUser.objects.get(username=username), variant="Generated Assessment", submitted=False, score=None)
         generated_assessment.save()
 
-        VARIANT_MAPPINGS = {
-            "CPU": {
-                "FCFS": FCFS(),
-                "SJF": SJF(),
-                "Priority": Priority(),
-                "RR": RR(),
-                "SRTF": SRTF()
-            },
-            "Memory": {
-                "First Fit": FirstFit(),
-                "Best Fit": BestFit(),
-                "Worst Fit": WorstFit()
-            }
-        }
-
-        generated_qs = 0
+        # Pick the algorithm of each question: those the similar users scored observing_score on, from the lowest score up.
+        question_variants = []
         observing_score = 0
 
-        while generated_qs < 24:
-
-            cpu_num_processes_lo_hi = [3, 5] if observing_score == 0 or 1 else [5, 7] if observing_score == 2 else [7, 9]
-            cpu_max_burst_time = 5 if observing_score == 0 or 1 else 9 if observing_score == 2 else 13
-            cpu_max_arrival_time = 10 if observing_score == 0 or 1 else 15 if observing_score == 2 else 20
-            cpu_max_priority = 6 if observing_score == 0 or 1 else 8 if observing_score == 2 else 10
-            cpu_max_time_quantum = 4 if observing_score == 0 or 1 else 7 if observing_score == 2 else 9
-
-            mem_process_block_size_lo_hi = [50, 200] if observing_score == 0 or 1 else [50, 500] if observing_score == 2 else [50, 800]
-            mem_num_blocks_lo_hi = [2, 5] if observing_score == 0 or 1 else [4, 7] if observing_score == 2 else [5, 9]
-
+        while len(question_variants) < 24:
             for data in generation_data:
                 for variant_name in data.keys():
-                    if data[variant_name] is not None:
-                        if data[variant_name][0] == observing_score:
-                            pass
-                            for process_num in range(random.randint(cpu_num_processes_lo_hi[0], cpu_num_processes_lo_hi[1])):
-                                if variant_name in VARIANT_MAPPINGS["CPU"]:
-                                    variant = VARIANT_MAPPINGS["CPU"][variant_name]
-                                    if variant_name == "RR":
-                                        variant.set_time_quantum(random.randint(1, cpu_max_time_quantum))
-                                    variant.create_process("p" + str(process_num), random.randint(0, cpu_max_arrival_time), random.randint(1, cpu_max_burst_time),
-                                                           random.randint(0, cpu_max_priority) if variant_name == "Priority" else None)
-                                else:
-                                    variant = VARIANT_MAPPINGS["Memory"][variant_name]
-                                    variant.create_process("p" + str(process_num), random.randint(mem_process_block_size_lo_hi[0], mem_process_block_size_lo_hi[1]))
-
-                            if variant_name in VARIANT_MAPPINGS["Memory"]:
-                                for block_num in range(random.randint(mem_num_blocks_lo_hi[0], mem_num_blocks_lo_hi[1])):
-                                    variant.create_block("b" + str(block_num), random.randint(mem_process_block_size_lo_hi[0], mem_process_block_size_lo_hi[1]))
-
-                            job_queue = variant.get_job_queue(0) if variant_name in VARIANT_MAPPINGS["CPU"] else variant.get_job_queue()
-                            blocks = None
-                            allocated = None
-                            generated_answers = []
-
-                            if variant_name in VARIANT_MAPPINGS["CPU"]:
-                                variant.dispatch_processes()
-                                schedule = variant.get_schedule()
-
-                                generated_schedule = []
-
-                                for process in schedule:
-                                    for _ in range(process["burst_time"]):
-                                        generated_schedule.append(process)
-
-                                schedule_length = generated_schedule[len(generated_schedule) - 1]["time_delta"]
-
-                                answer_time_delta = random.randint(0, schedule_length)
-                                answer = {"name": generated_schedule[answer_time_delta]["process_name"],
-                                          "arrival_time": generated_schedule[answer_time_delta]["arrival_time"],
-                                          "burst_time": generated_schedule[answer_time_delta]["burst_time"],
-                                          "priority": (generated_schedule[answer_time_delta]["priority"] if variant_name == "Priority" else None)}
-
-                                for _ in range(4):
-                                    if len(job_queue) <= 5:
-                                        generated_answers = [{"name": process.get_name(),
-                                                              "arrival_time": process.get_arrival_time(),
-                                                             "burst_time": process.get_burst_time(),
-                                                              "priority": (process.get_priority() if variant_name == "Priority" else None)}
-                                                             for process in job_queue]
-                                    else:
-                                        generated_answers = random.sample(job_queue, 4)
-                                        generated_answers = [{"name": answer.get_name(),
-                                                              "arrival_time": answer.get_arrival_time(),
-                                                             "burst_time": answer.get_burst_time(),
-                                                              "priority": (answer.get_priority() if variant_name == "Priority" else None)}
-                                                             for answer in generated_answers]
-
-                                if answer not in generated_answers:
-                                    generated_answers.append(answer)
-
-                                random.shuffle(generated_answers)
-
-                                question_text = "Using the " + str(variant_name) + \
-                                    " scheduling algorithm, and based on the processes below, which one is executing at time delta " + str(answer_time_delta) + "?"
-
-                            else:
-                                variant.allocate_processes()
-
-                                q_process = random.choice([process for process in job_queue if process != None])
-                                blocks = variant.get_blocks()
-                                allocated = variant.get_allocated()
-                                answer = {"name": "None", "size": "N/A"} if not allocated[q_process.get_name()] else {"name": allocated[q_process.get_name()].get_name(),
-                                                                                                                      "size": allocated[q_process.get_name()].get_size()}
-
-                                for _ in range(4):
-                                    if len(blocks) <= 5:
-                                        generated_answers = [{"name": block.get_name(),
-                                                              "size": block.get_size()}
-                                                             for block in blocks]
-                                    else:
-                                        generated_answers = random.sample(blocks, 4)
-                                        generated_answers = [{"name": answer.get_name(),
-                                                              "size": answer.get_size()}
-                                                             for answer in generated_answers]
-
-                                if answer not in generated_answers:
-                                    generated_answers.append(answer)
-
-                                random.shuffle(generated_answers)
-
-                                question_text = "Using the " + str(variant_name) + " memory allocation technique, and based on the blocks below, which one does process " + \
-                                    str(q_process.get_name()) + " get placed in?"
-
-                            processArray = [{"name": process.get_name(),
-                                             "arrival_time": process.get_arrival_time(),
-                                            "burst_time": process.get_burst_time(),
-                                             "priority": (process.get_priority() if variant_name == "Priority" else None)}
-                                            for process in job_queue] if variant_name in VARIANT_MAPPINGS["CPU"] else [{"name": process.get_name(),
-                                                                                                                        "size": process.get_size()} for process in job_queue]
-
-                            blocksArray = [{"name": block.get_name(),
-                                            "size": block.get_size()}
-                                           for block in blocks] if variant_name in VARIANT_MAPPINGS["Memory"] else None
-
-                            question = Question(assessment=generated_assessment, question_text=question_text, correct_answer=answer,
-                                                selected_answer=None, processes=processArray, blocks=blocksArray)
-                            question.save()
-
-                            answer = Answer(question=question, answers=generated_answers)
-                            answer.save()
-
-                            generated_qs += 1
-
-                            VARIANT_MAPPINGS = {
-                                "CPU": {
-                                    "FCFS": FCFS(),
-                                    "SJF": SJF(),
-                                    "Priority": Priority(),
-                                    "RR": RR(),
-                                    "SRTF": SRTF()
-                                },
-                                "Memory": {
-                                    "First Fit": FirstFit(),
-                                    "Best Fit": BestFit(),
-                                    "Worst Fit": WorstFit()
-                                }
-                            }
-
-                            if generated_qs >= 24:
-                                return
+                    if data[variant_name] is not None and data[variant_name][0] == observing_score and len(question_variants) < 24:
+                        question_variants.append(variant_name)
 
             if observing_score < 3:
                 observing_score += 1
 
+        # Generated assessments have always used the easiest parameters. Questions are drawn from the question bank, rather than simulated here.
+        drawn = {variant_name: QuestionBank.sample(variant_name, "I", question_variants.count(variant_name)) for variant_name in dict.fromkeys(question_variants)}
+        generated_questions = [drawn[variant_name].pop() for variant_name in question_variants]
+
+        questions = bulk_create_with_ids(Question, [Question(assessment=generated_assessment, position=position, question_text=generated["question_text"],
+                                                             correct_answer=generated["correct_answer"], selected_answer=None,
+                                                             processes=generated["processes"], blocks=generated["blocks"])
+                                                    for position, generated in enumerate(generated_questions)],
+                                         Question.objects.filter(assessment=generated_assessment))
+
+        Answer.objects.bulk_create([Answer(question=question, answers=generated["answers"]) for question, generated in zip(questions, generated_questions)])
+
 
 class Mutation():
     set_question_answer = SetQuestionAnswerMutation.Field()
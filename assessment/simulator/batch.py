@@ -0,0 +1,191 @@
+import numpy as np
+
+# Batch versions of the simulators, for running many small, independent scenarios (ie: one per generated question) at once.
+# Each scenario is a row of a padded array, and the algorithms loop over processes or events while every row advances together.
+
+CPU_ALGORITHMS = ("FCFS", "SJF", "Priority")
+MEMORY_ALGORITHMS = ("First Fit", "Best Fit", "Worst Fit")
+
+
+"""
+Builds the mask of real (non-padding) entries from the number of entries in each row.
+
+@param shape Shape of the padded array.
+@param counts Number of entries in each row, or None if no row is padded.
+@return A boolean array of the given shape.
+"""
+
+
+def valid_mask(shape, counts):
+    if counts is None:
+        return np.ones(shape, dtype=bool)
+    return np.arange(shape[1])[None, :] < np.asarray(counts)[:, None]
+
+
+"""
+Ranks the processes of each row by their tie-break tuple, so the best process is the one with the lowest rank.
+
+@param keys Arrays of the tuple, most significant first, each of shape (scenarios, processes).
+@return An array holding the rank of each process within its row.
+"""
+
+
+def rank_processes(keys):
+    # np.lexsort treats the last key as the most significant.
+    order = np.lexsort(tuple(reversed(keys)), axis=-1)
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.arange(order.shape[1])[None, :].repeat(order.shape[0], axis=0), axis=-1)
+    return ranks
+
+
+"""
+Generates the schedules for many process sets at once.
+Matches the output of FCFS, SJF and Priority dispatch_processes for each row.
+
+@param algorithm One of "FCFS", "SJF" or "Priority".
+@param arrival_times Arrival times, shape (scenarios, processes). Padding entries are ignored.
+@param burst_times Burst times, shape (scenarios, processes). Must be at least 1.
+@param priorities Priorities, shape (scenarios, processes). Required for "Priority".
+@param counts Number of processes in each row, or None if no row is padded.
+@param names Process names, shape (scenarios, processes). Defaults to p0, p1, ... as used by the question generators.
+@return An array of schedules, one per row, in the same format as CPUScheduler.get_schedule().
+"""
+
+
+def schedule_batch(algorithm, arrival_times, burst_times, priorities=None, counts=None, names=None):
+    if algorithm not in CPU_ALGORITHMS:
+        raise ValueError("Unsupported batch scheduling algorithm " + str(algorithm) + ", expected one of " + str(CPU_ALGORITHMS) + ".")
+
+    arrival_times = np.asarray(arrival_times, dtype=np.int64)
+    burst_times = np.asarray(burst_times, dtype=np.int64)
+    scenarios, num_processes = arrival_times.shape
+    valid = valid_mask(arrival_times.shape, counts)
+    if names is None:
+        names = np.array([["p" + str(i) for i in range(num_processes)]] * scenarios)
+    names = np.asarray(names)
+    name_ranks = rank_processes([names])
+
+    if algorithm == "FCFS":
+        ranks = rank_processes([arrival_times, burst_times, name_ranks])
+    elif algorithm == "SJF":
+        ranks = rank_processes([burst_times, arrival_times, name_ranks])
+    else:
+        priorities = np.asarray(priorities, dtype=np.int64)
+        ranks = rank_processes([priorities, arrival_times, burst_times, name_ranks])
+
+    # Priority is preemptive on arrival, like Priority.dispatch_processes.
+    preemptive = algorithm == "Priority"
+    rows = np.arange(scenarios)
+    never = np.iinfo(np.int64).max
+    remaining_times = np.where(valid, burst_times, 0)
+    time_deltas = np.zeros(scenarios, dtype=np.int64)
+    # Each step, every unfinished row either idles until its next arrival, or runs its best available process until it completes or is preempted.
+    steps = []
+
+    while True:
+        unfinished = remaining_times > 0
+        active = unfinished.any(axis=1)
+        if not active.any():
+            break
+
+        available = unfinished & (arrival_times <= time_deltas[:, None])
+        idle = active & ~available.any(axis=1)
+        next_arrival = np.where(unfinished & (arrival_times > time_deltas[:, None]), arrival_times, never).min(axis=1)
+        steps.append((rows[idle], np.full(idle.sum(), -1), time_deltas[idle], next_arrival[idle] - time_deltas[idle]))
+        time_deltas = np.where(idle, next_arrival, time_deltas)
+
+        available = unfinished & (arrival_times <= time_deltas[:, None])
+        running = active & available.any(axis=1)
+        chosen = np.where(available, ranks, never).argmin(axis=1)
+        run_times = remaining_times[rows, chosen]
+        if preemptive:
+            next_arrival = np.where(unfinished & (arrival_times > time_deltas[:, None]), arrival_times, never).min(axis=1)
+            run_times = np.minimum(run_times, next_arrival - time_deltas)
+        run_times = np.where(running, run_times, 0)
+
+        steps.append((rows[running], chosen[running], time_deltas[running], run_times[running]))
+        remaining_times[rows, chosen] -= run_times
+        time_deltas += run_times
+
+    return build_schedules(algorithm, steps, scenarios, names, arrival_times, burst_times, priorities)
+
+
+"""
+Converts the steps of schedule_batch into schedule segments, merging consecutive steps of the same process.
+"""
+
+
+def build_schedules(algorithm, steps, scenarios, names, arrival_times, burst_times, priorities):
+    schedules = [[] for _ in range(scenarios)]
+    # Remaining time of every process in every row, as of the latest step converted.
+    remaining_times = burst_times.tolist()
+    last_process = [None] * scenarios
+
+    for step_rows, step_processes, step_times, step_lengths in steps:
+        for row, process, time_delta, length in zip(step_rows.tolist(), step_processes.tolist(), step_times.tolist(), step_lengths.tolist()):
+            schedule = schedules[row]
+            if process == -1:
+                segment = {"process_name": "IDLE", "time_delta": time_delta, "arrival_time": None, "burst_time": length, "remaining_time": None}
+                if algorithm == "Priority":
+                    segment["priority"] = None
+                schedule.append(segment)
+                last_process[row] = None
+                continue
+
+            remaining_times[row][process] -= length
+            if last_process[row] == process:
+                schedule[len(schedule) - 1]["burst_time"] += length
+                schedule[len(schedule) - 1]["remaining_time"] = remaining_times[row][process]
+                continue
+
+            segment = {"process_name": str(names[row][process]), "time_delta": time_delta, "arrival_time": int(arrival_times[row][process]),
+                       "burst_time": length, "remaining_time": remaining_times[row][process]}
+            if algorithm == "Priority":
+                segment["priority"] = int(priorities[row][process])
+            schedule.append(segment)
+            last_process[row] = process
+
+    return schedules
+
+
+"""
+Allocates many process sets to many block sets at once.
+Matches the allocations of FirstFit, BestFit and WorstFit allocate_processes for each row.
+
+@param algorithm One of "First Fit", "Best Fit" or "Worst Fit".
+@param process_sizes Process sizes, shape (scenarios, processes). Padding entries are ignored.
+@param block_sizes Block sizes, shape (scenarios, blocks). Padding entries are ignored.
+@param process_counts Number of processes in each row, or None if no row is padded.
+@param block_counts Number of blocks in each row, or None if no row is padded.
+@return An array of shape (scenarios, processes) holding the index of the block each process is placed in, or -1 if it isn't.
+"""
+
+
+def allocate_batch(algorithm, process_sizes, block_sizes, process_counts=None, block_counts=None):
+    if algorithm not in MEMORY_ALGORITHMS:
+        raise ValueError("Unsupported batch allocation algorithm " + str(algorithm) + ", expected one of " + str(MEMORY_ALGORITHMS) + ".")
+
+    process_sizes = np.asarray(process_sizes, dtype=np.int64)
+    block_sizes = np.asarray(block_sizes, dtype=np.int64)
+    scenarios, num_processes = process_sizes.shape
+    valid_processes = valid_mask(process_sizes.shape, process_counts)
+    free = valid_mask(block_sizes.shape, block_counts).copy()
+    allocated = np.full((scenarios, num_processes), -1, dtype=np.int64)
+    rows = np.arange(scenarios)
+
+    # Processes are placed in job queue order, so loop over them while every row is placed together.
+    for process in range(num_processes):
+        fits = free & (block_sizes >= process_sizes[:, process][:, None]) & valid_processes[:, process][:, None]
+        if algorithm == "First Fit":
+            chosen = fits.argmax(axis=1)
+        elif algorithm == "Best Fit":
+            # argmin/argmax take the first of equal sizes, as the sequential allocators only replace on a strictly better fit.
+            chosen = np.where(fits, block_sizes, np.iinfo(np.int64).max).argmin(axis=1)
+        else:
+            chosen = np.where(fits, block_sizes, -1).argmax(axis=1)
+
+        placed = fits.any(axis=1)
+        allocated[placed, process] = chosen[placed]
+        free[rows[placed], chosen[placed]] = False
+
+    return allocated
@@ -0,0 +1,152 @@
+from .parallel import CPU_SCHEDULERS, MEMORY_MANAGERS
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+# Times each algorithm on seeded synthetic workloads of increasing size, recording wall time and peak memory.
+# Usage: python -m assessment.simulator.benchmark --output results.json
+
+
+"""
+Builds a scheduler loaded with a random workload. Arrivals are spread so the CPU is rarely idle.
+
+@param algorithm Name of the scheduler, ie: "SRTF".
+@param num_processes Number of processes.
+@param max_burst_time Longest burst time a process can have.
+@param seed Seed for the workload.
+@param time_quantum Time quantum for RR.
+@param track_queues Record the queues while scheduling?
+@return A CPUScheduler ready to dispatch.
+"""
+
+
+def create_cpu_workload(algorithm, num_processes, max_burst_time, seed, time_quantum=2, track_queues=False):
+    generator = random.Random(seed)
+    scheduler = CPU_SCHEDULERS[algorithm](track_queues=track_queues)
+    if algorithm == "RR":
+        scheduler.set_time_quantum(time_quantum)
+    max_arrival_time = num_processes * (max_burst_time + 1) // 2
+    for i in range(num_processes):
+        scheduler.create_process("p" + str(i), generator.randint(0, max_arrival_time), generator.randint(1, max_burst_time),
+                                 generator.randint(0, 10) if algorithm == "Priority" else None)
+    return scheduler
+
+
+"""
+Builds a memory manager loaded with a random workload, with as many blocks as processes.
+
+@param algorithm Name of the memory manager, ie: "Best Fit".
+@param num_processes Number of processes (and blocks).
+@param max_size Largest size of a process or block.
+@param seed Seed for the workload.
+@return A MemoryManager ready to allocate.
+"""
+
+
+def create_memory_workload(algorithm, num_processes, max_size, seed):
+    generator = random.Random(seed)
+    manager = MEMORY_MANAGERS[algorithm]()
+    manager.create_blocks([("b" + str(i), generator.randint(1, max_size)) for i in range(num_processes)])
+    manager.create_processes([("p" + str(i), generator.randint(1, max_size)) for i in range(num_processes)])
+    return manager
+
+
+"""
+Measures one run of a workload: the fastest wall time over a number of repeats, then the peak memory of a separate traced run
+(tracing slows the run down, so it isn't timed).
+
+@param create_workload Function building a fresh workload.
+@param run Function running a workload.
+@param repeat Number of timed runs.
+@return A tuple of (seconds, peak bytes, workload of the traced run).
+"""
+
+
+def measure(create_workload, run, repeat):
+    timings = []
+    for _ in range(repeat):
+        workload = create_workload()
+        start = time.perf_counter()
+        run(workload)
+        timings.append(time.perf_counter() - start)
+
+    workload = create_workload()
+    tracemalloc.start()
+    run(workload)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return min(timings), peak, workload
+
+
+def benchmark_cpu(algorithms, sizes, burst_times, repeat=3, seed=0, time_quantum=2, track_queues=False):
+    results = []
+    for algorithm in algorithms:
+        for num_processes in sizes:
+            for max_burst_time in burst_times:
+                seconds, peak, scheduler = measure(lambda: create_cpu_workload(algorithm, num_processes, max_burst_time, seed, time_quantum, track_queues),
+                                                   lambda scheduler: scheduler.dispatch_processes(), repeat)
+                results.append({"algorithm": algorithm, "processes": num_processes, "max_burst_time": max_burst_time, "seconds": seconds,
+                                "peak_memory_bytes": peak, "segments": len(scheduler.get_schedule())})
+                print(algorithm, num_processes, max_burst_time, "%.6fs" % seconds, str(peak) + "B", file=sys.stderr)
+    return results
+
+
+def benchmark_memory(algorithms, sizes, max_size, repeat=3, seed=0):
+    results = []
+    for algorithm in algorithms:
+        for num_processes in sizes:
+            seconds, peak, manager = measure(lambda: create_memory_workload(algorithm, num_processes, max_size, seed),
+                                             lambda manager: manager.allocate_processes(), repeat)
+            results.append({"algorithm": algorithm, "processes": num_processes, "blocks": num_processes, "max_size": max_size, "seconds": seconds,
+                            "peak_memory_bytes": peak, "allocated": len([block for block in manager.get_allocated().values() if block])})
+            print(algorithm, num_processes, "%.6fs" % seconds, str(peak) + "B", file=sys.stderr)
+    return results
+
+
+def parse_list(value, cast=int):
+    return [cast(item) for item in value.split(",") if item]
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Benchmark the OSSAT simulators on synthetic workloads.")
+    parser.add_argument("--algorithms", type=lambda value: parse_list(value, str), default=list(CPU_SCHEDULERS) + list(MEMORY_MANAGERS),
+                        help="Comma separated algorithms, ie: FCFS,RR,Best Fit.")
+    parser.add_argument("--sizes", type=parse_list, default=[100, 1000, 10000], help="Comma separated numbers of processes for the CPU schedulers.")
+    parser.add_argument("--burst-times", type=parse_list, default=[10, 100], help="Comma separated maximum burst times.")
+    parser.add_argument("--memory-sizes", type=parse_list, default=[100, 1000, 5000], help="Comma separated numbers of processes and blocks for the memory managers.")
+    parser.add_argument("--max-size", type=int, default=1000, help="Largest process or block size.")
+    parser.add_argument("--time-quantum", type=int, default=2)
+    parser.add_argument("--track-queues", action="store_true", help="Record the Job and Ready Queues while scheduling.")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timed runs per workload, the fastest is kept.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="File to write the JSON results to, defaults to stdout.")
+    options = parser.parse_args(args)
+
+    unknown = [algorithm for algorithm in options.algorithms if algorithm not in CPU_SCHEDULERS and algorithm not in MEMORY_MANAGERS]
+    if unknown:
+        parser.error("Unknown algorithms " + ", ".join(unknown) + ".")
+
+    results = {"python": platform.python_version(),
+               "platform": platform.platform(),
+               "seed": options.seed,
+               "repeat": options.repeat,
+               "cpu": benchmark_cpu([algorithm for algorithm in options.algorithms if algorithm in CPU_SCHEDULERS], options.sizes, options.burst_times,
+                                    options.repeat, options.seed, options.time_quantum, options.track_queues),
+               "memory": benchmark_memory([algorithm for algorithm in options.algorithms if algorithm in MEMORY_MANAGERS], options.memory_sizes,
+                                          options.max_size, options.repeat, options.seed)}
+
+    output = json.dumps(results, indent=4)
+    if options.output:
+        with open(options.output, "w") as output_file:
+            output_file.write(output + "\n")
+    else:
+        print(output)
+    return results
+
+
+if __name__ == "__main__":
+    main()
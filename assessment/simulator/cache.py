@@ -0,0 +1,155 @@
+from collections import OrderedDict
+import functools
+import hashlib
+import os
+import threading
+
+
+class FrozenDict(dict):
+    # A dict which can't be modified, so cached results can be shared between simulator instances.
+    def immutable(self, *args, **kwargs):
+        raise TypeError("Cached simulation results are read-only.")
+
+    __setitem__ = __delitem__ = __ior__ = clear = pop = popitem = setdefault = update = immutable
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+class SimulationCache:
+    def __init__(self, max_size=4096):
+        self.max_size = max_size
+        # The cache is shared by every request thread, and moving an entry while another thread evicts can corrupt the OrderedDict.
+        self.lock = threading.Lock()
+        # Results in least to most recently used order (index=workload fingerprint).
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    """
+    Looks up the result of a workload, marking it as most recently used.
+
+    @param fingerprint The workload fingerprint.
+    @return The cached result, or None if it isn't cached.
+    """
+
+    def get(self, fingerprint):
+        with self.lock:
+            result = self.entries.get(fingerprint)
+            if result is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.entries.move_to_end(fingerprint)
+            return result
+
+    """
+    Caches the result of a workload, evicting the least recently used result if the cache is full.
+
+    @param fingerprint The workload fingerprint.
+    @param result The immutable result to cache.
+    """
+
+    def put(self, fingerprint, result):
+        with self.lock:
+            self.entries[fingerprint] = result
+            self.entries.move_to_end(fingerprint)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def get_stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "size": len(self.entries), "max_size": self.max_size,
+                    "hit_rate": self.hits / lookups if lookups else 0.0}
+
+
+# Shared by the question generators, which re-simulate many small and often identical workloads.
+simulation_cache = SimulationCache(int(os.getenv("OSSAT_SIMULATION_CACHE_SIZE", 4096)))
+
+
+"""
+Hashes a workload canonically, so the same algorithm, parameters and processes always map to the same key.
+
+@param algorithm Name of the simulator class.
+@param parameters Dictionary of algorithm parameters, ie: the RR time quantum.
+@param processes Tuples describing each process. Sorted first unless the order affects the result.
+@param blocks Tuples describing each memory block, in order.
+@param ordered Keep the process order? Required for the memory allocators, which place processes in job queue order.
+@return A hex digest.
+"""
+
+
+def workload_fingerprint(algorithm, parameters, processes, blocks=(), ordered=False):
+    canonical = (algorithm, tuple(sorted(parameters.items())), tuple(processes) if ordered else tuple(sorted(processes)), tuple(blocks))
+    return hashlib.sha1(repr(canonical).encode()).hexdigest()
+
+
+"""
+Puts the scheduler's cache in front of a dispatch_processes method.
+Runs with verbose output, queue tracking or a loaded process table bypass the cache.
+"""
+
+
+def cached_dispatch(dispatch_processes):
+    @functools.wraps(dispatch_processes)
+    def wrapper(self, verbose=False):
+        if self.cache is None or verbose or self.track_queues or self.process_table is not None or self.schedule:
+            return dispatch_processes(self, verbose)
+
+        fingerprint = workload_fingerprint(type(self).__name__, self.get_cache_parameters(),
+                                           [(process.name, process.arrival_time, process.burst_time, getattr(process, "priority", None), process.remaining_time)
+                                            for process in self.job_queue])
+        result = self.cache.get(fingerprint)
+        if result is None:
+            dispatch_processes(self, verbose)
+            result = FrozenDict({"schedule": tuple(FrozenDict(segment) for segment in self.schedule),
+                                 "order": tuple(process.name for process in self.job_queue)})
+            self.cache.put(fingerprint, result)
+        else:
+            # Leave the job queue as a real run would, sorted by the algorithm with every process complete.
+            positions = {name: position for position, name in enumerate(result["order"])}
+            self.job_queue = sorted(self.job_queue, key=lambda process: positions[process.name])
+            for process in self.job_queue:
+                process.remaining_time = 0
+
+        self.schedule = list(result["schedule"])
+    return wrapper
+
+
+"""
+Puts the memory manager's cache in front of an allocate_processes method.
+Runs with verbose output, or on top of earlier allocations, bypass the cache.
+"""
+
+
+def cached_allocation(allocate_processes):
+    @functools.wraps(allocate_processes)
+    def wrapper(self, verbose=False):
+        if self.cache is None or verbose or self.allocated:
+            return allocate_processes(self, verbose)
+
+        fingerprint = workload_fingerprint(type(self).__name__, {}, [(process.name, process.size) for process in self.job_queue],
+                                           [(block.name, block.size) for block in self.blocks], ordered=True)
+        result = self.cache.get(fingerprint)
+        if result is None:
+            allocate_processes(self, verbose)
+            # Refer to blocks by position, as the block objects belong to this manager and a cache hit restores onto another manager's blocks.
+            positions = {id(block): position for position, block in enumerate(self.blocks)}
+            result = FrozenDict({name: positions[id(block)] if block else None for name, block in self.allocated.items()})
+            self.cache.put(fingerprint, result)
+        else:
+            self.set_allocated({name: self.blocks[position] if position is not None else None for name, position in result.items()})
+    return wrapper
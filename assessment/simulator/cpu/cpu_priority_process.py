@@ -2,6 +2,8 @@ from .cpu_process import CPUProcess
 
 
 class CPUPriorityProcess(CPUProcess):
+    __slots__ = ("priority",)
+
     def __init__(self, name, arrival_time, burst_time, priority):
         super(CPUPriorityProcess, self).__init__(name, arrival_time, burst_time)
         self.priority = priority
@@ -1,13 +1,16 @@
-import time
+from ..creation_order import creation_order
 
 
 class CPUProcess:
+    # Slots rather than a per-instance dict, as large synthetic workloads create a lot of these.
+    __slots__ = ("name", "arrival_time", "burst_time", "remaining_time", "time_added")
+
     def __init__(self, name, arrival_time, burst_time):
         self.name = name
         self.arrival_time = arrival_time
         self.burst_time = burst_time
         self.remaining_time = burst_time
-        self.time_added = time.time()
+        self.time_added = next(creation_order)
 
     def get_name(self):
         return self.name
@@ -18,6 +21,9 @@ class CPUProcess:
     def get_burst_time(self):
         return self.burst_time
 
+    def get_time_added(self):
+        return self.time_added
+
     def get_remaining_time(self):
         return self.remaining_time
 
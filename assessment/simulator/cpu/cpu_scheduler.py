@@ -1,55 +1,161 @@
 from .cpu_process import CPUProcess
 from .cpu_priority_process import CPUPriorityProcess
+from .process_table import ProcessTable
+from .trace import load_trace
+from .ready_queue import ReadyQueue
+from .queue_timeline import QueueTimeline, SEGMENT, ARRIVE, DISPATCH, PREEMPT, COMPLETE
+from .indexed_schedule import IndexedSchedule
+from .metrics import compute_schedule_metrics
+from ..cache import cached_dispatch
+from operator import attrgetter
+
+
+# Tie-break tuples shared by the sorts below and the event-driven dispatcher.
+# They name process attributes, so the same order keys both process objects and ProcessTable rows.
+ARRIVAL_TIME_ORDER = ("arrival_time", "burst_time", "name")
+BURST_TIME_ORDER = ("burst_time", "arrival_time", "name")
+PRIORITY_ORDER = ("priority", "arrival_time", "burst_time", "name")
+REMAINING_TIME_ORDER = ("remaining_time", "arrival_time", "burst_time", "name")
+
+arrival_time_key = attrgetter(*ARRIVAL_TIME_ORDER)
+burst_time_key = attrgetter(*BURST_TIME_ORDER)
+priority_key = attrgetter(*PRIORITY_ORDER)
+remaining_time_key = attrgetter(*REMAINING_TIME_ORDER)
 
 
 class CPUScheduler:
-    def __init__(self):
+    # Tie-break tuple ordering the ready queue, or None for first come first served (ie: RR).
+    queue_order = None
+
+    def __init__(self, track_queues=True, checkpoint_interval=None, cache=None):
         self.job_queue = []
+        # Names in the job queue, so duplicates are found without scanning it.
+        self.process_names = set()
         self.schedule = []
+        # Lookup structure over the schedule, built on demand by get_indexed_schedule.
+        self.indexed_schedule = None
         self.ready_queue = []
-        # Job and Ready Queue at each time delta(index=time delta).
-        self.all_ready_queues = []
-        self.all_job_queues = []
+        # Changes to the Job and Ready Queue, from which the queues at any time delta are rebuilt.
+        self.timeline = None
+        # Callers which only need the schedule can switch the timeline off.
+        self.track_queues = track_queues
+        # Checkpoint the timeline every n changes for faster lookups, at the cost of O(processes) memory per checkpoint.
+        self.checkpoint_interval = checkpoint_interval
+        # Array-backed alternative to the job queue for large workloads, see load_process_table.
+        self.process_table = None
+        # SimulationCache shared with other schedulers, or None to always simulate.
+        self.cache = cache
 
     def create_process(self, name, arrival_time, burst_time, priority=None):
-        if len([process for process in self.job_queue if process.name == name]) > 0:
-            print(
-                "You can't have two processes with the same ID. Skipping (" + name + ", " + str(arrival_time) + ", " + str(burst_time) +
-                ", " if priority is None else ", " + priority + ") and continuing silently."
-            )
+        if self.process_table is not None:
+            self.process_table.append(name, arrival_time, burst_time, priority)
+            return
+
+        if name in self.process_names:
+            print("You can't have two processes with the same ID. Skipping (" + str(name) + ", " + str(arrival_time) + ", " + str(burst_time) +
+                  ("" if priority is None else ", " + str(priority)) + ") and continuing silently.")
             return
 
         # If process given priority, create a PriorityProcess object(left), otherwise create a standard Process object(right).
         self.job_queue.append(CPUProcess(name, arrival_time, burst_time) if priority is None else CPUPriorityProcess(name, arrival_time, burst_time, priority))
+        self.process_names.add(name)
 
     def remove_process(self, name):
         self.job_queue = [process for process in self.job_queue if process.name != name]
+        self.process_names.discard(name)
+
+    """
+    Runs the scheduler directly on a ProcessTable rather than on process objects.
+    The job queue is then only materialised from the table when it is asked for.
+
+    @param process_table The ProcessTable to schedule.
+    """
+
+    def load_process_table(self, process_table):
+        self.process_table = process_table
+        self.job_queue = []
+        self.process_names = set()
+
+    """
+    Loads a CSV or binary trace file straight into a ProcessTable, see trace.load_trace.
+
+    @param path Path of the trace file.
+    """
+
+    def load_trace(self, path):
+        self.load_process_table(load_trace(path))
 
     def reset(self):
+        self.process_table = None
         self.job_queue = []
+        self.process_names = set()
         self.schedule = []
-        self.readyQueue = []
-        self.all_ready_queues = []
-        self.all_job_queues = []
+        self.indexed_schedule = None
+        self.ready_queue = []
+        self.timeline = None
 
     def get_schedule(self):
         return self.schedule
 
+    """
+    Returns the parameters, other than the processes, which the schedule depends on. Used to key the simulation cache.
+    """
+
+    def get_cache_parameters(self):
+        return {}
+
+    """
+    Indexes the schedule by start time, so the process executing at any time delta is found with a binary search
+    rather than by expanding the schedule one time delta at a time.
+
+    @return An IndexedSchedule over the current schedule.
+    """
+
+    def get_indexed_schedule(self):
+        if self.indexed_schedule is None or self.indexed_schedule.schedule is not self.schedule or len(self.indexed_schedule) != len(self.schedule):
+            self.indexed_schedule = IndexedSchedule(self.schedule)
+        return self.indexed_schedule
+
+    """
+    Computes completion, turnaround, waiting and response times for each process, plus CPU utilization and throughput.
+
+    @return A dictionary of statistics, see compute_schedule_metrics.
+    """
+
+    def get_metrics(self):
+        return compute_schedule_metrics(self.schedule)
+
+    def get_timeline(self):
+        return self.timeline
+
     def get_job_queue(self, time_delta=None):
         if time_delta:
-            return self.all_job_queues[time_delta]
+            return self.timeline.get_job_queue(time_delta)
+        if self.process_table is not None:
+            return self.process_table.to_processes()
         return self.job_queue
 
     def get_ready_queue(self, time_delta=None):
         if time_delta:
-            return self.all_ready_queues[time_delta]
+            return self.timeline.get_ready_queue(time_delta)
         return self.ready_queue
 
     def get_all_job_queues(self):
-        return self.all_job_queues
+        return self.timeline.get_all_job_queues() if self.timeline else []
 
     def get_all_ready_queues(self):
-        return self.all_ready_queues
+        return self.timeline.get_all_ready_queues() if self.timeline else []
+
+    """
+    Starts recording the queues for a new run, if queue tracking is enabled.
+
+    @param key Tie-break tuple ordering the ready queue, or None for first come first served.
+    @return A QueueTimeline, or None.
+    """
+
+    def start_timeline(self, key=None):
+        self.timeline = QueueTimeline(self.get_job_queue(), key, self.checkpoint_interval) if self.track_queues else None
+        return self.timeline
 
     """
     Extracts all processes available at the current time delta.
@@ -74,10 +180,7 @@ class CPUScheduler:
     """
 
     def sort_processes_by_burst_time(self, job_queue):
-        return sorted(job_queue,
-                      key=lambda process: (process.get_burst_time(),
-                                           process.get_arrival_time(),
-                                           process.get_name()))
+        return sorted(job_queue, key=burst_time_key)
 
     """
     Sorts the job queue by arrival time as required by FCFS/SJF/RR.
@@ -89,10 +192,7 @@ class CPUScheduler:
     """
 
     def sort_processes_by_arrival_time(self, job_queue):
-        return sorted(job_queue,
-                      key=lambda process: (process.get_arrival_time(),
-                                           process.get_burst_time(),
-                                           process.get_name()))
+        return sorted(job_queue, key=arrival_time_key)
 
     """
     Sorts the job queue by priority as required by the Priority Scheduler.
@@ -105,11 +205,7 @@ class CPUScheduler:
     """
 
     def sort_processes_by_priority(self, job_queue):
-        return sorted(job_queue,
-                      key=lambda process: (process.get_priority(),
-                                           process.get_arrival_time(),
-                                           process.get_burst_time(),
-                                           process.get_name()))
+        return sorted(job_queue, key=priority_key)
 
     """
     Sorts the job queue by arrival time as required by SRTF
@@ -122,11 +218,169 @@ class CPUScheduler:
     """
 
     def sort_processes_by_remaining_time(self, job_queue):
-        return sorted(job_queue,
-                      key=lambda process: (process.get_remaining_time(),
-                                           process.get_arrival_time(),
-                                           process.get_burst_time(),
-                                           process.get_name()))
+        return sorted(job_queue, key=remaining_time_key)
+
+    """
+    Creates the schedule entry for a newly dispatched process.
+
+    @param table The ProcessTable being scheduled.
+    @param row Row of the process being dispatched.
+    @param time_delta Time point the process starts executing.
+    @return A schedule segment.
+    """
+
+    def create_segment(self, table, row, time_delta):
+        return {"process_name": table.names[row], "time_delta": time_delta, "arrival_time": table.arrival_times[row], "burst_time": 0,
+                "remaining_time": table.remaining_times[row]}
+
+    """
+    Creates the schedule entry for a period where the CPU has nothing to execute.
+
+    @param time_delta Time point the CPU starts idling.
+    @param burst_time Length of the idle period.
+    @return A schedule segment.
+    """
+
+    def create_idle_segment(self, time_delta, burst_time):
+        return {"process_name": "IDLE", "time_delta": time_delta, "arrival_time": None, "burst_time": burst_time, "remaining_time": None}
+
+    """
+    Generates the schedule, recording it on the scheduler as dispatch_processes always has.
+    Subclasses provide the events through generate_events, see iter_schedule.
+
+    @param verbose Show debugging information?
+    """
+
+    @cached_dispatch
+    def dispatch_processes(self, verbose=False):
+        events = self.generate_events(verbose, self.track_queues)
+        # Started after generate_events has sorted the job queue, so the queues keep the algorithm's order.
+        timeline = self.start_timeline(attrgetter(*self.queue_order) if self.queue_order else None)
+        time_delta = 0
+        for kind, event_time_delta, item in events:
+            if kind == SEGMENT:
+                self.schedule.append(item)
+                time_delta = event_time_delta
+            elif timeline:
+                timeline.record(event_time_delta, kind, item)
+        if timeline:
+            timeline.finish(time_delta)
+
+    """
+    Streams the schedule as it is generated, without storing it or the queues on the scheduler,
+    so memory stays bounded however long the schedule is, and consumers can start before the simulation ends.
+
+    @param verbose Show debugging information?
+    @param queue_events Also yield the changes to the queues?
+    @return A generator of (kind, time_delta, item) tuples, in time order. For SEGMENT, item is a schedule segment and the time delta is when it finished,
+            otherwise kind is one of ARRIVE, DISPATCH, PREEMPT or COMPLETE and item is the name of the process affected.
+    """
+
+    def iter_schedule(self, verbose=False, queue_events=True):
+        return self.generate_events(verbose, queue_events)
+
+    """
+    Prepares the job queue and returns the generator of schedule events for the algorithm.
+    Implemented by each algorithm.
+
+    @param verbose Show debugging information?
+    @param queue_events Yield the changes to the queues?
+    @return A generator, see iter_schedule.
+    """
+
+    def generate_events(self, verbose=False, queue_events=True):
+        raise NotImplementedError
+
+    """
+    Event-driven dispatcher shared by FCFS, SJF, Priority and SRTF.
+    Rather than stepping the clock one tick at a time, time jumps straight to the next arrival or completion,
+    so the cost depends on the number of processes, not on the length of the schedule.
+    The process with the smallest key is always dispatched, and when preemptive, the running process is
+    swapped out as soon as an arrival has a smaller key than it.
+
+    @param order Fields of the tie-break tuple used to order the ready queue, ie: BURST_TIME_ORDER.
+    @param preemptive Re-evaluate the running process whenever a process arrives?
+    @param verbose Show debugging information?
+    @param queue_events Yield the changes to the queues?
+    @return A generator, see iter_schedule.
+    """
+
+    def dispatch_events(self, order, preemptive=False, verbose=False, queue_events=True):
+        # Run on the loaded process table, or on a temporary one built from the job queue.
+        table = self.process_table if self.process_table is not None else ProcessTable.from_processes(self.job_queue)
+        names, arrival_times, remaining_times = table.names, table.arrival_times, table.remaining_times
+        arrivals = sorted([row for row in range(len(table)) if remaining_times[row] > 0], key=table.key(ARRIVAL_TIME_ORDER))
+        key = table.key(order)
+        ready = ReadyQueue(key)
+        time_delta = 0
+        next_arrival = 0
+        running = None
+        segment = None
+
+        # Admits every process which has arrived by the given time delta to the ready queue.
+        # Yields the arrivals and returns the new position of the arrival cursor.
+        def admit(time_delta, next_arrival):
+            while next_arrival < len(arrivals) and arrival_times[arrivals[next_arrival]] <= time_delta:
+                ready.push(arrivals[next_arrival])
+                if queue_events:
+                    yield (ARRIVE, arrival_times[arrivals[next_arrival]], names[arrivals[next_arrival]])
+                next_arrival += 1
+            return next_arrival
+
+        while running is not None or ready or next_arrival < len(arrivals):
+            next_arrival = yield from admit(time_delta, next_arrival)
+
+            if running is None:
+                # If the ready queue has no processes, idle until the next one arrives.
+                if not ready:
+                    if verbose:
+                        print("[" + str(time_delta) + "] CPU Idle...")
+                    idle_time = arrival_times[arrivals[next_arrival]] - time_delta
+                    yield (SEGMENT, time_delta + idle_time, self.create_idle_segment(time_delta, idle_time))
+                    time_delta += idle_time
+                    continue
+
+                running = ready.pop()
+                # Inform the user of the newly spawned process.
+                if verbose:
+                    print("[" + str(time_delta) + "] Spawned Process", names[running])
+                segment = self.create_segment(table, running, time_delta)
+                if queue_events:
+                    yield (DISPATCH, time_delta, names[running])
+
+            # Run until the process completes or, if it may be preempted, until the next arrival.
+            run_time = remaining_times[running]
+            if preemptive and next_arrival < len(arrivals):
+                run_time = min(run_time, arrival_times[arrivals[next_arrival]] - time_delta)
+            else:
+                # Processes arriving mid-run can't take over, but are admitted now so the events stay in time order.
+                next_arrival = yield from admit(time_delta + run_time - 1, next_arrival)
+
+            remaining_times[running] -= run_time
+            segment["burst_time"] += run_time
+            segment["remaining_time"] -= run_time
+            time_delta += run_time
+
+            if remaining_times[running] == 0:
+                if verbose:
+                    print("[" + str(time_delta) + "] Process", names[running], "finished executing!")
+                yield (SEGMENT, time_delta, segment)
+                if queue_events:
+                    yield (COMPLETE, time_delta, names[running])
+                running = None
+            elif preemptive:
+                next_arrival = yield from admit(time_delta, next_arrival)
+                if ready and ready.peek_key() < key(running):
+                    ready.push(running)
+                    yield (SEGMENT, time_delta, segment)
+                    if queue_events:
+                        yield (PREEMPT, time_delta, names[running])
+                    running = None
+
+        # Copy the final remaining times back onto the process objects the table was built from.
+        if table is not self.process_table:
+            for row in range(len(table)):
+                self.job_queue[row].remaining_time = remaining_times[row]
 
     """
     Outputs a graphical representation of the schedule.
@@ -0,0 +1,59 @@
+from bisect import bisect_left, bisect_right
+
+
+class IndexedSchedule:
+    def __init__(self, schedule):
+        self.schedule = schedule
+        # Start and end time delta of each segment (index=segment number). Segments are contiguous and in time order.
+        self.start_times = [segment["time_delta"] for segment in schedule]
+        self.end_times = [segment["time_delta"] + segment["burst_time"] for segment in schedule]
+
+    def __len__(self):
+        return len(self.schedule)
+
+    def get_segments(self):
+        return self.schedule
+
+    """
+    Finds the segment executing at a time delta.
+
+    @param time_delta Time point to look up.
+    @return A schedule segment, or None if the time delta is outside of the schedule.
+    """
+
+    def segment_at(self, time_delta):
+        i = bisect_right(self.start_times, time_delta) - 1
+        if i < 0 or time_delta >= self.end_times[i]:
+            return None
+        return self.schedule[i]
+
+    """
+    Finds the name of the process executing at a time delta.
+
+    @param time_delta Time point to look up.
+    @return A process name, "IDLE", or None if the time delta is outside of the schedule.
+    """
+
+    def process_at(self, time_delta):
+        segment = self.segment_at(time_delta)
+        return segment["process_name"] if segment else None
+
+    """
+    Finds the segments which execute during [start, end).
+
+    @param start First time delta of the range.
+    @param end Time delta the range stops before.
+    @return An array of schedule segments, in time order.
+    """
+
+    def segments_in(self, start, end):
+        first = bisect_right(self.end_times, start)
+        last = bisect_left(self.start_times, end)
+        return self.schedule[first:last]
+
+    """
+    Returns the time delta at which the last segment finishes.
+    """
+
+    def makespan(self):
+        return self.end_times[len(self.end_times) - 1] if self.end_times else 0
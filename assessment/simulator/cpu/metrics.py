@@ -0,0 +1,55 @@
+import numpy as np
+
+
+"""
+Computes the per-process and overall statistics of a schedule in a single vectorized pass over its segments.
+
+Completion time - Time delta the process last stops executing.
+Turnaround time - Completion time - arrival time.
+Waiting time - Turnaround time - time spent executing.
+Response time - Time delta the process first executes - arrival time.
+
+@param schedule A schedule, as returned by CPUScheduler.get_schedule().
+@return A dictionary holding the statistics of each process (in order of first execution), their averages,
+        the makespan, CPU utilization (busy time / makespan) and throughput (processes / makespan).
+"""
+
+
+def compute_schedule_metrics(schedule):
+    segments = [segment for segment in schedule if segment["process_name"] != "IDLE"]
+    makespan = schedule[len(schedule) - 1]["time_delta"] + schedule[len(schedule) - 1]["burst_time"] if schedule else 0
+
+    if not segments:
+        return {"processes": [], "makespan": makespan, "average_turnaround_time": 0.0, "average_waiting_time": 0.0,
+                "average_response_time": 0.0, "cpu_utilization": 0.0, "throughput": 0.0}
+
+    names = np.array([segment["process_name"] for segment in segments])
+    start_times = np.array([segment["time_delta"] for segment in segments], dtype=np.int64)
+    burst_times = np.array([segment["burst_time"] for segment in segments], dtype=np.int64)
+    arrival_times = np.array([segment["arrival_time"] for segment in segments], dtype=np.int64)
+    end_times = start_times + burst_times
+
+    # Segments are in time order, so the first and last segment of each process give its response and completion.
+    unique_names, first_segments, process_ids = np.unique(names, return_index=True, return_inverse=True)
+    last_segments = np.zeros(len(unique_names), dtype=np.int64)
+    np.maximum.at(last_segments, process_ids, np.arange(len(segments)))
+    executed_times = np.bincount(process_ids, weights=burst_times, minlength=len(unique_names)).astype(np.int64)
+
+    process_arrival_times = arrival_times[first_segments]
+    completion_times = end_times[last_segments]
+    turnaround_times = completion_times - process_arrival_times
+    waiting_times = turnaround_times - executed_times
+    response_times = start_times[first_segments] - process_arrival_times
+
+    order = np.argsort(first_segments)
+    processes = [{"name": str(unique_names[i]), "arrival_time": int(process_arrival_times[i]), "burst_time": int(executed_times[i]),
+                  "completion_time": int(completion_times[i]), "turnaround_time": int(turnaround_times[i]),
+                  "waiting_time": int(waiting_times[i]), "response_time": int(response_times[i])} for i in order]
+
+    return {"processes": processes,
+            "makespan": int(makespan),
+            "average_turnaround_time": float(turnaround_times.mean()),
+            "average_waiting_time": float(waiting_times.mean()),
+            "average_response_time": float(response_times.mean()),
+            "cpu_utilization": float(burst_times.sum()) / makespan if makespan else 0.0,
+            "throughput": len(unique_names) / makespan if makespan else 0.0}
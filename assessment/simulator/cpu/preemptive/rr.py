@@ -1,112 +1,157 @@
 from .preemptive_scheduler import PreemptiveScheduler
-from copy import deepcopy
+from ..cpu_scheduler import ARRIVAL_TIME_ORDER
+from ..process_table import ProcessTable
+from ..queue_timeline import SEGMENT, ARRIVE, DISPATCH, PREEMPT, COMPLETE
+from collections import deque
 
 
 class RR(PreemptiveScheduler):
-    def __init__(self, time_quantum=2):
-        super(RR, self).__init__()
-        self.time_quantum = time_quantum
+    def __init__(self, time_quantum=2, track_queues=True, checkpoint_interval=None, cache=None):
+        super(RR, self).__init__(track_queues, checkpoint_interval, cache)
+        self.set_time_quantum(time_quantum)
+
+    """
+    Sets the time quantum.
+
+    @param time_quantum Most time units a process runs for before it is preempted. Must be at least 1, as a process could never finish otherwise.
+    """
 
     def set_time_quantum(self, time_quantum):
+        if time_quantum < 1:
+            raise ValueError("The time quantum must be at least 1, got " + str(time_quantum) + ".")
         self.time_quantum = time_quantum
 
+    def get_cache_parameters(self):
+        return {"time_quantum": self.time_quantum}
+
     """
     Generates a RR schedule for a set of input processes.
 
-    @ param verbose Show debugging information?
+    @param verbose Show debugging information?
+    @param queue_events Yield the changes to the queues?
+    @return A generator, see CPUScheduler.iter_schedule.
     """
 
-    def dispatch_processes(self, verbose=False):
+    def generate_events(self, verbose=False, queue_events=True):
         if verbose:
             print("\nOSSAT-RR\n-----------------------------------------")
         self.job_queue = self.sort_processes_by_arrival_time(self.job_queue)
-        time_delta = 0
-        i = 0
-
-        available_processes = self.get_available_processes(time_delta)
+        return self.round_robin_events(verbose, queue_events)
 
-        if (len(available_processes) > 0):
-            # If processes are available from time delta 0.
-            # Initialise the ready queue to hold all processes which are available at self time delta (0).
-            self.ready_queue = self.get_available_processes(time_delta)
-        else:
-            # Otherwise, we need to idle at the first iteration, so set the first item in the ready queue to the process which arrives quickest.
-            self.ready_queue.append(self.job_queue[0])
+    """
+    The ready queue is a FIFO queue fed by a cursor over the processes sorted by arrival time.
+    Each quantum produces its own segment, so the schedule is built in time proportional to the number of quanta run.
 
-        # Clone the process so it is not affected by changes to the true process object.
-        self.all_ready_queues.append(deepcopy(self.ready_queue))
-        self.all_job_queues.append(deepcopy(self.job_queue))
+    @param verbose Show debugging information?
+    @param queue_events Yield the changes to the queues?
+    @return A generator, see CPUScheduler.iter_schedule.
+    """
 
-        # Keep scheduling until all processes have no burst time left.
-        while (len([process for process in self.job_queue if process.get_remaining_time() != 0]) > 0):
-            p = self.ready_queue[i]
-            name = p.get_name()
-            arrival_time = p.get_arrival_time()
-            remaining_time = p.get_remaining_time()
+    def round_robin_events(self, verbose=False, queue_events=True):
+        # Run on the loaded process table, or on a temporary one built from the job queue.
+        table = self.process_table if self.process_table is not None else ProcessTable.from_processes(self.job_queue)
+        names, arrival_times, remaining_times = table.names, table.arrival_times, table.remaining_times
+        arrivals = sorted([row for row in range(len(table)) if remaining_times[row] > 0], key=table.key(ARRIVAL_TIME_ORDER))
+        queue = deque()
+        # Processes which arrived at the same time delta as a process the CPU idled for. They are only queued once the queue runs dry.
+        skipped = deque()
+        time_delta = 0
+        next_arrival = 0
+
+        # Queues every process which arrives within (start, end], in order of arrival.
+        # Yields the arrivals and returns the new position of the arrival cursor.
+        def admit(start, end, next_arrival):
+            while next_arrival < len(arrivals) and arrival_times[arrivals[next_arrival]] <= end:
+                if arrival_times[arrivals[next_arrival]] > start:
+                    queue.append(arrivals[next_arrival])
+                    if queue_events:
+                        yield (ARRIVE, end, names[arrivals[next_arrival]])
+                else:
+                    skipped.append(arrivals[next_arrival])
+                next_arrival += 1
+            return next_arrival
+
+        # Initialise the ready queue to hold all processes which are available at time delta 0.
+        while next_arrival < len(arrivals) and arrival_times[arrivals[next_arrival]] <= 0:
+            queue.append(arrivals[next_arrival])
+            if queue_events:
+                yield (ARRIVE, time_delta, names[arrivals[next_arrival]])
+            next_arrival += 1
+
+        # Otherwise, we need to idle at the first iteration, so queue the process which arrives soonest.
+        if not queue and arrivals:
+            queue.append(arrivals[0])
+            if queue_events:
+                yield (ARRIVE, time_delta, names[arrivals[0]])
+            next_arrival = 1
+
+        while queue:
+            running = queue.popleft()
 
             # Check whether the CPU needs to idle for the next process.
-            if (arrival_time > time_delta):
+            if arrival_times[running] > time_delta:
                 if verbose:
                     print("[" + str(time_delta) + "] CPU Idle...")
-                self.schedule.append({"process_name": "IDLE", "time_delta": time_delta, "arrival_time": None, "burst_time": arrival_time - time_delta, "remaining_time": None})
-                # Update queues arrays in line with idle time.
-                for j in range(arrival_time - time_delta):
-                    self.all_ready_queues.append(deepcopy(self.ready_queue))
-                    self.all_job_queues.append(deepcopy(self.job_queue))
-
-                # Adjust time delta with respect to idle length.
-                time_delta += arrival_time - time_delta
-
-            # Track how much to adjust the time delta.
-            delta_increment = 0
-
-            # If the process has time left to execute.
-            if (remaining_time > 0):
-                if verbose:
-                    print("[" + str(time_delta) + "] Spawned Process", name)
-
-                if (remaining_time <= self.time_quantum):
-                    # The process will run to completion quicker than a full quantum.
-                    delta_increment = remaining_time
-                else:
-                    # A full quantum won't run the process to completion.
-                    delta_increment = self.time_quantum
-
-                # Decrement remaining time as required and update queues arrays.
-                for j in range(delta_increment):
-                    p.set_remaining_time(p.get_remaining_time() - 1)
-                    if (j < delta_increment - 1):
-                        self.all_ready_queues.append(deepcopy(self.ready_queue))
-                        self.all_job_queues.append(deepcopy(self.job_queue))
-
-                # Increment the queue head pointer.
-                i += 1
-
-                self.schedule.append({"process_name": name, "time_delta": time_delta, "arrival_time": arrival_time, "burst_time": delta_increment, "remaining_time": remaining_time - delta_increment})
-                time_delta += delta_increment
-                if verbose:
-                    print("[" + str(time_delta) + "] Process", name, "finished executing!")
-
-            # Find all processes which are available at self timestep (diff the arrays).
-            newly_available = [process for process in self.get_available_processes(time_delta) if process not in self.get_available_processes(time_delta - delta_increment)]
+                yield (SEGMENT, arrival_times[running], self.create_idle_segment(time_delta, arrival_times[running] - time_delta))
+                time_delta = arrival_times[running]
+                # Processes arriving alongside it are passed over until the queue runs dry.
+                next_arrival = yield from admit(time_delta, time_delta, next_arrival)
+
+            # The process either runs for a full quantum or until it completes, whichever is sooner.
+            run_time = min(remaining_times[running], self.time_quantum)
+            time_delta = yield from self.run_process(table, running, time_delta, run_time, verbose, queue_events)
+
+            # Processes which arrived during the quantum join the queue ahead of the process which was running.
+            next_arrival = yield from admit(time_delta - run_time, time_delta, next_arrival)
+
+            if remaining_times[running] > 0:
+                queue.append(running)
+                if queue_events:
+                    yield (PREEMPT, time_delta, names[running])
+            elif queue_events:
+                yield (COMPLETE, time_delta, names[running])
+
+            # Finally, if the queue is empty, queue the process with the nearest arrival time which has execution time remaining.
+            if not queue:
+                if skipped:
+                    queue.append(skipped.popleft())
+                elif next_arrival < len(arrivals):
+                    queue.append(arrivals[next_arrival])
+                    next_arrival += 1
+                if queue and queue_events:
+                    yield (ARRIVE, time_delta, names[queue[0]])
+
+        # Copy the final remaining times back onto the process objects the table was built from.
+        if table is not self.process_table:
+            for row in range(len(table)):
+                self.job_queue[row].remaining_time = remaining_times[row]
 
-            # If after self quantum there are new processes available, add the the front of the ready queue.
-            if (len(newly_available) > 0):
-                self.ready_queue = self.ready_queue + newly_available
-
-            # If the process still has execution time remaining after self quantum, add it to the end of the ready queue.
-            if (p.get_remaining_time() > 0):
-                self.ready_queue.append(p)
-
-            # Finally, if the readyQueue is "empty", add the process with the nearest arrival time which has execution time remaining.
-            if (len(self.ready_queue) - 1 < i):
-                sorted_by_arrival = self.sort_processes_by_arrival_time([process for process in self.job_queue if process.remaining_time > 0])
-                if len(sorted_by_arrival) > 0:
-                    self.ready_queue.append(sorted_by_arrival[0])
-
-            self.all_ready_queues.append(deepcopy(self.ready_queue))
-            self.all_job_queues.append(deepcopy(self.job_queue))
+    """
+    Dispatches a process and runs it.
+
+    @param table The ProcessTable being scheduled.
+    @param row Row of the process.
+    @param time_delta Time point the process starts.
+    @param run_time Time units it runs for.
+    @param verbose Show debugging information?
+    @param queue_events Yield the changes to the queues?
+    @return A generator of the dispatch and segment events, which returns the time delta the process stops.
+    """
 
+    def run_process(self, table, row, time_delta, run_time, verbose=False, queue_events=True):
+        if verbose:
+            print("[" + str(time_delta) + "] Spawned Process", table.names[row])
+        if queue_events:
+            yield (DISPATCH, time_delta, table.names[row])
+        segment = self.create_segment(table, row, time_delta)
+        segment["burst_time"] = run_time
+        segment["remaining_time"] -= run_time
+        table.remaining_times[row] -= run_time
+        time_delta += run_time
+        if verbose:
+            print("[" + str(time_delta) + "] Process", table.names[row], "finished executing!")
+        yield (SEGMENT, time_delta, segment)
+        return time_delta
 
 # Syntax for use on frontend.
 
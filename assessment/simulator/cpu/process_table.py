@@ -0,0 +1,136 @@
+from array import array
+from .cpu_process import CPUProcess
+from .cpu_priority_process import CPUPriorityProcess
+
+
+class ProcessTable:
+    def __init__(self, with_priority=False):
+        # Parallel arrays (index=row), so a process costs a few machine words rather than an object.
+        self.names = []
+        self.arrival_times = array("q")
+        self.burst_times = array("q")
+        self.remaining_times = array("q")
+        self.priorities = array("q") if with_priority else None
+        # Row of each process (index=process name).
+        self.rows = {}
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.rows
+
+    def get_row(self, name):
+        return self.rows[name]
+
+    """
+    Adds a process to the table.
+
+    @param name Unique name of the process.
+    @param arrival_time Time delta the process arrives at.
+    @param burst_time Execution time the process needs.
+    @param priority Priority of the process, required if the table was created with priorities.
+    @return The row of the new process, or None if the name is already taken.
+    """
+
+    def append(self, name, arrival_time, burst_time, priority=None):
+        if name in self.rows:
+            print("You can't have two processes with the same ID. Skipping (" + str(name) + ", " + str(arrival_time) + ", " + str(burst_time) + ") and continuing silently.")
+            return None
+
+        self.rows[name] = len(self.names)
+        self.names.append(name)
+        self.arrival_times.append(arrival_time)
+        self.burst_times.append(burst_time)
+        self.remaining_times.append(burst_time)
+        if self.priorities is not None:
+            self.priorities.append(priority)
+        return self.rows[name]
+
+    """
+    Adds many processes to the table at once. Columns given as array("q") are copied in bulk.
+
+    @param names Unique names of the processes.
+    @param arrival_times Time delta each process arrives at.
+    @param burst_times Execution time each process needs.
+    @param priorities Priority of each process, required if the table was created with priorities.
+    @return The number of processes added. Processes whose name is already taken are skipped.
+    """
+
+    def extend(self, names, arrival_times, burst_times, priorities=None):
+        first_row = len(self.names)
+        # Positions of the processes to keep, ie: those with a name not seen before.
+        kept = []
+        for i, name in enumerate(names):
+            if name in self.rows:
+                print("You can't have two processes with the same ID. Skipping (" + str(name) + ", " + str(arrival_times[i]) + ", " + str(burst_times[i]) +
+                      ") and continuing silently.")
+                continue
+            self.rows[name] = first_row + len(kept)
+            kept.append(i)
+
+        columns = [(self.arrival_times, arrival_times), (self.burst_times, burst_times), (self.remaining_times, burst_times)]
+        if self.priorities is not None:
+            columns.append((self.priorities, priorities))
+        if len(kept) == len(names):
+            self.names.extend(names)
+            for column, values in columns:
+                column.extend(values)
+        else:
+            self.names.extend(names[i] for i in kept)
+            for column, values in columns:
+                column.extend(values[i] for i in kept)
+        return len(kept)
+
+    """
+    Builds a table from process objects, keeping their order and remaining times.
+
+    @param processes An array of CPUProcess or CPUPriorityProcess.
+    @return A ProcessTable.
+    """
+
+    @staticmethod
+    def from_processes(processes):
+        table = ProcessTable(len(processes) > 0 and all(isinstance(process, CPUPriorityProcess) for process in processes))
+        for process in processes:
+            table.append(process.name, process.arrival_time, process.burst_time, process.priority if table.priorities is not None else None)
+            table.remaining_times[len(table) - 1] = process.remaining_time
+        return table
+
+    """
+    Materialises the table as process objects.
+
+    @return An array of CPUProcess, or CPUPriorityProcess if the table has priorities.
+    """
+
+    def to_processes(self):
+        processes = []
+        for row in range(len(self.names)):
+            if self.priorities is not None:
+                process = CPUPriorityProcess(self.names[row], self.arrival_times[row], self.burst_times[row], self.priorities[row])
+            else:
+                process = CPUProcess(self.names[row], self.arrival_times[row], self.burst_times[row])
+            process.remaining_time = self.remaining_times[row]
+            processes.append(process)
+        return processes
+
+    def get_column(self, field):
+        return {"name": self.names, "arrival_time": self.arrival_times, "burst_time": self.burst_times,
+                "remaining_time": self.remaining_times, "priority": self.priorities}[field]
+
+    """
+    Builds a function mapping a row to its tie-break tuple, ie: ("burst_time", "arrival_time", "name") for SJF.
+
+    @param order Names of the fields in the tuple.
+    @return A function of the row.
+    """
+
+    def key(self, order):
+        columns = [self.get_column(field) for field in order]
+        if len(columns) == 3:
+            first, second, third = columns
+            return lambda row: (first[row], second[row], third[row])
+        if len(columns) == 4:
+            first, second, third, fourth = columns
+            return lambda row: (first[row], second[row], third[row], fourth[row])
+        return lambda row: tuple(column[row] for column in columns)
@@ -0,0 +1,172 @@
+from bisect import bisect_right
+from copy import copy
+
+# Kinds of change recorded on the timeline.
+ARRIVE = "arrive"
+DISPATCH = "dispatch"
+PREEMPT = "preempt"
+COMPLETE = "complete"
+# Not a change to the queues, marks a finished schedule segment when streaming, see CPUScheduler.iter_schedule.
+SEGMENT = "segment"
+
+
+class QueueTimeline:
+    def __init__(self, job_queue, key=None, checkpoint_interval=None):
+        self.job_queue = list(job_queue)
+        # Tie-break tuple ordering the waiting processes, or None for first come first served (ie: RR).
+        self.key = key
+        self.initial_remaining_times = {process.get_name(): process.get_remaining_time() for process in self.job_queue}
+        # Changes to the queues, in time order (index=event number).
+        self.times = []
+        self.kinds = []
+        self.names = []
+        self.end_time = 0
+        # Snapshot of the replay state every checkpoint_interval events, so lookups don't replay from the start.
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoint_indices = [0]
+        self.checkpoints = [self.initial_state()]
+        self.state = self.initial_state() if checkpoint_interval else None
+
+    def __len__(self):
+        return self.end_time + 1
+
+    def initial_state(self):
+        return {"remaining_times": dict(self.initial_remaining_times), "waiting": {}, "running": None, "since": 0}
+
+    def copy_state(self, state):
+        return {"remaining_times": dict(state["remaining_times"]), "waiting": dict(state["waiting"]), "running": state["running"], "since": state["since"]}
+
+    """
+    Records a change to the queues. Changes must be recorded in time order.
+
+    @param time_delta Time point the change happens at.
+    @param kind One of ARRIVE, DISPATCH, PREEMPT or COMPLETE.
+    @param name Name of the process affected.
+    """
+
+    def record(self, time_delta, kind, name):
+        self.times.append(time_delta)
+        self.kinds.append(kind)
+        self.names.append(name)
+        self.end_time = max(self.end_time, time_delta)
+
+        if self.checkpoint_interval:
+            self.apply(self.state, time_delta, kind, name)
+            if len(self.times) % self.checkpoint_interval == 0:
+                self.checkpoint_indices.append(len(self.times))
+                self.checkpoints.append(self.copy_state(self.state))
+
+    def arrive(self, time_delta, name):
+        self.record(time_delta, ARRIVE, name)
+
+    def dispatch(self, time_delta, name):
+        self.record(time_delta, DISPATCH, name)
+
+    def preempt(self, time_delta, name):
+        self.record(time_delta, PREEMPT, name)
+
+    def complete(self, time_delta, name):
+        self.record(time_delta, COMPLETE, name)
+
+    """
+    Marks the time delta at which the last process finished executing.
+
+    @param time_delta The final time delta.
+    """
+
+    def finish(self, time_delta):
+        self.end_time = max(self.end_time, time_delta)
+
+    """
+    Applies a single change to a replay state.
+    Remaining times are only updated when a process stops running, as the decrement is implied by how long it ran for.
+    """
+
+    def apply(self, state, time_delta, kind, name):
+        if kind == ARRIVE:
+            state["waiting"][name] = None
+        elif kind == DISPATCH:
+            state["waiting"].pop(name, None)
+            state["running"] = name
+            state["since"] = time_delta
+        else:
+            state["remaining_times"][name] -= time_delta - state["since"]
+            state["running"] = None
+            if kind == PREEMPT:
+                state["waiting"][name] = None
+
+    """
+    Rebuilds the replay state at a time delta, starting from the nearest checkpoint.
+
+    @param time_delta Time point to rebuild.
+    @return A replay state.
+    """
+
+    def state_at(self, time_delta):
+        if time_delta < 0 or time_delta > self.end_time:
+            raise IndexError("time delta " + str(time_delta) + " is outside of the timeline.")
+
+        last_event = bisect_right(self.times, time_delta)
+        checkpoint = bisect_right(self.checkpoint_indices, last_event) - 1
+        state = self.copy_state(self.checkpoints[checkpoint])
+        for i in range(self.checkpoint_indices[checkpoint], last_event):
+            self.apply(state, self.times[i], self.kinds[i], self.names[i])
+        return state
+
+    """
+    Clones the processes with their remaining times as of a time delta.
+    """
+
+    def clone_processes(self, state, time_delta):
+        clones = {}
+        for process in self.job_queue:
+            clone = copy(process)
+            remaining_time = state["remaining_times"][process.get_name()]
+            if state["running"] == process.get_name():
+                remaining_time -= time_delta - state["since"]
+            clone.set_remaining_time(remaining_time)
+            clones[process.get_name()] = clone
+        return clones
+
+    def build_job_queue(self, clones):
+        return list(clones.values())
+
+    def build_ready_queue(self, state, clones):
+        waiting = [clones[name] for name in state["waiting"]]
+        if self.key:
+            waiting = sorted(waiting, key=self.key)
+        return ([clones[state["running"]]] if state["running"] else []) + waiting
+
+    def get_job_queue(self, time_delta):
+        state = self.state_at(time_delta)
+        return self.build_job_queue(self.clone_processes(state, time_delta))
+
+    def get_ready_queue(self, time_delta):
+        state = self.state_at(time_delta)
+        return self.build_ready_queue(state, self.clone_processes(state, time_delta))
+
+    """
+    Rebuilds the queues at every time delta in a single sweep over the timeline.
+
+    @return A tuple of arrays (index=time delta) holding the job and ready queues.
+    """
+
+    def get_all_queues(self):
+        all_job_queues = []
+        all_ready_queues = []
+        state = self.initial_state()
+        next_event = 0
+        for time_delta in range(self.end_time + 1):
+            while next_event < len(self.times) and self.times[next_event] <= time_delta:
+                self.apply(state, self.times[next_event], self.kinds[next_event], self.names[next_event])
+                next_event += 1
+            clones = self.clone_processes(state, time_delta)
+            all_job_queues.append(self.build_job_queue(clones))
+            all_ready_queues.append(self.build_ready_queue(state, clones))
+        return all_job_queues, all_ready_queues
+
+    def get_all_job_queues(self):
+        return self.get_all_queues()[0]
+
+    def get_all_ready_queues(self):
+        return self.get_all_queues()[1]
@@ -0,0 +1,95 @@
+import heapq
+import itertools
+
+
+class ReadyQueue:
+    def __init__(self, key):
+        # Tie-break tuple used to order the queue, ie: burst_time_key for SJF.
+        self.key = key
+        self.heap = []
+        # Heap entry of each queued process (index=process, or its ProcessTable row), so membership and removal don't need a scan.
+        self.entries = {}
+        self.counter = itertools.count()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __bool__(self):
+        return len(self.entries) > 0
+
+    def __contains__(self, process):
+        return process in self.entries
+
+    """
+    Adds a process to the ready queue, or re-keys it if it is already queued (ie: its remaining time has changed).
+
+    @param process The process to add.
+    """
+
+    def push(self, process):
+        if process in self.entries:
+            self.remove(process)
+        # The counter keeps entries with equal keys from ever comparing the process objects themselves.
+        entry = [self.key(process), next(self.counter), process]
+        self.entries[process] = entry
+        heapq.heappush(self.heap, entry)
+
+    """
+    Removes a process from the ready queue.
+    The heap entry is only marked as removed, and is discarded once it reaches the top of the heap.
+
+    @param process The process to remove.
+    """
+
+    def remove(self, process):
+        entry = self.entries.pop(process)
+        entry[2] = None
+
+    """
+    Discards removed entries from the top of the heap.
+    """
+
+    def discard_removed(self):
+        while self.heap and self.heap[0][2] is None:
+            heapq.heappop(self.heap)
+
+    """
+    Returns the key of the process at the front of the ready queue.
+
+    @return A tie-break tuple, or None if the queue is empty.
+    """
+
+    def peek_key(self):
+        self.discard_removed()
+        return self.heap[0][0] if self.heap else None
+
+    """
+    Returns the process at the front of the ready queue without removing it.
+
+    @return A Process, or None if the queue is empty.
+    """
+
+    def peek(self):
+        self.discard_removed()
+        return self.heap[0][2] if self.heap else None
+
+    """
+    Removes and returns the process at the front of the ready queue.
+
+    @return A Process.
+    """
+
+    def pop(self):
+        self.discard_removed()
+        entry = heapq.heappop(self.heap)
+        del self.entries[entry[2]]
+        return entry[2]
+
+    """
+    Lists the queued processes in the order they would be dispatched.
+
+    @return An array of Processes.
+    """
+
+    def ordered(self):
+        return [entry[2] for entry in sorted(self.entries.values())]
@@ -0,0 +1,144 @@
+from array import array
+from .process_table import ProcessTable
+import csv
+import numpy as np
+import struct
+
+# Binary traces start with a header of the magic bytes, the width of the name field and flags, followed by fixed size records.
+TRACE_MAGIC = b"OSSATTR1"
+TRACE_HEADER = struct.Struct("<8sII")
+HAS_PRIORITY = 1
+
+
+"""
+Describes one record of a binary trace: a null padded UTF-8 name followed by the arrival time, burst time and priority.
+
+@param name_width Size of the name field, in bytes.
+@return A NumPy structured dtype.
+"""
+
+
+def trace_dtype(name_width):
+    return np.dtype([("name", "S" + str(name_width)), ("arrival_time", "<i8"), ("burst_time", "<i8"), ("priority", "<i8")])
+
+
+def to_column(values):
+    column = array("q")
+    column.frombytes(np.ascontiguousarray(values, dtype=np.int64).tobytes())
+    return column
+
+
+"""
+Loads a binary trace through a memory map, so the records are converted column by column rather than read into Python one at a time.
+
+@param path Path of the trace file.
+@return A ProcessTable, with priorities if the trace has them.
+"""
+
+
+def load_binary_trace(path):
+    with open(path, "rb") as trace_file:
+        header = trace_file.read(TRACE_HEADER.size)
+    if len(header) < TRACE_HEADER.size or header[:len(TRACE_MAGIC)] != TRACE_MAGIC:
+        raise ValueError(str(path) + " is not an OSSAT binary trace.")
+    _, name_width, flags = TRACE_HEADER.unpack(header)
+
+    table = ProcessTable(bool(flags & HAS_PRIORITY))
+    dtype = trace_dtype(name_width)
+    records = np.memmap(path, dtype=dtype, mode="r", offset=TRACE_HEADER.size) if record_count(path, dtype) else None
+    if records is None:
+        return table
+
+    names = [name.decode("utf-8") for name in records["name"].tolist()]
+    table.extend(names, to_column(records["arrival_time"]), to_column(records["burst_time"]),
+                 to_column(records["priority"]) if table.priorities is not None else None)
+    del records
+    return table
+
+
+def record_count(path, dtype):
+    with open(path, "rb") as trace_file:
+        trace_file.seek(0, 2)
+        size = trace_file.tell() - TRACE_HEADER.size
+    if size % dtype.itemsize:
+        raise ValueError(str(path) + " is truncated, expected a whole number of " + str(dtype.itemsize) + " byte records.")
+    return size // dtype.itemsize
+
+
+"""
+Writes a process table as a binary trace.
+
+@param path Path of the trace file.
+@param table The ProcessTable to write.
+"""
+
+
+def write_binary_trace(path, table):
+    encoded_names = [name.encode("utf-8") for name in table.names]
+    dtype = trace_dtype(max([len(name) for name in encoded_names] + [1]))
+    records = np.zeros(len(table), dtype=dtype)
+    records["name"] = encoded_names
+    records["arrival_time"] = table.arrival_times
+    records["burst_time"] = table.burst_times
+    if table.priorities is not None:
+        records["priority"] = table.priorities
+
+    with open(path, "wb") as trace_file:
+        trace_file.write(TRACE_HEADER.pack(TRACE_MAGIC, dtype["name"].itemsize, HAS_PRIORITY if table.priorities is not None else 0))
+        trace_file.write(records.tobytes())
+
+
+"""
+Loads a CSV trace with one process per row: name, arrival time, burst time and optionally priority.
+A header row is skipped if present.
+
+@param path Path of the trace file.
+@return A ProcessTable, with priorities if the rows have a fourth column.
+"""
+
+
+def load_csv_trace(path):
+    names = []
+    arrival_times = array("q")
+    burst_times = array("q")
+    priorities = array("q")
+
+    with open(path, newline="") as trace_file:
+        rows = csv.reader(trace_file)
+        for line_number, row in enumerate(rows, 1):
+            if not row:
+                continue
+            try:
+                process = (row[0].strip(), int(row[1]), int(row[2]), int(row[3]) if len(row) > 3 and row[3].strip() else None)
+            except (ValueError, IndexError):
+                if line_number == 1:
+                    continue
+                raise ValueError("Invalid process on line " + str(line_number) + " of " + str(path) + ": " + str(row))
+
+            names.append(process[0])
+            arrival_times.append(process[1])
+            burst_times.append(process[2])
+            if process[3] is not None:
+                priorities.append(process[3])
+
+    if priorities and len(priorities) != len(names):
+        raise ValueError(str(path) + " gives a priority for some processes but not others.")
+
+    table = ProcessTable(len(priorities) > 0)
+    table.extend(names, arrival_times, burst_times, priorities if priorities else None)
+    return table
+
+
+"""
+Loads a trace file into a ProcessTable, ready for CPUScheduler.load_process_table.
+Names are checked for uniqueness through the table's name index, so loading n processes costs O(n).
+
+@param path Path of a .csv trace, or of a binary trace written by write_binary_trace.
+@return A ProcessTable.
+"""
+
+
+def load_trace(path):
+    if str(path).lower().endswith(".csv"):
+        return load_csv_trace(path)
+    return load_binary_trace(path)
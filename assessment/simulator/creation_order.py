@@ -0,0 +1,5 @@
+import itertools
+
+# Order in which processes and blocks are created, used in place of a wall clock timestamp.
+# Shared by the CPU and memory simulators, so one sequence orders every process and block.
+creation_order = itertools.count()
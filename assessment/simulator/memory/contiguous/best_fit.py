@@ -1,29 +1,39 @@
 from ..memory_manager import MemoryManager
+from ..max_segment_tree import MaxSegmentTree
+from ...cache import cached_allocation
 
 
 class BestFit(MemoryManager):
+    """
+    Allocates each process in the job queue to the smallest free block it fits in.
+    The free blocks are sorted by (size, index) once, and their sizes held in that order in a max segment tree. The leftmost block big enough
+    is then the best fit, so it is found and removed in O(log blocks) rather than by scanning the blocks or shifting a sorted list.
+    Of equally sized blocks, the first is used.
+
+    @param verbose Show debugging information?
+    """
+
+    @cached_allocation
     def allocate_processes(self, verbose=False):
         if verbose:
             print("\nOSSAT-BestFit\n-----------------------------------------")
 
         # Set all process to be unallocated(None).
-        for i in range(len(self.job_queue)):
-            self.allocated[self.job_queue[i].get_name()] = None
+        free_blocks = sorted((self.blocks[index].get_size(), index) for index in self.reset_allocations())
+        # Allocated blocks have a size of -1 in the tree.
+        free_sizes = MaxSegmentTree([size for size, _ in free_blocks])
 
         for process in self.job_queue:
-            block_counter = 0
-            best_block_counter = 0
-            best_block = None
-            for block in self.blocks:
-                # If the process fits in the block and it hasn't been allocated yet, and the next block is a better fit.
-                if (not block in self.allocated.values() and process.get_size() <= block.get_size() and (best_block == None or block.get_size() < best_block.get_size())):
-                    best_block = block
-                    best_block_counter = block_counter
-
-                block_counter += 1
-
-            self.allocated[process.get_name()] = best_block
-            if (verbose and self.allocated[process.get_name()]):
+            # Sizes ascend along the tree, so the first free block at least as big as the process is the smallest that fits.
+            position = free_sizes.find_first(process.get_size())
+            if position == -1:
+                continue
+
+            free_sizes.update(position, -1)
+            best_block_counter = free_blocks[position][1]
+            best_block = self.blocks[best_block_counter]
+            self.assign(process.get_name(), best_block)
+            if verbose:
                 print("Process " + process.get_name() + " (" + str(process.get_size()) + ") allocated to Block " + str(best_block_counter) + " (" + str(best_block.get_size()) + ")")
 
 
@@ -1,25 +1,35 @@
 from ..memory_manager import MemoryManager
+from ..max_segment_tree import MaxSegmentTree
+from ...cache import cached_allocation
 
 
 class FirstFit(MemoryManager):
+    """
+    Allocates each process in the job queue to the first free block it fits in.
+    The free block sizes are held in a max segment tree, so the first fit is found in O(log blocks) rather than by scanning the blocks in order.
+
+    @param verbose Show debugging information?
+    """
+
+    @cached_allocation
     def allocate_processes(self, verbose=False):
         if verbose:
             print("\nOSSAT-FirstFit\n-----------------------------------------")
 
-        # Set all process to be unallocated (null).
-        for i in range(len(self.job_queue)):
-            self.allocated[self.job_queue[i].get_name()] = None
+        # Set all process to be unallocated (null). Allocated blocks have a size of -1 in the tree.
+        free_sizes = [-1] * len(self.blocks)
+        for index in self.reset_allocations():
+            free_sizes[index] = self.blocks[index].get_size()
+        free_blocks = MaxSegmentTree(free_sizes)
 
         for process in self.job_queue:
-            block_counter = 0
-            for block in self.blocks:
-                if (not block in self.allocated.values() and process.get_size() <= block.get_size()):
-                    self.allocated[process.get_name()] = block
-                    break
-
-                block_counter += 1
+            block_counter = free_blocks.find_first(process.get_size())
+            if block_counter == -1:
+                continue
 
-            if verbose and self.allocated[process.get_name()]:
+            free_blocks.update(block_counter, -1)
+            self.assign(process.get_name(), self.blocks[block_counter])
+            if verbose:
                 print("Process " + process.get_name() + " (" + str(process.get_size()) + ") allocated to Block " + str(block_counter) + " (" + str(self.allocated[process.get_name()].get_size()) + ")")
 
 
@@ -1,29 +1,32 @@
 from ..memory_manager import MemoryManager
+from ...cache import cached_allocation
 
 
 class WorstFit(MemoryManager):
+    """
+    Allocates each process in the job queue to the largest free block, if it fits.
+    The free blocks are kept sorted by (size, -index), so the worst fit is always the last one, and of equally sized blocks, the first is used.
+
+    @param verbose Show debugging information?
+    """
+
+    @cached_allocation
     def allocate_processes(self, verbose=False):
         if verbose:
             print("\nOSSAT-WorstFit\n-----------------------------------------")
 
         # Set all process to be unallocated(None).
-        for i in range(len(self.job_queue)):
-            self.allocated[self.job_queue[i].get_name()] = None
+        free_blocks = sorted((self.blocks[index].get_size(), -index) for index in self.reset_allocations())
 
         for process in self.job_queue:
-            block_counter = 0
-            best_block_counter = 0
-            best_block = None
-            for block in self.blocks:
-                # If the process fits in the block and it hasn't been allocated yet, and the next block is a worse fit.
-                if (not block in self.allocated.values() and process.get_size() <= block.get_size() and (best_block == None or block.get_size() > best_block.get_size())):
-                    best_block = block
-                    best_block_counter = block_counter
-
-                block_counter += 1
-
-            self.allocated[process.get_name()] = best_block
-            if (verbose and self.allocated[process.get_name()]):
+            # If the process doesn't fit in the largest block, it doesn't fit anywhere.
+            if not free_blocks or free_blocks[len(free_blocks) - 1][0] < process.get_size():
+                continue
+
+            best_block_counter = -free_blocks.pop()[1]
+            best_block = self.blocks[best_block_counter]
+            self.assign(process.get_name(), best_block)
+            if verbose:
                 print("Process " + process.get_name() + " (" + str(process.get_size()) + ") allocated to Block " + str(best_block_counter) + " (" + str(best_block.get_size()) + ")")
 
 
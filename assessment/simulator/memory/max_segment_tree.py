@@ -0,0 +1,41 @@
+class MaxSegmentTree:
+    def __init__(self, values):
+        self.size = 1
+        while self.size < len(values):
+            self.size *= 2
+        # Implicit binary tree (index=node, root=1), each node holding the maximum of its children. Leaves start at self.size.
+        # Empty leaves hold -1, so they never fit anything.
+        self.tree = [-1] * (2 * self.size)
+        self.tree[self.size:self.size + len(values)] = values
+        for node in range(self.size - 1, 0, -1):
+            self.tree[node] = max(self.tree[2 * node], self.tree[2 * node + 1])
+
+    """
+    Changes the value at an index.
+
+    @param index Position of the value.
+    @param value The new value, ie: -1 to remove a block from consideration.
+    """
+
+    def update(self, index, value):
+        node = self.size + index
+        self.tree[node] = value
+        node //= 2
+        while node:
+            self.tree[node] = max(self.tree[2 * node], self.tree[2 * node + 1])
+            node //= 2
+
+    """
+    Finds the leftmost value which is at least a minimum, descending into the left child whenever its maximum is big enough.
+
+    @param minimum The smallest acceptable value.
+    @return The index of the value, or -1 if no value is big enough.
+    """
+
+    def find_first(self, minimum):
+        if self.tree[1] < minimum:
+            return -1
+        node = 1
+        while node < self.size:
+            node = 2 * node if self.tree[2 * node] >= minimum else 2 * node + 1
+        return node - self.size
@@ -1,11 +1,13 @@
-import time
+from ..creation_order import creation_order
 
 
 class MemoryBlock:
+    __slots__ = ("name", "size", "time_added")
+
     def __init__(self, name, size):
         self.name = name
         self.size = size
-        self.time_added = time.time()
+        self.time_added = next(creation_order)
 
     def get_name(self):
         return self.name
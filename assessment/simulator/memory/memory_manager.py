@@ -3,26 +3,63 @@ from .memory_process import MemoryProcess
 
 
 class MemoryManager:
-    def __init__(self):
+    def __init__(self, cache=None):
         self.job_queue = []
         self.blocks = []
         self.allocated = {}
+        # Registries (index=name), so lookups don't scan the job queue or blocks.
+        self.processes = {}
+        self.blocks_by_name = {}
+        # Name of the process each allocated block holds (index=block), the reverse of self.allocated.
+        self.block_owners = {}
+        # SimulationCache shared with other memory managers, or None to always allocate.
+        self.cache = cache
 
     def create_block(self, name, size):
-        self.blocks.append(MemoryBlock(name, size))
+        if name in self.blocks_by_name:
+            print("You can't have two blocks with the same ID. Skipping (" + str(name) + ", " + str(size) + ") and continuing silently.")
+            return
 
-    def create_process(self, name, size):
-        if len([process for process in self.job_queue if process.name == name]) > 0:
+        block = MemoryBlock(name, size)
+        self.blocks.append(block)
+        self.blocks_by_name[name] = block
 
-            print("You can't have two processes with the same ID. Skipping (" + name + ", " + str(size) + ") and continuing silently.")
+    def create_process(self, name, size):
+        if name in self.processes:
+            print("You can't have two processes with the same ID. Skipping (" + str(name) + ", " + str(size) + ") and continuing silently.")
             return
 
-        self.job_queue.append(MemoryProcess(name, size))
+        process = MemoryProcess(name, size)
+        self.job_queue.append(process)
+        self.processes[name] = process
+
+    """
+    Creates many blocks at once.
+
+    @param blocks An iterable of (name, size) tuples.
+    """
+
+    def create_blocks(self, blocks):
+        for name, size in blocks:
+            self.create_block(name, size)
+
+    """
+    Creates many processes at once.
+
+    @param processes An iterable of (name, size) tuples.
+    """
+
+    def create_processes(self, processes):
+        for name, size in processes:
+            self.create_process(name, size)
 
     def reset(self):
         self.job_queue = []
         self.blocks = []
         self.allocated = {}
+        self.processes = {}
+        self.blocks_by_name = {}
+        self.block_owners = {}
 
     def get_job_queue(self):
         return self.job_queue
@@ -33,5 +70,57 @@ class MemoryManager:
     def get_allocated(self):
         return self.allocated
 
+    """
+    Replaces every allocation at once, ie: with a cached result.
+
+    @param allocated Dictionary mapping process names to blocks (or None).
+    """
+
+    def set_allocated(self, allocated):
+        self.allocated = allocated
+        self.block_owners = {block: name for name, block in allocated.items() if block}
+
+    """
+    Allocates a process to a block.
+
+    @param name Name of the process.
+    @param block The MemoryBlock to place it in.
+    """
+
+    def assign(self, name, block):
+        self.allocated[name] = block
+        self.block_owners[block] = name
+
+    """
+    Marks every process in the job queue as unallocated, and finds the blocks still free.
+    Blocks held by processes from earlier runs stay allocated.
+
+    @return An array of the indices of the free blocks, in order.
+    """
+
+    def reset_allocations(self):
+        for process in self.job_queue:
+            block = self.allocated.get(process.get_name())
+            if block:
+                del self.block_owners[block]
+            self.allocated[process.get_name()] = None
+        return [index for index, block in enumerate(self.blocks) if block not in self.block_owners]
+
     def get_process_by_name(self, name):
-        return [process for process in self.job_queue if process.name == name][0]
+        return self.processes[name]
+
+    def get_block_by_name(self, name):
+        return self.blocks_by_name[name]
+
+    """
+    Finds the process a block holds.
+
+    @param block The MemoryBlock.
+    @return The process' name, or None if the block is free.
+    """
+
+    def get_block_owner(self, block):
+        return self.block_owners.get(block)
+
+    def is_block_allocated(self, block):
+        return block in self.block_owners
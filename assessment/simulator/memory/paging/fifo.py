@@ -0,0 +1,24 @@
+from .page_replacer import PageReplacer
+from collections import deque
+
+
+class FIFO(PageReplacer):
+    def start(self, reference_string):
+        # Resident pages in the order they were loaded.
+        self.loaded = deque()
+
+    def access(self, step, page):
+        pass
+
+    def load(self, step, page):
+        self.loaded.append(page)
+
+    def evict(self, step):
+        return self.loaded.popleft()
+
+
+# Syntax for use on frontend.
+
+# test_fifo = FIFO(3)
+# test_fifo.run([7, 0, 1, 2, 0, 3, 0, 4, 2, 3, 0, 3, 2], verbose=True)
+# print(test_fifo.get_faults())
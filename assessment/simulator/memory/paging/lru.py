@@ -0,0 +1,24 @@
+from .page_replacer import PageReplacer
+from collections import OrderedDict
+
+
+class LRU(PageReplacer):
+    def start(self, reference_string):
+        # Resident pages from least to most recently used, so every operation is O(1).
+        self.recency = OrderedDict()
+
+    def access(self, step, page):
+        self.recency.move_to_end(page)
+
+    def load(self, step, page):
+        self.recency[page] = None
+
+    def evict(self, step):
+        return self.recency.popitem(last=False)[0]
+
+
+# Syntax for use on frontend.
+
+# test_lru = LRU(3)
+# test_lru.run([7, 0, 1, 2, 0, 3, 0, 4, 2, 3, 0, 3, 2], verbose=True)
+# print(test_lru.get_faults())
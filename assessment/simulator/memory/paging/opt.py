@@ -0,0 +1,49 @@
+from .page_replacer import PageReplacer
+import heapq
+import itertools
+
+
+class OPT(PageReplacer):
+    """
+    Precomputes when each reference's page is next used, in one backwards pass over the reference string,
+    so picking the page used furthest in the future is a heap pop rather than a scan ahead.
+    Pages never used again are evicted first, oldest loaded first.
+    """
+
+    def start(self, reference_string):
+        never = len(reference_string)
+        # Position of the next reference to the same page (index=position in the reference string).
+        self.next_use = [never] * len(reference_string)
+        upcoming = {}
+        for step in range(len(reference_string) - 1, -1, -1):
+            self.next_use[step] = upcoming.get(reference_string[step], never)
+            upcoming[reference_string[step]] = step
+
+        # Max heap of [-next use, load order, page], with stale entries skipped when popped.
+        self.heap = []
+        self.current_next_use = {}
+        self.load_order = {}
+        self.counter = itertools.count()
+
+    def access(self, step, page):
+        self.current_next_use[page] = self.next_use[step]
+        heapq.heappush(self.heap, (-self.next_use[step], self.load_order[page], page))
+
+    def load(self, step, page):
+        self.load_order[page] = next(self.counter)
+        self.access(step, page)
+
+    def evict(self, step):
+        while True:
+            next_use, load_order, page = heapq.heappop(self.heap)
+            if self.current_next_use.get(page) == -next_use and self.load_order.get(page) == load_order:
+                del self.current_next_use[page]
+                del self.load_order[page]
+                return page
+
+
+# Syntax for use on frontend.
+
+# test_opt = OPT(3)
+# test_opt.run([7, 0, 1, 2, 0, 3, 0, 4, 2, 3, 0, 3, 2], verbose=True)
+# print(test_opt.get_faults())
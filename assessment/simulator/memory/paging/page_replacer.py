@@ -0,0 +1,95 @@
+class PageReplacer:
+    def __init__(self, num_frames):
+        if num_frames < 1:
+            raise ValueError("A page replacement algorithm needs at least one frame, got " + str(num_frames) + ".")
+        self.num_frames = num_frames
+        self.steps = []
+        self.faults = 0
+
+    """
+    Prepares the algorithm for a new reference string. Implemented by each algorithm.
+
+    @param reference_string The pages referenced, in order.
+    """
+
+    def start(self, reference_string):
+        raise NotImplementedError
+
+    """
+    Notes a reference to a page which is already in a frame. Implemented by each algorithm.
+
+    @param step Position of the reference in the reference string.
+    @param page The page referenced.
+    """
+
+    def access(self, step, page):
+        raise NotImplementedError
+
+    """
+    Notes a page being loaded into a frame. Implemented by each algorithm.
+
+    @param step Position of the reference in the reference string.
+    @param page The page loaded.
+    """
+
+    def load(self, step, page):
+        raise NotImplementedError
+
+    """
+    Picks the page to replace when every frame is full, and forgets it. Implemented by each algorithm.
+
+    @param step Position of the reference which caused the fault.
+    @return The page to evict.
+    """
+
+    def evict(self, step):
+        raise NotImplementedError
+
+    """
+    Runs the algorithm over a reference string.
+
+    @param reference_string The pages referenced, in order.
+    @param record_frames Keep the contents of the frames after every step? Costs O(frames) per step.
+    @param verbose Show debugging information?
+    @return An array holding, for each reference, the page, whether it faulted, the page evicted (or None) and the frames (index=frame number).
+    """
+
+    def run(self, reference_string, record_frames=True, verbose=False):
+        if verbose:
+            print("\nOSSAT-" + type(self).__name__ + "\n-----------------------------------------")
+        self.start(reference_string)
+        self.steps = []
+        self.faults = 0
+        frames = [None] * self.num_frames
+        # Frame holding each resident page (index=page).
+        resident = {}
+
+        for step, page in enumerate(reference_string):
+            evicted = None
+            fault = page not in resident
+            if not fault:
+                self.access(step, page)
+            else:
+                self.faults += 1
+                if len(resident) < self.num_frames:
+                    frame = len(resident)
+                else:
+                    evicted = self.evict(step)
+                    frame = resident.pop(evicted)
+                frames[frame] = page
+                resident[page] = frame
+                self.load(step, page)
+                if verbose:
+                    print("[" + str(step) + "] Page fault on " + str(page) + ("" if evicted is None else ", replacing " + str(evicted)) + " in frame " + str(frame))
+
+            self.steps.append({"page": page, "fault": fault, "evicted": evicted, "frames": list(frames) if record_frames else None})
+        return self.steps
+
+    def get_steps(self):
+        return self.steps
+
+    def get_faults(self):
+        return self.faults
+
+    def get_hits(self):
+        return len(self.steps) - self.faults
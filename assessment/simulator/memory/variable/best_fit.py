@@ -0,0 +1,23 @@
+from .variable_partition_manager import VariablePartitionManager
+from bisect import bisect_left
+
+
+class BestFit(VariablePartitionManager):
+    """
+    Finds the smallest hole the process fits in, with a binary search over the holes in size order.
+    Of equally sized holes, the lowest addressed is used.
+    """
+
+    def find_hole(self, size):
+        i = bisect_left(self.holes_by_size, (size, -1))
+        return self.holes_by_size[i][1] if i < len(self.holes_by_size) else None
+
+
+# Syntax for use on frontend.
+
+# test_best_fit = BestFit(1000)
+# test_best_fit.allocate("p1", 212)
+# test_best_fit.allocate("p2", 417)
+# test_best_fit.free("p1")
+# test_best_fit.allocate("p3", 112)
+# print(test_best_fit.get_holes(), test_best_fit.get_fragmentation())
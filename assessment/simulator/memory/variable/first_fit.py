@@ -0,0 +1,95 @@
+from .variable_partition_manager import VariablePartitionManager
+from bisect import bisect_left, bisect_right, insort
+from math import isqrt
+
+# Fewest holes per bucket of the free list, so small free lists aren't split into many tiny buckets.
+MIN_BUCKET_SIZE = 16
+
+
+class FirstFit(VariablePartitionManager):
+    def __init__(self, memory_size, min_hole_size=0):
+        # The free list in address order, split into buckets which each know their largest hole, so the search skips whole buckets the process can't fit in.
+        # Buckets hold about sqrt(holes) holes, and there are about sqrt(holes) of them, so a search looks at O(sqrt holes) buckets and holes.
+        # Adding or removing a hole is still O(holes) overall, as the sorted lists of VariablePartitionManager are shifted.
+        self.bucket_size = MIN_BUCKET_SIZE
+        self.buckets = [[]]
+        self.bucket_starts = [0]
+        self.bucket_largest_holes = [0]
+        super(FirstFit, self).__init__(memory_size, min_hole_size)
+
+    def find_bucket(self, start):
+        return max(bisect_right(self.bucket_starts, start) - 1, 0)
+
+    """
+    Splits the free list into new buckets of about sqrt(holes) holes each. Called whenever the number of holes has moved far enough
+    from the last split that the buckets are no longer about sqrt(holes) in size or number, so its O(holes) cost is spread over at least
+    sqrt(holes) calls of add_hole or remove_hole.
+    """
+
+    def rebuild_buckets(self):
+        self.bucket_size = max(MIN_BUCKET_SIZE, isqrt(len(self.hole_starts)))
+        self.buckets = [self.hole_starts[i:i + self.bucket_size] for i in range(0, len(self.hole_starts), self.bucket_size)] or [[]]
+        self.bucket_starts = [bucket[0] if bucket else 0 for bucket in self.buckets]
+        self.bucket_largest_holes = [max((self.hole_sizes[hole] for hole in bucket), default=0) for bucket in self.buckets]
+
+    def add_hole(self, start, size):
+        super(FirstFit, self).add_hole(start, size)
+        if len(self.hole_starts) > 4 * self.bucket_size * self.bucket_size:
+            self.rebuild_buckets()
+            return
+
+        b = self.find_bucket(start)
+        bucket = self.buckets[b]
+        insort(bucket, start)
+        self.bucket_starts[b] = bucket[0]
+        self.bucket_largest_holes[b] = max(self.bucket_largest_holes[b], size)
+
+        if len(bucket) >= 2 * self.bucket_size:
+            self.buckets[b:b + 1] = [bucket[:self.bucket_size], bucket[self.bucket_size:]]
+            self.bucket_starts[b:b + 1] = [bucket[0], bucket[self.bucket_size]]
+            self.bucket_largest_holes[b:b + 1] = [max(self.hole_sizes[hole] for hole in self.buckets[b]),
+                                                  max(self.hole_sizes[hole] for hole in self.buckets[b + 1])]
+
+    def remove_hole(self, start):
+        size = super(FirstFit, self).remove_hole(start)
+        if self.bucket_size > MIN_BUCKET_SIZE and 4 * len(self.hole_starts) < self.bucket_size * self.bucket_size:
+            self.rebuild_buckets()
+            return size
+
+        b = self.find_bucket(start)
+        bucket = self.buckets[b]
+        del bucket[bisect_left(bucket, start)]
+
+        if not bucket and len(self.buckets) > 1:
+            del self.buckets[b]
+            del self.bucket_starts[b]
+            del self.bucket_largest_holes[b]
+        elif not bucket:
+            self.bucket_largest_holes[b] = 0
+        else:
+            self.bucket_starts[b] = bucket[0]
+            if size == self.bucket_largest_holes[b]:
+                self.bucket_largest_holes[b] = max(self.hole_sizes[hole] for hole in bucket)
+        return size
+
+    """
+    Finds the lowest addressed hole the process fits in.
+    """
+
+    def find_hole(self, size):
+        for b, largest_hole in enumerate(self.bucket_largest_holes):
+            if largest_hole >= size:
+                for start in self.buckets[b]:
+                    if self.hole_sizes[start] >= size:
+                        return start
+        return None
+
+
+# Syntax for use on frontend.
+
+# test_first_fit = FirstFit(1000)
+# test_first_fit.allocate("p1", 212)
+# test_first_fit.allocate("p2", 417)
+# test_first_fit.free("p1")
+# test_first_fit.allocate("p3", 112)
+# print(test_first_fit.get_holes(), test_first_fit.get_fragmentation())
@@ -0,0 +1,157 @@
+from bisect import bisect_left, insort
+
+# Kinds of step in an allocation trace.
+ALLOCATE = "allocate"
+FREE = "free"
+
+
+class VariablePartitionManager:
+    def __init__(self, memory_size, min_hole_size=0):
+        self.memory_size = memory_size
+        # Holes smaller than this are handed to the process being allocated rather than left behind, and count as internal fragmentation.
+        self.min_hole_size = min_hole_size
+        # Ordered free list: hole start addresses in address order, and the size of each hole (index=start address).
+        self.hole_starts = []
+        self.hole_sizes = {}
+        # (size, start) of every hole, in size order, for Best/Worst Fit and the largest hole.
+        # Both orders are plain sorted lists: lookups are binary searches, but adding or removing a hole shifts the list, so costs O(holes).
+        self.holes_by_size = []
+        # Partition of each allocated process as (start, partition size, process size) (index=process name).
+        self.partitions = {}
+        # Fragmentation statistics, updated on every allocate and free.
+        self.free_memory = memory_size
+        self.internal_fragmentation = 0
+        if memory_size > 0:
+            self.add_hole(0, memory_size)
+
+    """
+    Picks the hole to allocate a process to. Implemented by each algorithm.
+
+    @param size Size of the process.
+    @return The start address of the hole, or None if no hole is big enough.
+    """
+
+    def find_hole(self, size):
+        raise NotImplementedError
+
+    def add_hole(self, start, size):
+        insort(self.hole_starts, start)
+        self.hole_sizes[start] = size
+        insort(self.holes_by_size, (size, start))
+
+    def remove_hole(self, start):
+        size = self.hole_sizes.pop(start)
+        del self.hole_starts[bisect_left(self.hole_starts, start)]
+        del self.holes_by_size[bisect_left(self.holes_by_size, (size, start))]
+        return size
+
+    def get_largest_hole(self):
+        return self.holes_by_size[len(self.holes_by_size) - 1][0] if self.holes_by_size else 0
+
+    """
+    Allocates a process to a hole, splitting off whatever it doesn't use as a new hole.
+
+    @param name Unique name of the process.
+    @param size Size of the process.
+    @param verbose Show debugging information?
+    @return The start address of the process' partition, or None if it couldn't be allocated.
+    """
+
+    def allocate(self, name, size, verbose=False):
+        if name in self.partitions:
+            print("You can't have two processes with the same ID. Skipping (" + str(name) + ", " + str(size) + ") and continuing silently.")
+            return None
+        if size <= 0:
+            print("Processes must have a positive size. Skipping (" + str(name) + ", " + str(size) + ") and continuing silently.")
+            return None
+
+        start = self.find_hole(size)
+        if start is None:
+            if verbose:
+                print("Process " + str(name) + " (" + str(size) + ") could not be allocated")
+            return None
+
+        hole_size = self.remove_hole(start)
+        partition_size = size
+        if hole_size - size < max(self.min_hole_size, 1):
+            # Too small a remainder to be worth keeping as a hole, so the process takes the whole hole.
+            partition_size = hole_size
+        else:
+            self.add_hole(start + size, hole_size - size)
+
+        self.partitions[name] = (start, partition_size, size)
+        self.free_memory -= partition_size
+        self.internal_fragmentation += partition_size - size
+        if verbose:
+            print("Process " + str(name) + " (" + str(size) + ") allocated to [" + str(start) + ", " + str(start + partition_size) + ")")
+        return start
+
+    """
+    Frees a process' partition, coalescing it with the holes either side of it.
+
+    @param name Name of the process.
+    @param verbose Show debugging information?
+    @return The start address of the resulting hole, or None if the process isn't allocated.
+    """
+
+    def free(self, name, verbose=False):
+        if name not in self.partitions:
+            return None
+
+        start, partition_size, size = self.partitions.pop(name)
+        self.free_memory += partition_size
+        self.internal_fragmentation -= partition_size - size
+        end = start + partition_size
+
+        # The free list is in address order, so the only holes which can touch the partition are its neighbours in the list.
+        i = bisect_left(self.hole_starts, start)
+        if i < len(self.hole_starts) and self.hole_starts[i] == end:
+            end += self.remove_hole(end)
+        if i > 0 and self.hole_starts[i - 1] + self.hole_sizes[self.hole_starts[i - 1]] == start:
+            start = self.hole_starts[i - 1]
+            self.remove_hole(start)
+        self.add_hole(start, end - start)
+
+        if verbose:
+            print("Process " + str(name) + " freed, hole [" + str(start) + ", " + str(end) + ")")
+        return start
+
+    """
+    Replays a trace of allocations and frees.
+
+    @param trace An iterable of (ALLOCATE, name, size) and (FREE, name) tuples.
+    @param verbose Show debugging information?
+    @return An array holding, for each step, the start address it affected (or None) and the fragmentation after it.
+    """
+
+    def run_trace(self, trace, verbose=False):
+        steps = []
+        for step in trace:
+            start = self.allocate(step[1], step[2], verbose) if step[0] == ALLOCATE else self.free(step[1], verbose)
+            steps.append({"step": step[0], "name": step[1], "start": start, **self.get_fragmentation()})
+        return steps
+
+    def get_holes(self):
+        return [(start, self.hole_sizes[start]) for start in self.hole_starts]
+
+    def get_partitions(self):
+        return self.partitions
+
+    """
+    Returns the current fragmentation, from the running totals rather than by scanning memory.
+
+    Internal fragmentation - Memory allocated to processes but not used by them.
+    External fragmentation - Free memory outside of the largest hole, ie: which can't be used for a process as big as all the free memory.
+
+    @return A dictionary of the free memory, largest hole, internal and external fragmentation,
+            and the external fragmentation as a fraction of free memory.
+    """
+
+    def get_fragmentation(self):
+        largest_hole = self.get_largest_hole()
+        return {"free_memory": self.free_memory,
+                "largest_hole": largest_hole,
+                "holes": len(self.hole_starts),
+                "internal_fragmentation": self.internal_fragmentation,
+                "external_fragmentation": self.free_memory - largest_hole,
+                "external_fragmentation_ratio": (self.free_memory - largest_hole) / self.free_memory if self.free_memory else 0.0}
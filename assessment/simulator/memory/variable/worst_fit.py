@@ -0,0 +1,25 @@
+from .variable_partition_manager import VariablePartitionManager
+from bisect import bisect_left
+
+
+class WorstFit(VariablePartitionManager):
+    """
+    Finds the largest hole, if the process fits in it.
+    Of equally sized holes, the lowest addressed is used.
+    """
+
+    def find_hole(self, size):
+        largest_hole = self.get_largest_hole()
+        if largest_hole < size:
+            return None
+        return self.holes_by_size[bisect_left(self.holes_by_size, (largest_hole, -1))][1]
+
+
+# Syntax for use on frontend.
+
+# test_worst_fit = WorstFit(1000)
+# test_worst_fit.allocate("p1", 212)
+# test_worst_fit.allocate("p2", 417)
+# test_worst_fit.free("p1")
+# test_worst_fit.allocate("p3", 112)
+# print(test_worst_fit.get_holes(), test_worst_fit.get_fragmentation())
@@ -0,0 +1,41 @@
+from concurrent.futures import ProcessPoolExecutor
+from .cpu.non_preemptive.fcfs import FCFS
+from .cpu.non_preemptive.sjf import SJF
+from .cpu.non_preemptive.priority import Priority
+from .cpu.preemptive.rr import RR
+from .cpu.preemptive.srtf import SRTF
+from .memory.contiguous.first_fit import FirstFit
+from .memory.contiguous.best_fit import BestFit
+from .memory.contiguous.worst_fit import WorstFit
+import os
+
+CPU_SCHEDULERS = {"FCFS": FCFS, "SJF": SJF, "Priority": Priority, "RR": RR, "SRTF": SRTF}
+MEMORY_MANAGERS = {"First Fit": FirstFit, "Best Fit": BestFit, "Worst Fit": WorstFit}
+
+# Worker processes used when no count is given. Defaults to one per core.
+DEFAULT_WORKERS = int(os.getenv("OSSAT_SIMULATION_WORKERS", os.cpu_count() or 1))
+
+
+"""
+Calls a function on every item, spread across a pool of worker processes.
+Items are sent to the workers in chunks, so small items don't cost an inter-process round trip each.
+
+@param function A picklable (module level) function of one item.
+@param items An iterable of picklable items.
+@param workers Number of worker processes. 1 runs everything in this process.
+@param chunk_size Number of items sent to a worker at a time. Defaults to about 4 chunks per worker.
+@return An array of the results, in the same order as the items regardless of which worker finished first.
+"""
+
+
+def run_parallel(function, items, workers=None, chunk_size=None):
+    items = list(items)
+    workers = DEFAULT_WORKERS if workers is None else workers
+    if workers <= 1 or len(items) <= 1:
+        return [function(item) for item in items]
+
+    workers = min(workers, len(items))
+    if chunk_size is None:
+        chunk_size = max(1, len(items) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(function, items, chunksize=chunk_size))
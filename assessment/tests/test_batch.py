@@ -0,0 +1,59 @@
+from unittest import TestCase
+import numpy as np
+from ..simulator.batch import schedule_batch, allocate_batch, CPU_ALGORITHMS, MEMORY_ALGORITHMS
+from ..simulator.parallel import CPU_SCHEDULERS, MEMORY_MANAGERS
+
+# Checks the batch simulators against the scheduler and memory manager objects, row by row, on random padded inputs.
+
+
+class BatchSimulatorTests(TestCase):
+    SCENARIOS = 300
+    WIDTH = 9
+
+    def setUp(self):
+        self.generator = np.random.default_rng(0)
+
+    def test_schedule_batch(self):
+        for algorithm in CPU_ALGORITHMS:
+            counts = self.generator.integers(1, self.WIDTH, self.SCENARIOS, endpoint=True)
+            arrival_times = self.generator.integers(0, 20, (self.SCENARIOS, self.WIDTH), endpoint=True)
+            burst_times = self.generator.integers(1, 6, (self.SCENARIOS, self.WIDTH), endpoint=True)
+            priorities = self.generator.integers(0, 5, (self.SCENARIOS, self.WIDTH), endpoint=True)
+            schedules = schedule_batch(algorithm, arrival_times, burst_times, priorities if algorithm == "Priority" else None, counts)
+
+            for row in range(self.SCENARIOS):
+                scheduler = CPU_SCHEDULERS[algorithm](track_queues=False)
+                for i in range(counts[row]):
+                    scheduler.create_process("p" + str(i), int(arrival_times[row][i]), int(burst_times[row][i]),
+                                             int(priorities[row][i]) if algorithm == "Priority" else None)
+                scheduler.dispatch_processes()
+                with self.subTest(algorithm=algorithm, row=row):
+                    self.assertEqual(schedules[row], scheduler.get_schedule())
+
+    def test_allocate_batch(self):
+        for algorithm in MEMORY_ALGORITHMS:
+            process_counts = self.generator.integers(1, self.WIDTH, self.SCENARIOS, endpoint=True)
+            block_counts = self.generator.integers(1, self.WIDTH, self.SCENARIOS, endpoint=True)
+            process_sizes = self.generator.integers(50, 300, (self.SCENARIOS, self.WIDTH), endpoint=True)
+            block_sizes = self.generator.integers(50, 300, (self.SCENARIOS, self.WIDTH), endpoint=True)
+            # Equal block sizes, so ties are covered.
+            block_sizes[:, 3] = block_sizes[:, 1]
+            placements = allocate_batch(algorithm, process_sizes, block_sizes, process_counts, block_counts)
+
+            for row in range(self.SCENARIOS):
+                manager = MEMORY_MANAGERS[algorithm]()
+                for i in range(block_counts[row]):
+                    manager.create_block("b" + str(i), int(block_sizes[row][i]))
+                for i in range(process_counts[row]):
+                    manager.create_process("p" + str(i), int(process_sizes[row][i]))
+                manager.allocate_processes()
+                allocated = manager.get_allocated()
+                expected = [int(allocated["p" + str(i)].get_name()[1:]) if allocated["p" + str(i)] else -1 for i in range(process_counts[row])]
+                with self.subTest(algorithm=algorithm, row=row):
+                    self.assertEqual(placements[row][:process_counts[row]].tolist(), expected)
+
+    def test_unsupported_algorithm(self):
+        with self.assertRaises(ValueError):
+            schedule_batch("RR", [[0]], [[1]])
+        with self.assertRaises(ValueError):
+            allocate_batch("Next Fit", [[1]], [[1]])
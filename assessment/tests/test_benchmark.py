@@ -0,0 +1,34 @@
+from unittest import TestCase
+import contextlib
+import io
+import json
+import os
+import tempfile
+from ..simulator.benchmark import main
+
+# Smoke test for the benchmark suite on tiny workloads, so it keeps running as the simulators change.
+
+
+class BenchmarkTests(TestCase):
+    def run_main(self, args):
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            return main(args)
+
+    def test_small_run(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results.json")
+            results = self.run_main(["--sizes", "20", "--burst-times", "5", "--memory-sizes", "10", "--repeat", "1", "--output", path])
+            with open(path) as results_file:
+                self.assertEqual(json.load(results_file), results)
+
+        self.assertEqual([result["algorithm"] for result in results["cpu"]], ["FCFS", "SJF", "Priority", "RR", "SRTF"])
+        self.assertEqual([result["algorithm"] for result in results["memory"]], ["First Fit", "Best Fit", "Worst Fit"])
+        self.assertTrue(all(result["processes"] == 20 and result["segments"] >= 20 for result in results["cpu"]))
+
+    def test_same_seed_same_workload(self):
+        args = ["--algorithms", "SRTF", "--sizes", "50", "--burst-times", "10", "--memory-sizes", "5", "--repeat", "1"]
+        self.assertEqual(self.run_main(args)["cpu"][0]["segments"], self.run_main(args)["cpu"][0]["segments"])
+
+    def test_unknown_algorithm(self):
+        with self.assertRaises(SystemExit):
+            self.run_main(["--algorithms", "LIFO"])
@@ -0,0 +1,94 @@
+from unittest import TestCase
+import threading
+from ..simulator.cache import SimulationCache, FrozenDict, workload_fingerprint
+from ..simulator.memory.contiguous.best_fit import BestFit
+from .test_cpu import CPU_SCHEDULERS, dispatch, names
+
+# Tests for the simulation cache and the decorators putting it in front of the simulators.
+
+
+class SimulationCacheTests(TestCase):
+    def test_lru_eviction(self):
+        cache = SimulationCache(max_size=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.put("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual((cache.get("a"), cache.get("c")), (1, 3))
+        self.assertEqual(cache.get_stats(), {"hits": 3, "misses": 1, "evictions": 1, "size": 2, "max_size": 2, "hit_rate": 0.75})
+
+    def test_shared_between_threads(self):
+        cache = SimulationCache(max_size=8)
+
+        def use_cache(offset):
+            for i in range(2000):
+                cache.put((offset + i) % 20, i)
+                cache.get((offset + i + 1) % 20)
+
+        threads = [threading.Thread(target=use_cache, args=(offset,)) for offset in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = cache.get_stats()
+        self.assertEqual(stats["size"], 8)
+        self.assertEqual(stats["hits"] + stats["misses"], 8000)
+
+    def test_clear(self):
+        cache = SimulationCache()
+        cache.put("a", 1)
+        cache.get("a")
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.get_stats()["hits"], 0)
+
+    def test_frozen_dict(self):
+        result = FrozenDict({"a": 1})
+        for modify in (lambda: result.__setitem__("b", 2), lambda: result.update(b=2), lambda: result.pop("a"), result.clear):
+            with self.assertRaises(TypeError):
+                modify()
+        self.assertEqual(result, {"a": 1})
+        with self.assertRaises(TypeError):
+            result |= {"b": 2}
+        self.assertEqual(result, {"a": 1})
+
+    def test_fingerprint(self):
+        processes = [("p0", 0, 5), ("p1", 1, 3)]
+        self.assertEqual(workload_fingerprint("FCFS", {}, processes), workload_fingerprint("FCFS", {}, processes[::-1]))
+        self.assertNotEqual(workload_fingerprint("FCFS", {}, processes, ordered=True), workload_fingerprint("FCFS", {}, processes[::-1], ordered=True))
+        self.assertNotEqual(workload_fingerprint("RR", {"time_quantum": 2}, processes), workload_fingerprint("RR", {"time_quantum": 3}, processes))
+
+
+class CachedSimulationTests(TestCase):
+    def test_cached_schedule(self):
+        for algorithm in CPU_SCHEDULERS:
+            cache = SimulationCache()
+            dispatch(algorithm, track_queues=False, cache=cache)
+            scheduler = dispatch(algorithm, track_queues=False, cache=cache)
+            with self.subTest(algorithm=algorithm):
+                self.assertEqual(cache.get_stats()["hits"], 1)
+                self.assertEqual(scheduler.get_schedule(), dispatch(algorithm).get_schedule())
+                self.assertEqual(names(scheduler.get_job_queue()), names(dispatch(algorithm).get_job_queue()))
+                self.assertTrue(all(process.get_remaining_time() == 0 for process in scheduler.get_job_queue()))
+
+    def test_tracked_queues_bypass_cache(self):
+        cache = SimulationCache()
+        dispatch("FCFS", cache=cache)
+        dispatch("FCFS", cache=cache)
+        self.assertEqual(len(cache), 0)
+
+    def test_cached_allocation(self):
+        cache = SimulationCache()
+        allocations = []
+        for _ in range(2):
+            manager = BestFit(cache=cache)
+            for i, size in enumerate([100, 500, 200, 300, 600]):
+                manager.create_block("b" + str(i), size)
+            for i, size in enumerate([212, 417, 112, 426]):
+                manager.create_process("p" + str(i), size)
+            manager.allocate_processes()
+            allocations.append({name: block.get_name() if block else None for name, block in manager.get_allocated().items()})
+        self.assertEqual(cache.get_stats()["hits"], 1)
+        self.assertEqual(allocations[0], allocations[1])
+        self.assertEqual(allocations[1], {"p0": "b3", "p1": "b1", "p2": "b2", "p3": "b4"})
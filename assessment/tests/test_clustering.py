@@ -0,0 +1,71 @@
+from unittest import TestCase
+import itertools
+import random
+import numpy as np
+from ..clustering import score_matrix, closest_centroids, kmeans_1d, kmeans_1d_columns
+
+# Checks the exact 1-D k-means against brute force over every split of the sorted values.
+
+
+"""
+Finds the least total squared distance of values to their cluster means, trying every split of the sorted values into k runs.
+
+@param values An array of values.
+@param k Number of clusters.
+@return The least cost.
+"""
+
+
+def brute_force_cost(values, k):
+    values = sorted(values)
+    best = float("inf")
+    for cuts in itertools.combinations(range(1, len(values)), k - 1):
+        bounds = (0,) + cuts + (len(values),)
+        runs = [values[bounds[i]:bounds[i + 1]] for i in range(k)]
+        best = min(best, sum(sum((value - sum(run) / len(run)) ** 2 for value in run) for run in runs))
+    return best
+
+
+def cost(values, centroids, labels):
+    return float(((np.asarray(values, dtype=np.float64) - centroids[labels]) ** 2).sum())
+
+
+class KMeans1DTests(TestCase):
+    def test_matches_brute_force(self):
+        generator = random.Random(0)
+        for _ in range(300):
+            values = [generator.randint(0, 6) for _ in range(generator.randint(1, 9))]
+            k = generator.randint(1, 4)
+            centroids, labels = kmeans_1d(values, k)
+            clusters = min(k, len(set(values)))
+            with self.subTest(values=values, k=k):
+                self.assertEqual(len(centroids), clusters)
+                self.assertTrue(np.all(np.diff(centroids) > 0))
+                self.assertAlmostEqual(cost(values, centroids, labels), brute_force_cost(values, clusters))
+
+    def test_equal_values_share_a_cluster(self):
+        centroids, labels = kmeans_1d([3, 0, 3, 1, 0], 2)
+        self.assertEqual(centroids.tolist(), [1 / 3, 3.0])
+        self.assertEqual(labels.tolist(), [1, 0, 1, 0, 0])
+
+    def test_empty(self):
+        centroids, labels = kmeans_1d([], 3)
+        self.assertEqual((len(centroids), len(labels)), (0, 0))
+
+    def test_columns(self):
+        centroids, labels = kmeans_1d_columns([[0, 1], [0, 1], [3, 1], [2, 1]], 3)
+        # The second column has one distinct score, so its centroid is repeated.
+        self.assertEqual(centroids.tolist(), [[0, 1], [2, 1], [3, 1]])
+        self.assertEqual(labels.tolist(), [[0, 0], [0, 0], [2, 0], [1, 0]])
+
+
+class ScoreMatrixTests(TestCase):
+    def test_score_matrix(self):
+        scores = score_matrix([{"FCFS": [2, 3], "RR": [1, 3]}, {"FCFS": [0, 3], "RR": [3, 3]}], ["RR", "FCFS"])
+        self.assertEqual(scores.tolist(), [[1, 2], [3, 0]])
+        self.assertEqual(score_matrix([], ["RR", "FCFS"]).shape, (0, 2))
+
+    def test_closest_centroids(self):
+        centroids = np.array([[0.0, 1.0], [2.0, 1.5], [3.0, 3.0]])
+        self.assertEqual(closest_centroids(centroids, [2.4, 0]).tolist(), [1, 0])
+        self.assertEqual(closest_centroids(centroids, [[2.4, 0], [3, 2.9]]).tolist(), [[1, 0], [2, 2]])
@@ -0,0 +1,303 @@
+from unittest import TestCase
+import contextlib
+import io
+from ..simulator.cpu.preemptive.rr import RR
+from ..simulator.cpu.cpu_process import CPUProcess
+from ..simulator.cpu.cpu_priority_process import CPUPriorityProcess
+from ..simulator.cpu.process_table import ProcessTable
+from ..simulator.cpu.cpu_scheduler import remaining_time_key
+from ..simulator.cpu.ready_queue import ReadyQueue
+from ..simulator.cpu.indexed_schedule import IndexedSchedule
+from ..simulator.cpu.metrics import compute_schedule_metrics
+from ..simulator.cpu.queue_timeline import SEGMENT, ARRIVE, DISPATCH, COMPLETE
+from ..simulator.parallel import CPU_SCHEDULERS
+from ..simulator.memory.memory_block import MemoryBlock
+
+# Regression tests for the CPU schedulers, on one small workload with a known schedule for every algorithm.
+
+# (name, arrival_time, burst_time, priority), with a gap before p4 so every schedule idles.
+PROCESSES = [("p0", 0, 5, 3), ("p1", 1, 3, 1), ("p2", 2, 8, 4), ("p3", 3, 6, 2), ("p4", 30, 2, 0)]
+
+
+"""
+Builds a scheduler loaded with PROCESSES.
+
+@param algorithm Name of the scheduler, ie: "RR".
+@param time_quantum Time quantum for RR.
+@param options Keyword arguments for the scheduler, ie: track_queues.
+@return A CPUScheduler ready to dispatch.
+"""
+
+
+def create_scheduler(algorithm, time_quantum=2, **options):
+    scheduler = CPU_SCHEDULERS[algorithm](**options)
+    if algorithm == "RR":
+        scheduler.set_time_quantum(time_quantum)
+    for name, arrival_time, burst_time, priority in PROCESSES:
+        scheduler.create_process(name, arrival_time, burst_time, priority if algorithm == "Priority" else None)
+    return scheduler
+
+
+def dispatch(algorithm, time_quantum=2, **options):
+    scheduler = create_scheduler(algorithm, time_quantum, **options)
+    scheduler.dispatch_processes()
+    return scheduler
+
+
+def names(processes):
+    return [process.get_name() for process in processes]
+
+
+def segments(schedule):
+    return [(segment["process_name"], segment["time_delta"]) for segment in schedule]
+
+
+class CPUSchedulerTests(TestCase):
+    # (process_name, time_delta) of every segment.
+    SCHEDULES = {
+        "FCFS": [("p0", 0), ("p1", 5), ("p2", 8), ("p3", 16), ("IDLE", 22), ("p4", 30)],
+        "SJF": [("p0", 0), ("p1", 5), ("p3", 8), ("p2", 14), ("IDLE", 22), ("p4", 30)],
+        "Priority": [("p0", 0), ("p1", 1), ("p3", 4), ("p0", 10), ("p2", 14), ("IDLE", 22), ("p4", 30)],
+        "SRTF": [("p0", 0), ("p1", 1), ("p0", 4), ("p3", 8), ("p2", 14), ("IDLE", 22), ("p4", 30)]
+    }
+
+    def test_schedules(self):
+        for algorithm, expected in self.SCHEDULES.items():
+            with self.subTest(algorithm=algorithm):
+                self.assertEqual(segments(dispatch(algorithm).get_schedule()), expected)
+
+    def test_schedules_without_queues(self):
+        for algorithm, expected in self.SCHEDULES.items():
+            with self.subTest(algorithm=algorithm):
+                self.assertEqual(segments(dispatch(algorithm, track_queues=False).get_schedule()), expected)
+
+    def test_preempted_segment(self):
+        self.assertEqual(dispatch("SRTF").get_schedule()[0], {"process_name": "p0", "time_delta": 0, "arrival_time": 0, "burst_time": 1, "remaining_time": 4})
+        self.assertEqual(dispatch("Priority").get_schedule()[2],
+                         {"process_name": "p3", "time_delta": 4, "arrival_time": 3, "burst_time": 6, "remaining_time": 0, "priority": 2})
+
+    def test_idle_segment(self):
+        for algorithm in self.SCHEDULES:
+            with self.subTest(algorithm=algorithm):
+                idle = [segment for segment in dispatch(algorithm).get_schedule() if segment["process_name"] == "IDLE"]
+                self.assertEqual([(segment["time_delta"], segment["burst_time"]) for segment in idle], [(22, 8)])
+
+
+
+
+class RoundRobinTests(TestCase):
+    def test_schedule(self):
+        self.assertEqual(segments(dispatch("RR").get_schedule()),
+                         [("p0", 0), ("p1", 2), ("p2", 4), ("p0", 6), ("p3", 8), ("p1", 10), ("p2", 11), ("p0", 13), ("p3", 14), ("p2", 16), ("p3", 18),
+                          ("p2", 20), ("IDLE", 22), ("p4", 30)])
+
+    def test_long_quantum_is_fcfs(self):
+        self.assertEqual(dispatch("RR", 10).get_schedule(), dispatch("FCFS").get_schedule())
+
+    def test_time_quantum_below_one(self):
+        for time_quantum in (0, -1):
+            with self.assertRaises(ValueError):
+                RR(time_quantum=time_quantum)
+            with self.assertRaises(ValueError):
+                RR().set_time_quantum(time_quantum)
+
+    def test_one_segment_per_quantum(self):
+        scheduler = RR(time_quantum=3)
+        scheduler.create_process("p0", 0, 10)
+        scheduler.dispatch_processes()
+        self.assertEqual([(segment["time_delta"], segment["burst_time"], segment["remaining_time"]) for segment in scheduler.get_schedule()],
+                         [(0, 3, 7), (3, 3, 4), (6, 3, 1), (9, 1, 0)])
+
+    def test_long_bursts(self):
+        scheduler = RR(time_quantum=1, track_queues=False)
+        scheduler.create_process("p0", 0, 20000)
+        scheduler.create_process("p1", 5, 20000)
+        scheduler.dispatch_processes()
+        schedule = scheduler.get_schedule()
+        self.assertEqual(len(schedule), 40000)
+        self.assertEqual(schedule[len(schedule) - 1], {"process_name": "p1", "time_delta": 39999, "arrival_time": 5, "burst_time": 1, "remaining_time": 0})
+
+
+class QueueTimelineTests(TestCase):
+    # Ready queue at time deltas 4, 9 and 20: the running process, then the waiting processes in dispatch order.
+    READY_QUEUES = {
+        "FCFS": [["p0", "p1", "p2", "p3"], ["p2", "p3"], ["p3"]],
+        "SJF": [["p0", "p1", "p3", "p2"], ["p3", "p2"], ["p2"]],
+        "Priority": [["p3", "p0", "p2"], ["p3", "p0", "p2"], ["p2"]],
+        "RR": [["p2", "p0", "p3", "p1"], ["p3", "p1", "p2", "p0"], ["p2"]],
+        "SRTF": [["p0", "p3", "p2"], ["p3", "p2"], ["p2"]]
+    }
+
+    def test_ready_queues(self):
+        for algorithm, expected in self.READY_QUEUES.items():
+            scheduler = dispatch(algorithm)
+            with self.subTest(algorithm=algorithm):
+                self.assertEqual([names(scheduler.get_ready_queue(time_delta)) for time_delta in (4, 9, 20)], expected)
+
+    def test_job_queues(self):
+        for algorithm in CPU_SCHEDULERS:
+            scheduler = dispatch(algorithm)
+            expected = ["p4", "p1", "p0", "p3", "p2"] if algorithm == "SJF" else ["p0", "p1", "p2", "p3", "p4"]
+            with self.subTest(algorithm=algorithm):
+                self.assertEqual([names(scheduler.get_job_queue(time_delta)) for time_delta in (4, 9, 20)], [expected] * 3)
+
+    def test_all_queues(self):
+        scheduler = dispatch("FCFS")
+        ready_queues = scheduler.get_all_ready_queues()
+        # One snapshot per time delta, up to and including the end of the schedule.
+        self.assertEqual(len(ready_queues), 33)
+        self.assertEqual(len(scheduler.get_all_job_queues()), 33)
+        self.assertEqual([names(queue) for queue in ready_queues[:6]], [["p0"], ["p0", "p1"], ["p0", "p1", "p2"], ["p0", "p1", "p2", "p3"],
+                                                                       ["p0", "p1", "p2", "p3"], ["p1", "p2", "p3"]])
+
+    def test_checkpoints(self):
+        for algorithm in CPU_SCHEDULERS:
+            scheduler = dispatch(algorithm)
+            checkpointed = dispatch(algorithm, checkpoint_interval=2)
+            with self.subTest(algorithm=algorithm):
+                for time_delta in range(1, 33):
+                    self.assertEqual(names(checkpointed.get_ready_queue(time_delta)), names(scheduler.get_ready_queue(time_delta)))
+
+
+class ReadyQueueTests(TestCase):
+    def setUp(self):
+        self.processes = [CPUProcess("p" + str(i), i, burst_time) for i, burst_time in enumerate([4, 2, 6, 2])]
+        self.ready = ReadyQueue(remaining_time_key)
+        for process in self.processes:
+            self.ready.push(process)
+
+    def test_order(self):
+        self.assertEqual(names(self.ready.ordered()), ["p1", "p3", "p0", "p2"])
+        self.assertEqual(self.ready.peek().get_name(), "p1")
+        self.assertEqual(self.ready.peek_key(), remaining_time_key(self.processes[1]))
+        self.assertEqual(names([self.ready.pop() for _ in range(4)]), ["p1", "p3", "p0", "p2"])
+        self.assertFalse(self.ready)
+        self.assertIsNone(self.ready.peek())
+
+    def test_push_rekeys(self):
+        self.processes[2].set_remaining_time(1)
+        self.ready.push(self.processes[2])
+        self.assertEqual(len(self.ready), 4)
+        self.assertEqual(names(self.ready.ordered()), ["p2", "p1", "p3", "p0"])
+        self.assertEqual(self.ready.pop().get_name(), "p2")
+
+    def test_remove(self):
+        self.ready.remove(self.processes[1])
+        self.assertNotIn(self.processes[1], self.ready)
+        self.assertIn(self.processes[3], self.ready)
+        self.assertEqual(len(self.ready), 3)
+        self.assertEqual(self.ready.pop().get_name(), "p3")
+
+
+class ProcessTableTests(TestCase):
+    def create_table(self, with_priority=False):
+        table = ProcessTable(with_priority)
+        for name, arrival_time, burst_time, priority in PROCESSES:
+            table.append(name, arrival_time, burst_time, priority if with_priority else None)
+        return table
+
+    def test_append(self):
+        table = self.create_table()
+        self.assertEqual(len(table), 5)
+        self.assertIn("p3", table)
+        self.assertEqual(table.get_row("p3"), 3)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertIsNone(table.append("p3", 0, 1))
+        self.assertEqual(len(table), 5)
+
+    def test_key(self):
+        table = self.create_table(True)
+        self.assertEqual(table.key(("burst_time", "arrival_time", "name"))(1), (3, 1, "p1"))
+        self.assertEqual(table.key(("priority", "arrival_time", "burst_time", "name"))(2), (4, 2, 8, "p2"))
+
+    def test_round_trip(self):
+        processes = [CPUPriorityProcess(name, arrival_time, burst_time, priority) for name, arrival_time, burst_time, priority in PROCESSES]
+        processes[1].set_remaining_time(1)
+        rebuilt = ProcessTable.from_processes(processes).to_processes()
+        self.assertEqual([(process.name, process.arrival_time, process.burst_time, process.remaining_time, process.priority) for process in rebuilt],
+                         [(process.name, process.arrival_time, process.burst_time, process.remaining_time, process.priority) for process in processes])
+
+    def test_loaded_table(self):
+        for algorithm in CPU_SCHEDULERS:
+            scheduler = CPU_SCHEDULERS[algorithm]()
+            scheduler.load_process_table(self.create_table(algorithm == "Priority"))
+            scheduler.dispatch_processes()
+            with self.subTest(algorithm=algorithm):
+                self.assertEqual(scheduler.get_schedule(), dispatch(algorithm).get_schedule())
+
+    def test_slots(self):
+        self.assertFalse(hasattr(CPUProcess("p0", 0, 1), "__dict__"))
+        self.assertFalse(hasattr(CPUPriorityProcess("p0", 0, 1, 0), "__dict__"))
+
+    def test_creation_order(self):
+        # CPU processes share the creation order of the memory processes and blocks.
+        process = CPUProcess("p0", 0, 1)
+        block = MemoryBlock("b0", 100)
+        priority_process = CPUPriorityProcess("p1", 0, 1, 0)
+        self.assertLess(process.get_time_added(), block.get_time_added())
+        self.assertLess(block.get_time_added(), priority_process.get_time_added())
+
+
+class IndexedScheduleTests(TestCase):
+    def setUp(self):
+        self.index = dispatch("FCFS").get_indexed_schedule()
+
+    def test_process_at(self):
+        self.assertEqual([self.index.process_at(time_delta) for time_delta in (0, 4, 5, 21, 22, 29, 30, 31, 32, -1)],
+                         ["p0", "p0", "p1", "p3", "IDLE", "IDLE", "p4", "p4", None, None])
+        self.assertEqual(self.index.segment_at(9)["process_name"], "p2")
+
+    def test_segments_in(self):
+        self.assertEqual(segments(self.index.segments_in(4, 9)), [("p0", 0), ("p1", 5), ("p2", 8)])
+        self.assertEqual(segments(self.index.segments_in(5, 8)), [("p1", 5)])
+        self.assertEqual(segments(self.index.segments_in(22, 40)), [("IDLE", 22), ("p4", 30)])
+        self.assertEqual(self.index.segments_in(32, 40), [])
+
+    def test_makespan(self):
+        self.assertEqual(self.index.makespan(), 32)
+        self.assertEqual(IndexedSchedule([]).makespan(), 0)
+
+
+class ScheduleMetricsTests(TestCase):
+    def test_metrics(self):
+        metrics = dispatch("SRTF").get_metrics()
+        # (name, arrival_time, burst_time, completion_time, turnaround_time, waiting_time, response_time), in order of first execution.
+        self.assertEqual([tuple(process.values()) for process in metrics["processes"]],
+                         [("p0", 0, 5, 8, 8, 3, 0), ("p1", 1, 3, 4, 3, 0, 0), ("p3", 3, 6, 14, 11, 5, 5), ("p2", 2, 8, 22, 20, 12, 12), ("p4", 30, 2, 32, 2, 0, 0)])
+        self.assertEqual(metrics["makespan"], 32)
+        self.assertAlmostEqual(metrics["average_turnaround_time"], 8.8)
+        self.assertAlmostEqual(metrics["average_waiting_time"], 4.0)
+        self.assertAlmostEqual(metrics["average_response_time"], 3.4)
+        self.assertAlmostEqual(metrics["cpu_utilization"], 0.75)
+        self.assertAlmostEqual(metrics["throughput"], 5 / 32)
+
+    def test_empty_schedule(self):
+        metrics = compute_schedule_metrics([])
+        self.assertEqual(metrics["processes"], [])
+        self.assertEqual((metrics["makespan"], metrics["cpu_utilization"], metrics["throughput"]), (0, 0.0, 0.0))
+
+
+class IterScheduleTests(TestCase):
+    def test_segments_match_dispatch(self):
+        for algorithm in CPU_SCHEDULERS:
+            events = list(create_scheduler(algorithm).iter_schedule())
+            with self.subTest(algorithm=algorithm):
+                self.assertEqual([item for kind, _, item in events if kind == SEGMENT], dispatch(algorithm).get_schedule())
+                self.assertEqual([time_delta for _, time_delta, _ in events], sorted(time_delta for _, time_delta, _ in events))
+                self.assertEqual(sorted(item for kind, _, item in events if kind == COMPLETE), ["p0", "p1", "p2", "p3", "p4"])
+
+    def test_segments_stamped_when_finished(self):
+        for kind, time_delta, item in create_scheduler("SRTF").iter_schedule():
+            if kind == SEGMENT:
+                self.assertEqual(time_delta, item["time_delta"] + item["burst_time"])
+
+    def test_queue_events(self):
+        events = list(create_scheduler("FCFS").iter_schedule())
+        self.assertEqual(events[:3], [(ARRIVE, 0, "p0"), (DISPATCH, 0, "p0"), (ARRIVE, 1, "p1")])
+        self.assertEqual({kind for kind, _, _ in create_scheduler("RR").iter_schedule(queue_events=False)}, {SEGMENT})
+
+    def test_nothing_stored(self):
+        scheduler = create_scheduler("RR")
+        for _ in scheduler.iter_schedule():
+            pass
+        self.assertEqual(scheduler.get_schedule(), [])
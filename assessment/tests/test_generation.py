@@ -0,0 +1,86 @@
+from unittest import TestCase
+from ..generation import sample_questions, generate_questions, GENERAL_QUIZZES, GENERAL_VARIANTS, CPU_QUIZZES, DIFFICULTIES, DIFFICULTY_PROFILES
+from ..simulator.parallel import CPU_SCHEDULERS, MEMORY_MANAGERS
+
+# Checks sampled questions against the scheduler and memory manager objects, re-simulating each question from its processes and blocks.
+
+SPECS = [(variant_name, difficulty) for variant_name in GENERAL_QUIZZES for difficulty in DIFFICULTIES] * 25
+
+
+class SampleQuestionsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.questions = sample_questions(SPECS, seed=7)
+
+    def test_profile_limits(self):
+        for (variant_name, difficulty), question in zip(SPECS, self.questions):
+            profile = DIFFICULTY_PROFILES[difficulty]
+            self.assertTrue(profile["num_processes"][0] <= len(question["processes"]) <= profile["num_processes"][1])
+            if variant_name in CPU_QUIZZES:
+                self.assertIsNone(question["blocks"])
+                self.assertTrue(all(0 <= process["arrival_time"] <= profile["max_arrival_time"] and 1 <= process["burst_time"] <= profile["max_burst_time"]
+                                    for process in question["processes"]))
+            else:
+                self.assertTrue(profile["num_blocks"][0] <= len(question["blocks"]) <= profile["num_blocks"][1])
+                self.assertTrue(all(profile["size"][0] <= item["size"] <= profile["size"][1] for item in question["processes"] + question["blocks"]))
+
+    def test_cpu_answers(self):
+        for (variant_name, _), question in zip(SPECS, self.questions):
+            if variant_name not in CPU_QUIZZES:
+                continue
+            scheduler = CPU_SCHEDULERS[variant_name](track_queues=False)
+            for process in question["processes"]:
+                scheduler.create_process(process["name"], process["arrival_time"], process["burst_time"], process["priority"])
+            scheduler.dispatch_processes()
+            time_delta = int(question["question_text"].split("time delta ")[1][:-1])
+
+            with self.subTest(variant_name=variant_name, question=question):
+                self.assertTrue(0 <= time_delta <= scheduler.get_schedule()[-1]["time_delta"])
+                # The time quantum isn't part of an RR question, so only check its answer is one of the processes (or idle).
+                if variant_name == "RR":
+                    self.assertIn(question["correct_answer"]["name"], [process["name"] for process in question["processes"]] + ["IDLE"])
+                    continue
+                segment = scheduler.get_indexed_schedule().segment_at(time_delta)
+                self.assertEqual(question["correct_answer"], {"name": segment["process_name"], "arrival_time": segment["arrival_time"],
+                                                              "burst_time": segment["burst_time"], "priority": segment["priority"] if variant_name == "Priority" else None})
+
+    def test_memory_answers(self):
+        for (variant_name, _), question in zip(SPECS, self.questions):
+            if variant_name in CPU_QUIZZES:
+                continue
+            manager = MEMORY_MANAGERS[variant_name]()
+            for block in question["blocks"]:
+                manager.create_block(block["name"], block["size"])
+            for process in question["processes"]:
+                manager.create_process(process["name"], process["size"])
+            manager.allocate_processes()
+            block = manager.get_allocated()[question["question_text"].split("process ")[1].split(" ")[0]]
+
+            with self.subTest(variant_name=variant_name, question=question):
+                self.assertEqual(question["correct_answer"], {"name": "None", "size": "N/A"} if not block else {"name": block.get_name(), "size": block.get_size()})
+
+    def test_processes_in_creation_order(self):
+        for question in self.questions:
+            self.assertEqual([process["name"] for process in question["processes"]], ["p" + str(i) for i in range(len(question["processes"]))])
+
+    def test_choices(self):
+        for (variant_name, _), question in zip(SPECS, self.questions):
+            candidates = question["processes"] if variant_name in CPU_QUIZZES else question["blocks"]
+            answers = question["answers"]
+            self.assertIn(question["correct_answer"], answers)
+            self.assertTrue(all(answer in candidates for answer in answers if answer != question["correct_answer"]))
+            self.assertIn(len(answers), (len(candidates), len(candidates) + 1) if len(candidates) <= 5 else (4, 5))
+
+    def test_seeded(self):
+        self.assertEqual(sample_questions(SPECS[:40], seed=3), sample_questions(SPECS[:40], seed=3))
+        self.assertNotEqual(sample_questions(SPECS[:40], seed=3), sample_questions(SPECS[:40], seed=4))
+        self.assertEqual(sample_questions([]), [])
+
+
+class GenerateQuestionsTests(TestCase):
+    def test_every_variant(self):
+        questions = generate_questions(seed=0)
+        self.assertEqual(set(questions), set(GENERAL_VARIANTS) | {"Initial Assessment"})
+        self.assertTrue(all(len(questions[variant]) == 10 for variant in GENERAL_VARIANTS))
+        self.assertEqual(len(questions["Initial Assessment"]), len(GENERAL_VARIANTS))
+        self.assertEqual(questions, generate_questions(seed=0))
@@ -0,0 +1,253 @@
+from unittest import TestCase
+import contextlib
+import io
+import random
+from ..simulator.memory.memory_block import MemoryBlock
+from ..simulator.memory.memory_process import MemoryProcess
+from ..simulator.memory.max_segment_tree import MaxSegmentTree
+from ..simulator.memory.variable.first_fit import FirstFit as VariableFirstFit
+from ..simulator.memory.variable.best_fit import BestFit as VariableBestFit
+from ..simulator.memory.variable.worst_fit import WorstFit as VariableWorstFit
+from ..simulator.memory.variable.variable_partition_manager import ALLOCATE, FREE
+from ..simulator.parallel import MEMORY_MANAGERS
+from ..simulator.cache import SimulationCache
+
+# Regression tests for the memory managers.
+
+BLOCKS = [100, 500, 200, 300, 600]
+PROCESSES = [212, 417, 112, 426]
+
+
+"""
+Allocates processes the way the allocators originally did, by scanning every free block for every process.
+
+@param algorithm Name of the allocator, ie: "Best Fit".
+@param blocks Sizes of the blocks.
+@param processes Sizes of the processes.
+@return An array of the block index each process is allocated to, None if unallocated.
+"""
+
+
+def scan_allocation(algorithm, blocks, processes):
+    free = list(range(len(blocks)))
+    placements = []
+    for size in processes:
+        fits = [index for index in free if blocks[index] >= size]
+        if not fits:
+            placements.append(None)
+            continue
+        if algorithm == "First Fit":
+            index = fits[0]
+        elif algorithm == "Best Fit":
+            index = min(fits, key=lambda index: (blocks[index], index))
+        else:
+            index = min(fits, key=lambda index: (-blocks[index], index))
+        free.remove(index)
+        placements.append(index)
+    return placements
+
+
+def allocate(algorithm, blocks, processes):
+    manager = MEMORY_MANAGERS[algorithm]()
+    for i, size in enumerate(blocks):
+        manager.create_block("b" + str(i), size)
+    for i, size in enumerate(processes):
+        manager.create_process("p" + str(i), size)
+    manager.allocate_processes()
+    return manager
+
+
+def placements(manager):
+    positions = {id(block): position for position, block in enumerate(manager.get_blocks())}
+    return [positions[id(block)] if block else None for block in manager.get_allocated().values()]
+
+
+class MemoryProcessTests(TestCase):
+    def test_creation_order(self):
+        process, block = MemoryProcess("p0", 100), MemoryBlock("b0", 200)
+        self.assertLess(process.get_time_added(), block.get_time_added())
+        self.assertLess(block.get_time_added(), MemoryProcess("p1", 100).get_time_added())
+
+    def test_slots(self):
+        self.assertFalse(hasattr(MemoryProcess("p0", 100), "__dict__"))
+        self.assertFalse(hasattr(MemoryBlock("b0", 100), "__dict__"))
+
+
+class ContiguousAllocationTests(TestCase):
+    PLACEMENTS = {
+        "First Fit": [1, 4, 2, None],
+        "Best Fit": [3, 1, 2, 4],
+        "Worst Fit": [4, 1, 3, None]
+    }
+
+    def test_placements(self):
+        for algorithm, expected in self.PLACEMENTS.items():
+            with self.subTest(algorithm=algorithm):
+                self.assertEqual(placements(allocate(algorithm, BLOCKS, PROCESSES)), expected)
+
+    def test_matches_scan(self):
+        generator = random.Random(0)
+        for _ in range(300):
+            blocks = [generator.choice([50, 100, 150, 200]) for _ in range(generator.randint(0, 8))]
+            processes = [generator.randint(1, 220) for _ in range(generator.randint(0, 8))]
+            for algorithm in MEMORY_MANAGERS:
+                with self.subTest(algorithm=algorithm, blocks=blocks, processes=processes):
+                    self.assertEqual(placements(allocate(algorithm, blocks, processes)), scan_allocation(algorithm, blocks, processes))
+
+    def test_reallocation(self):
+        for algorithm in MEMORY_MANAGERS:
+            manager = allocate(algorithm, BLOCKS, PROCESSES)
+            manager.allocate_processes()
+            with self.subTest(algorithm=algorithm):
+                self.assertEqual(placements(manager), self.PLACEMENTS[algorithm])
+
+
+class MaxSegmentTreeTests(TestCase):
+    def test_find_first(self):
+        tree = MaxSegmentTree([100, 500, 200, 300, 600])
+        self.assertEqual([tree.find_first(minimum) for minimum in [50, 150, 250, 550, 601]], [0, 1, 1, 4, -1])
+        tree.update(1, -1)
+        self.assertEqual([tree.find_first(minimum) for minimum in [150, 250, 550]], [2, 3, 4])
+
+    def test_empty(self):
+        self.assertEqual(MaxSegmentTree([]).find_first(0), -1)
+
+    def test_matches_scan(self):
+        generator = random.Random(0)
+        values = [generator.randint(0, 100) for _ in range(37)]
+        tree = MaxSegmentTree(values)
+        for _ in range(500):
+            index = generator.randrange(len(values))
+            values[index] = generator.choice([-1, generator.randint(0, 100)])
+            tree.update(index, values[index])
+            minimum = generator.randint(0, 100)
+            self.assertEqual(tree.find_first(minimum), next((i for i, value in enumerate(values) if value >= minimum), -1))
+
+
+class VariablePartitionTests(TestCase):
+    TRACE = [(ALLOCATE, "a", 100), (ALLOCATE, "b", 250), (ALLOCATE, "c", 50), (ALLOCATE, "d", 150), (ALLOCATE, "e", 50),
+             (FREE, "b"), (FREE, "d"), (ALLOCATE, "f", 120), (FREE, "c"), (ALLOCATE, "g", 500)]
+    MANAGERS = {"First Fit": VariableFirstFit, "Best Fit": VariableBestFit, "Worst Fit": VariableWorstFit}
+    # Start address of every step of TRACE, and the holes left at the end.
+    STARTS = {
+        "First Fit": [0, 100, 350, 400, 550, 100, 400, 100, 220, None],
+        "Best Fit": [0, 100, 350, 400, 550, 100, 400, 400, 100, None],
+        "Worst Fit": [0, 100, 350, 400, 550, 100, 400, 600, 100, None]
+    }
+    HOLES = {
+        "First Fit": [(220, 330), (600, 400)],
+        "Best Fit": [(100, 300), (520, 30), (600, 400)],
+        "Worst Fit": [(100, 450), (720, 280)]
+    }
+
+    def test_trace(self):
+        for algorithm, manager_class in self.MANAGERS.items():
+            manager = manager_class(1000)
+            steps = manager.run_trace(self.TRACE)
+            with self.subTest(algorithm=algorithm):
+                self.assertEqual([step["start"] for step in steps], self.STARTS[algorithm])
+                self.assertEqual(manager.get_holes(), self.HOLES[algorithm])
+                self.assertEqual(steps[-1]["free_memory"], 730)
+                self.assertEqual(steps[-1]["external_fragmentation"], 730 - max(size for _, size in self.HOLES[algorithm]))
+
+    def test_min_hole_size(self):
+        manager = VariableBestFit(1000, min_hole_size=40)
+        self.assertEqual(manager.allocate("a", 980), 0)
+        self.assertEqual(manager.get_partitions(), {"a": (0, 1000, 980)})
+        self.assertEqual(manager.get_fragmentation()["internal_fragmentation"], 20)
+        manager.free("a")
+        self.assertEqual(manager.get_holes(), [(0, 1000)])
+        self.assertEqual(manager.get_fragmentation()["internal_fragmentation"], 0)
+
+    def test_matches_scan(self):
+        # Fill memory with small processes, then free half of them at random, so there are hundreds of holes to search.
+        generator = random.Random(0)
+        for algorithm, manager_class in self.MANAGERS.items():
+            manager = manager_class(20000)
+            for i in range(4000):
+                allocated = list(manager.get_partitions())
+                if i >= 1500 and generator.random() < 0.5:
+                    manager.free(generator.choice(allocated))
+                    continue
+
+                size = generator.randint(1, 12)
+                fits = [(start, hole_size) for start, hole_size in manager.get_holes() if hole_size >= size]
+                if algorithm == "First Fit":
+                    expected = fits[0][0] if fits else None
+                elif algorithm == "Best Fit":
+                    expected = min(fits, key=lambda hole: (hole[1], hole[0]))[0] if fits else None
+                else:
+                    expected = max(fits, key=lambda hole: (hole[1], -hole[0]))[0] if fits else None
+                with self.subTest(algorithm=algorithm, step=i):
+                    self.assertEqual(manager.allocate("p" + str(i), size), expected)
+
+            holes = manager.get_holes()
+            self.assertEqual(sum(size for _, size in holes), manager.get_fragmentation()["free_memory"])
+            # Freed partitions are coalesced, so no two holes touch.
+            self.assertTrue(all(start + size < next_start for (start, size), (next_start, _) in zip(holes, holes[1:])))
+
+    def test_first_fit_buckets_follow_hole_count(self):
+        manager = VariableFirstFit(6010)
+        for i in range(3000):
+            manager.allocate(i, 2)
+        for i in range(0, 3000, 2):
+            manager.free(i)
+        holes = len(manager.get_holes())
+        self.assertEqual(holes, 1501)
+        # About sqrt(holes) buckets of about sqrt(holes) holes each.
+        self.assertTrue(holes ** 0.5 / 2 <= manager.bucket_size <= 2 * holes ** 0.5)
+        self.assertLessEqual(len(manager.buckets), 4 * holes ** 0.5)
+        self.assertEqual([start for bucket in manager.buckets for start in bucket], [start for start, _ in manager.get_holes()])
+        # Every freed hole is too small, so the search has to reach the hole left at the end.
+        self.assertEqual(manager.allocate("large", 3), 6000)
+
+        for i in range(1, 3000, 2):
+            manager.free(i)
+        manager.free("large")
+        self.assertEqual(manager.get_holes(), [(0, 6010)])
+        self.assertEqual(len(manager.buckets), 1)
+
+
+class MemoryManagerTests(TestCase):
+    def create_manager(self, algorithm="Best Fit", **options):
+        manager = MEMORY_MANAGERS[algorithm](**options)
+        manager.create_blocks([("b" + str(i), size) for i, size in enumerate(BLOCKS)])
+        manager.create_processes([("p" + str(i), size) for i, size in enumerate(PROCESSES)])
+        return manager
+
+    def test_lookups(self):
+        manager = self.create_manager()
+        self.assertEqual(manager.get_block_by_name("b3").get_size(), 300)
+        self.assertEqual(manager.get_process_by_name("p1").get_size(), 417)
+        self.assertIsNone(manager.get_block_owner(manager.get_block_by_name("b3")))
+
+        manager.allocate_processes()
+        self.assertEqual(manager.get_block_owner(manager.get_block_by_name("b3")), "p0")
+        self.assertTrue(manager.is_block_allocated(manager.get_block_by_name("b4")))
+        self.assertFalse(manager.is_block_allocated(manager.get_block_by_name("b0")))
+
+    def test_cached_owners(self):
+        cache = SimulationCache()
+        self.create_manager(cache=cache).allocate_processes()
+        manager = self.create_manager(cache=cache)
+        manager.allocate_processes()
+        self.assertEqual(cache.get_stats()["hits"], 1)
+        self.assertEqual(manager.get_block_owner(manager.get_block_by_name("b1")), "p1")
+
+    def test_duplicates_skipped(self):
+        manager = self.create_manager()
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            manager.create_block("b0", 50)
+            manager.create_processes([("p0", 10), ("p9", 10)])
+        self.assertEqual(output.getvalue().count("same ID"), 2)
+        self.assertEqual(len(manager.get_blocks()), len(BLOCKS))
+        self.assertEqual(manager.get_block_by_name("b0").get_size(), 100)
+        self.assertEqual([process.get_name() for process in manager.get_job_queue()], ["p0", "p1", "p2", "p3", "p9"])
+
+    def test_reset(self):
+        manager = self.create_manager()
+        manager.allocate_processes()
+        manager.reset()
+        self.assertEqual((manager.get_blocks(), manager.get_job_queue(), manager.get_allocated()), ([], [], {}))
+        with self.assertRaises(KeyError):
+            manager.get_block_by_name("b0")
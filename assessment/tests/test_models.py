@@ -0,0 +1,211 @@
+from django.test import TestCase
+from unittest import mock
+from django.utils import timezone
+from datetime import timedelta
+from users.models import CustomUser
+from ..models import Assessment, Question, Answer, AssessmentJob, QuestionBank
+from ..management.commands.run_assessment_jobs import Command as RunAssessmentJobsCommand
+from ..generation import GENERAL_VARIANTS
+
+# Tests for saving generated assessments, the job queue generating them and the question bank they are drawn from. These need the database, so they run under Django's test runner (python manage.py test).
+
+
+def create_question(text):
+    return {"question_text": text, "correct_answer": [text], "answers": [text, "wrong"], "processes": [{"name": "p0", "size": 1}], "blocks": None}
+
+
+"""
+Builds a small question set in the format returned by generate_questions, with question texts naming their variant.
+
+@param per_variant Number of questions for each general assessment.
+@return A dictionary of arrays of questions (index=variant).
+"""
+
+
+def create_questions(per_variant=2):
+    questions = {variant: [create_question(variant + " " + str(i)) for i in range(per_variant)] for variant in GENERAL_VARIANTS}
+    questions["Initial Assessment"] = [create_question("Initial " + variant) for variant in GENERAL_VARIANTS]
+    return questions
+
+
+class SaveAssessmentsTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create(username="student", email="student@example.com")
+
+    def test_saves_every_assessment(self):
+        Assessment.save_assessments(self.user, create_questions())
+
+        assessments = Assessment.objects.filter(user=self.user)
+        self.assertEqual(assessments.count(), len(GENERAL_VARIANTS) + 1)
+        for variant in GENERAL_VARIANTS:
+            texts = list(Question.objects.filter(assessment__user=self.user, assessment__variant=variant).order_by("id").values_list("question_text", flat=True))
+            self.assertEqual(texts, [variant + " 0", variant + " 1"])
+
+        initial = Question.objects.filter(assessment__user=self.user, assessment__variant="Initial Assessment")
+        self.assertEqual(sorted(initial.values_list("question_text", flat=True)), sorted("Initial " + variant for variant in GENERAL_VARIANTS))
+        self.assertEqual(Answer.objects.filter(question__assessment__user=self.user).count(), 3 * len(GENERAL_VARIANTS))
+        for answer in Answer.objects.filter(question__assessment__user=self.user).select_related("question"):
+            self.assertEqual(answer.answers[0], answer.question.question_text)
+
+    def test_positions(self):
+        Assessment.save_assessments(self.user, create_questions())
+        for variant in GENERAL_VARIANTS:
+            positions = Question.objects.filter(assessment__user=self.user, assessment__variant=variant).order_by("position", "id")
+            self.assertEqual([(question.position, question.question_text) for question in positions], [(0, variant + " 0"), (1, variant + " 1")])
+
+        # The initial assessment's questions are inserted in variant order, and shown in the order of a shuffled permutation of positions.
+        initial = Question.objects.filter(assessment__user=self.user, assessment__variant="Initial Assessment")
+        self.assertEqual(list(initial.order_by("id").values_list("question_text", flat=True)), ["Initial " + variant for variant in GENERAL_VARIANTS])
+        self.assertEqual(sorted(initial.values_list("position", flat=True)), list(range(len(GENERAL_VARIANTS))))
+
+    def test_replaces_existing_assessments(self):
+        Assessment.save_assessments(self.user, create_questions())
+        Assessment.save_assessments(self.user, create_questions(per_variant=1))
+        self.assertEqual(Assessment.objects.filter(user=self.user).count(), len(GENERAL_VARIANTS) + 1)
+        self.assertEqual(Question.objects.filter(assessment__user=self.user).count(), 2 * len(GENERAL_VARIANTS))
+
+
+class AssessmentJobTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create(username="student", email="student@example.com")
+
+    def test_enqueue_reuses_pending_job(self):
+        job = AssessmentJob.enqueue(self.user)
+        self.assertEqual(AssessmentJob.enqueue(self.user), job)
+        self.assertNotEqual(AssessmentJob.enqueue(self.user, AssessmentJob.REGENERATE), job)
+        self.assertEqual(AssessmentJob.objects.count(), 2)
+
+    def test_claim(self):
+        first = AssessmentJob.enqueue(self.user)
+        AssessmentJob.objects.create(user=self.user, kind=AssessmentJob.REGENERATE, run_after=timezone.now() + timedelta(hours=1))
+
+        jobs = AssessmentJob.claim(5)
+        self.assertEqual([job.id for job in jobs], [first.id])
+        first.refresh_from_db()
+        self.assertEqual((first.status, first.attempts), (AssessmentJob.RUNNING, 1))
+        self.assertEqual(AssessmentJob.claim(5), [])
+
+    def test_fail_backs_off_then_fails(self):
+        job = AssessmentJob.enqueue(self.user)
+        delays = []
+        for _ in range(job.max_attempts):
+            job = AssessmentJob.claim()[0]
+            before = timezone.now()
+            job.fail("error")
+            job.refresh_from_db()
+            if job.status == AssessmentJob.PENDING:
+                delays.append(round((job.run_after - before).total_seconds() / AssessmentJob.RETRY_DELAY))
+                AssessmentJob.objects.filter(id=job.id).update(run_after=timezone.now())
+
+        self.assertEqual(delays, [2 ** attempt for attempt in range(job.max_attempts - 1)])
+        self.assertEqual((job.status, job.attempts, job.error), (AssessmentJob.FAILED, job.max_attempts, "error"))
+        self.assertIsNotNone(job.finished_at)
+
+    def test_requeue_stalled(self):
+        AssessmentJob.enqueue(self.user)
+        job = AssessmentJob.claim()[0]
+        self.assertEqual(AssessmentJob.requeue_stalled(600), 0)
+
+        AssessmentJob.objects.filter(id=job.id).update(updated_at=timezone.now() - timedelta(seconds=601))
+        self.assertEqual(AssessmentJob.requeue_stalled(600), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, AssessmentJob.PENDING)
+        self.assertEqual(AssessmentJob.claim()[0].attempts, 2)
+
+    def test_heartbeat(self):
+        AssessmentJob.enqueue(self.user)
+        job = AssessmentJob.claim()[0]
+        AssessmentJob.objects.filter(id=job.id).update(updated_at=timezone.now() - timedelta(seconds=601))
+        self.assertTrue(job.heartbeat())
+        self.assertEqual(AssessmentJob.requeue_stalled(600), 0)
+
+        # Once requeued and claimed again, the first claim is no longer ours.
+        AssessmentJob.objects.filter(id=job.id).update(updated_at=timezone.now() - timedelta(seconds=601))
+        AssessmentJob.requeue_stalled(600)
+        reclaimed = AssessmentJob.claim()[0]
+        self.assertFalse(job.heartbeat())
+        self.assertTrue(reclaimed.heartbeat())
+
+    def test_worker_skips_requeued_jobs(self):
+        AssessmentJob.enqueue(self.user)
+        job = AssessmentJob.claim()[0]
+        AssessmentJob.objects.filter(id=job.id).update(status=AssessmentJob.PENDING)
+        command = RunAssessmentJobsCommand()
+        with mock.patch("assessment.management.commands.run_assessment_jobs.generate_many", return_value=[create_questions()]):
+            command.run_jobs([job], workers=1)
+        self.assertFalse(Assessment.objects.filter(user=self.user).exists())
+        job.refresh_from_db()
+        self.assertEqual(job.status, AssessmentJob.PENDING)
+
+    def test_run(self):
+        AssessmentJob.enqueue(self.user)
+        self.assertTrue(AssessmentJob.claim()[0].run(create_questions()))
+        self.assertEqual(Assessment.objects.filter(user=self.user).count(), len(GENERAL_VARIANTS) + 1)
+
+        # Generate jobs leave existing assessments alone, regenerate jobs replace them.
+        AssessmentJob.enqueue(self.user)
+        self.assertTrue(AssessmentJob.claim()[0].run(create_questions(per_variant=1)))
+        self.assertEqual(Question.objects.filter(assessment__user=self.user).count(), 3 * len(GENERAL_VARIANTS))
+        AssessmentJob.enqueue(self.user, AssessmentJob.REGENERATE)
+        job = AssessmentJob.claim()[0]
+        self.assertTrue(job.run(create_questions(per_variant=1)))
+        self.assertEqual(Question.objects.filter(assessment__user=self.user).count(), 2 * len(GENERAL_VARIANTS))
+        job.refresh_from_db()
+        self.assertEqual(job.status, AssessmentJob.SUCCEEDED)
+
+    def test_run_failure(self):
+        AssessmentJob.enqueue(self.user, AssessmentJob.REGENERATE)
+        job = AssessmentJob.claim()[0]
+        self.assertFalse(job.run({}))
+        job.refresh_from_db()
+        self.assertEqual(job.status, AssessmentJob.PENDING)
+        self.assertIn("KeyError", job.error)
+
+
+class QuestionBankTests(TestCase):
+    def setUp(self):
+        for random_key in [0.1, 0.5, 0.9]:
+            QuestionBank.objects.create(variant="FCFS", difficulty="I", random_key=random_key, **create_question("FCFS " + str(random_key)))
+
+    def test_sample_wraps_around(self):
+        with mock.patch("assessment.models.random.random", return_value=0.6):
+            drawn = QuestionBank.sample("FCFS", "I", 2)
+        self.assertEqual([question["question_text"] for question in drawn], ["FCFS 0.9", "FCFS 0.1"])
+
+        with mock.patch("assessment.models.random.random", return_value=0.3):
+            drawn = QuestionBank.sample("FCFS", "I", 3)
+        self.assertEqual([question["question_text"] for question in drawn], ["FCFS 0.5", "FCFS 0.9", "FCFS 0.1"])
+        self.assertEqual(drawn[0], create_question("FCFS 0.5"))
+
+    def test_sample_generates_the_rest(self):
+        drawn = QuestionBank.sample("FCFS", "I", 5)
+        self.assertEqual(sorted(question["question_text"] for question in drawn[:3]), ["FCFS 0.1", "FCFS 0.5", "FCFS 0.9"])
+        self.assertEqual(len(drawn), 5)
+        self.assertTrue(all(question["processes"] and question["answers"] for question in drawn[3:]))
+        # Other difficulties have no questions in the bank, so they're all generated.
+        self.assertEqual(len(QuestionBank.sample("FCFS", "II", 2)), 2)
+
+    def test_draw_questions(self):
+        questions = QuestionBank.draw_questions()
+        self.assertEqual(len(questions["Initial Assessment"]), len(GENERAL_VARIANTS))
+        self.assertTrue(all(len(questions[variant]) == 10 for variant in GENERAL_VARIANTS))
+        self.assertEqual(sum(question["question_text"].startswith("FCFS 0.") for question in questions["FCFS I"] + questions["Initial Assessment"]), 3)
+
+    def test_worker_draws_from_bank(self):
+        user = CustomUser.objects.create(username="student", email="student@example.com")
+        AssessmentJob.enqueue(user)
+        command = RunAssessmentJobsCommand()
+        with mock.patch("assessment.management.commands.run_assessment_jobs.generate_many") as generate_many:
+            command.run_jobs(AssessmentJob.claim(), workers=1)
+        generate_many.assert_not_called()
+        self.assertEqual(Assessment.objects.filter(user=user).count(), len(GENERAL_VARIANTS) + 1)
+
+    def test_worker_generates_while_bank_empty(self):
+        QuestionBank.objects.all().delete()
+        user = CustomUser.objects.create(username="student", email="student@example.com")
+        AssessmentJob.enqueue(user)
+        command = RunAssessmentJobsCommand()
+        with mock.patch("assessment.management.commands.run_assessment_jobs.generate_many", return_value=[create_questions()]) as generate_many:
+            command.run_jobs(AssessmentJob.claim(), workers=2)
+        generate_many.assert_called_once_with(1, 2)
+        self.assertEqual(Question.objects.filter(assessment__user=user, assessment__variant="FCFS I").count(), 2)
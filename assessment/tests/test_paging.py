@@ -0,0 +1,79 @@
+from unittest import TestCase
+import random
+from ..simulator.memory.paging.fifo import FIFO
+from ..simulator.memory.paging.lru import LRU
+from ..simulator.memory.paging.opt import OPT
+
+# Regression tests for the page replacement algorithms, on the textbook reference string and against list-based simulations.
+
+REFERENCE_STRING = [7, 0, 1, 2, 0, 3, 0, 4, 2, 3, 0, 3, 2, 1, 2, 0, 1, 7, 0, 1]
+PAGE_REPLACERS = {"FIFO": FIFO, "LRU": LRU, "OPT": OPT}
+
+
+"""
+Counts the page faults of an algorithm by keeping the resident pages in a list, ordered so the page to evict is first.
+
+@param algorithm Name of the algorithm, ie: "LRU".
+@param reference_string The pages referenced, in order.
+@param num_frames Number of frames.
+@return The number of page faults.
+"""
+
+
+def count_faults(algorithm, reference_string, num_frames):
+    resident = []
+    faults = 0
+    for step, page in enumerate(reference_string):
+        if page in resident:
+            if algorithm == "LRU":
+                resident.remove(page)
+                resident.append(page)
+            continue
+
+        faults += 1
+        if len(resident) == num_frames:
+            if algorithm == "OPT":
+                # Evict the page used furthest in the future, of those never used again the one loaded first.
+                future = reference_string[step + 1:]
+                resident.remove(max(resident, key=lambda resident_page: future.index(resident_page) if resident_page in future else len(future)))
+            else:
+                resident.pop(0)
+        resident.append(page)
+    return faults
+
+
+class PageReplacementTests(TestCase):
+    FAULTS = {"FIFO": 15, "LRU": 12, "OPT": 9}
+    FRAMES = {"FIFO": [7, 0, 1], "LRU": [1, 0, 7], "OPT": [7, 0, 1]}
+
+    def test_reference_string(self):
+        for algorithm, replacer_class in PAGE_REPLACERS.items():
+            replacer = replacer_class(3)
+            steps = replacer.run(REFERENCE_STRING)
+            with self.subTest(algorithm=algorithm):
+                self.assertEqual(replacer.get_faults(), self.FAULTS[algorithm])
+                self.assertEqual(replacer.get_hits(), len(REFERENCE_STRING) - self.FAULTS[algorithm])
+                self.assertEqual(steps[3], {"page": 2, "fault": True, "evicted": 7, "frames": [2, 0, 1]})
+                self.assertEqual(steps[-1]["frames"], self.FRAMES[algorithm])
+
+    def test_matches_list_simulation(self):
+        generator = random.Random(0)
+        for _ in range(200):
+            reference_string = [generator.randint(0, 7) for _ in range(generator.randint(0, 40))]
+            num_frames = generator.randint(1, 5)
+            for algorithm, replacer_class in PAGE_REPLACERS.items():
+                replacer = replacer_class(num_frames)
+                replacer.run(reference_string, record_frames=False)
+                with self.subTest(algorithm=algorithm, reference_string=reference_string, num_frames=num_frames):
+                    self.assertEqual(replacer.get_faults(), count_faults(algorithm, reference_string, num_frames))
+
+    def test_rerun(self):
+        replacer = LRU(3)
+        replacer.run(REFERENCE_STRING)
+        replacer.run(REFERENCE_STRING)
+        self.assertEqual(replacer.get_faults(), 12)
+        self.assertEqual(len(replacer.get_steps()), len(REFERENCE_STRING))
+
+    def test_no_frames(self):
+        with self.assertRaises(ValueError):
+            FIFO(0)
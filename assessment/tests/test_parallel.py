@@ -0,0 +1,45 @@
+from unittest import TestCase
+import random
+from ..simulator.parallel import run_parallel
+from ..generation import generate_many, generate_bank, GENERAL_QUIZZES, DIFFICULTIES
+
+# Tests for spreading work across the process pool. Results must not depend on the number of workers.
+
+
+def square(value):
+    return value * value
+
+
+class RunParallelTests(TestCase):
+    def test_results_keep_input_order(self):
+        items = list(range(50))
+        self.assertEqual(run_parallel(square, items, workers=2), [item * item for item in items])
+        self.assertEqual(run_parallel(square, items, workers=2, chunk_size=7), [item * item for item in items])
+
+    def test_single_worker_runs_inline(self):
+        self.assertEqual(run_parallel(square, iter([3, 4]), workers=1), [9, 16])
+        self.assertEqual(run_parallel(square, [], workers=4), [])
+
+
+class GenerateManyTests(TestCase):
+    def test_parallel_matches_serial(self):
+        random.seed(1)
+        serial = generate_many(3, workers=1)
+        random.seed(1)
+        parallel = generate_many(3, workers=2)
+        self.assertEqual(serial, parallel)
+        self.assertEqual(len(serial[0]["Initial Assessment"]), 24)
+        self.assertTrue(all(len(questions) == 10 for variant, questions in serial[0].items() if variant != "Initial Assessment"))
+
+    def test_sets_differ(self):
+        first, second = generate_many(2, workers=1)
+        self.assertNotEqual(first, second)
+
+
+class GenerateBankTests(TestCase):
+    def test_seeded_bank(self):
+        bank = generate_bank(2, seed=0, workers=1)
+        self.assertEqual(bank, generate_bank(2, seed=0, workers=2))
+        self.assertEqual(len(bank), 2 * len(GENERAL_QUIZZES) * len(DIFFICULTIES))
+        self.assertEqual([(variant_name, difficulty) for variant_name, difficulty, _, _ in bank[:2]], [(GENERAL_QUIZZES[0], DIFFICULTIES[0])] * 2)
+        self.assertTrue(all(0 <= random_key < 1 for _, _, random_key, _ in bank))
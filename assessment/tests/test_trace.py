@@ -0,0 +1,88 @@
+from unittest import TestCase
+import contextlib
+import io
+import os
+import tempfile
+from ..simulator.cpu.process_table import ProcessTable
+from ..simulator.cpu.trace import load_trace, write_binary_trace
+from .test_cpu import CPU_SCHEDULERS, PROCESSES, dispatch
+
+# Round trips the workload through CSV and binary traces, and checks the loaded tables schedule the same way as the process objects.
+
+
+class TraceTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_csv(self, name, lines):
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w") as trace_file:
+            trace_file.write("\n".join(lines) + "\n")
+        return path
+
+    def assertTableEqual(self, table, processes):
+        self.assertEqual(list(table.names), [process[0] for process in processes])
+        self.assertEqual(list(table.arrival_times), [process[1] for process in processes])
+        self.assertEqual(list(table.burst_times), [process[2] for process in processes])
+        self.assertEqual(list(table.remaining_times), [process[2] for process in processes])
+        if len(processes[0]) > 3:
+            self.assertEqual(list(table.priorities), [process[3] for process in processes])
+        else:
+            self.assertIsNone(table.priorities)
+
+    def test_csv_round_trip(self):
+        path = self.write_csv("workload.csv", ["name,arrival_time,burst_time,priority"] + [",".join(map(str, process)) for process in PROCESSES])
+        self.assertTableEqual(load_trace(path), PROCESSES)
+
+        binary_path = os.path.join(self.directory.name, "workload.trace")
+        write_binary_trace(binary_path, load_trace(path))
+        self.assertTableEqual(load_trace(binary_path), PROCESSES)
+
+    def test_binary_round_trip_without_priorities(self):
+        table = ProcessTable()
+        for name, arrival_time, burst_time, _ in PROCESSES:
+            table.append(name, arrival_time, burst_time)
+        path = os.path.join(self.directory.name, "workload.trace")
+        write_binary_trace(path, table)
+        self.assertTableEqual(load_trace(path), [process[:3] for process in PROCESSES])
+
+    def test_empty_binary_trace(self):
+        path = os.path.join(self.directory.name, "empty.trace")
+        write_binary_trace(path, ProcessTable())
+        self.assertEqual(len(load_trace(path)), 0)
+
+    def test_loaded_trace_dispatch(self):
+        path = self.write_csv("workload.csv", [",".join(map(str, process)) for process in PROCESSES])
+        for algorithm in CPU_SCHEDULERS:
+            scheduler = CPU_SCHEDULERS[algorithm](track_queues=False)
+            if algorithm == "RR":
+                scheduler.set_time_quantum(2)
+            scheduler.load_trace(path)
+            scheduler.dispatch_processes()
+            with self.subTest(algorithm=algorithm):
+                self.assertEqual(scheduler.get_schedule(), dispatch(algorithm).get_schedule())
+
+    def test_duplicate_names_skipped(self):
+        path = self.write_csv("workload.csv", ["p0,0,5", "p1,1,3", "p0,2,8"])
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            table = load_trace(path)
+        self.assertEqual(list(table.names), ["p0", "p1"])
+        self.assertIn("same ID", output.getvalue())
+
+    def test_invalid_traces(self):
+        with self.assertRaises(ValueError):
+            load_trace(self.write_csv("bad.csv", ["p0,0,5", "p1,one,3"]))
+        with self.assertRaises(ValueError):
+            load_trace(self.write_csv("mixed.csv", ["p0,0,5,1", "p1,1,3"]))
+        with self.assertRaises(ValueError):
+            load_trace(self.write_csv("not_binary.trace", ["p0,0,5"]))
+
+        path = os.path.join(self.directory.name, "truncated.trace")
+        write_binary_trace(path, load_trace(self.write_csv("workload.csv", ["p0,0,5"])))
+        with open(path, "ab") as trace_file:
+            trace_file.write(b"\0")
+        with self.assertRaises(ValueError):
+            load_trace(path)
@@ -1,14 +1,15 @@
 from django.contrib import admin
 from django.contrib.auth import get_user_model
-from assessment.models import Assessment
+from assessment.models import AssessmentJob
 User = get_user_model()
 
 # Register your models here.
 
 
 def generate_assessments(modeladmin, request, queryset):
+    # Queue regeneration for the job worker, which draws the questions from the question bank, or generates them across its worker pool while the bank is empty.
     for user in queryset:
-        Assessment.generate_assessments(sender=None, user=user)
+        AssessmentJob.enqueue(user, AssessmentJob.REGENERATE)
 
 
 class GenerateAssessmentAdmin(admin.ModelAdmin):